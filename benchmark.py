@@ -0,0 +1,427 @@
+"""性能测试"""
+
+
+from fractions import Fraction
+from random import randrange, random
+import os
+from time import perf_counter
+import tracemalloc
+
+from mathematics import linear_algebra, number_theory
+from mathematics.expression import Expression, Monomial, Polynomial, Var
+from mathematics.linear_algebra import (CSRMatrix, Matrix, Vector, VectorBatch, conjugate_gradient, eigh, eigvals, gmres,
+                                         jacobi_preconditioner, lanczos, lstsq, power_iteration, solve, svd)
+from mathematics.number import RationalArray, RationalNumber, best_rational, best_rationals
+from mathematics.number_theory import (SPFTable, divisors, gcd, gcd_reduce, iter_divisors, lcm, lcm_reduce,
+                                      mod_inverse_many, modpow_many, nth_prime, parallel_prime_segments,
+                                      prime_factorization, prime_pi, primes_up_to)
+
+
+def _timeit(function, *args, repeat=3):
+    """多次运行取最短时间"""
+    best = float('inf')
+    for i in range(repeat):
+        start = perf_counter()
+        function(*args)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def _report(name, seconds):
+    """输出一条测试结果"""
+    print(f"{name:<48}{seconds * 1000:>12.3f} ms")
+
+
+def _gcd_prime_growth(count):
+    """原find_prime_number的做法: 用gcd逐个试除已知质数"""
+    prime_numbers = [2]
+    last_number = 3
+    while len(prime_numbers) < count:
+        a = 0
+        while True:
+            if gcd(last_number, prime_numbers[a]) == 1:
+                a += 1
+                if a == len(prime_numbers):
+                    prime_numbers.append(last_number)
+                    last_number += 1
+                    break
+            else:
+                last_number += 1
+                break
+    return prime_numbers
+
+
+def bench_primes(limits=(10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7)):
+    """分段筛与原来的gcd试除法对比"""
+    for limit in limits:
+        primes = primes_up_to(limit)
+        _report(f"primes_up_to({limit})", _timeit(primes_up_to, limit))
+        if len(primes) <= 2000:
+            _report(f"gcd growth ({len(primes)} primes)", _timeit(_gcd_prime_growth, len(primes), repeat=1))
+
+
+def bench_spf(limit=10 ** 7, count=10 ** 5):
+    """最小质因数表批量分解与逐个prime_factorization对比"""
+    _report(f"SPFTable({limit})", _timeit(SPFTable, limit, repeat=1))
+    table = SPFTable(limit)
+    numbers = range(limit - count, limit)
+    _report(f"SPFTable.factorize_range ({count})", _timeit(lambda: list(table.factorize_many(numbers))))
+    _report(f"prime_factorization ({count})", _timeit(lambda: [prime_factorization(n) for n in numbers]))
+    fresh = SPFTable(limit)
+    _report(f"SPFTable.totient_many+mobius_many (first call, {limit})",
+            _timeit(lambda: (fresh.totient_many(range(1, limit + 1)), fresh.mobius_many(range(1, limit + 1))), repeat=1))
+    _report(f"SPFTable.totient+mobius loop ({count})",
+            _timeit(lambda: [(table.totient(n), table.mobius(n)) for n in numbers]))
+    _report(f"SPFTable.totient_many+mobius_many ({count})",
+            _timeit(lambda: (fresh.totient_many(numbers), fresh.mobius_many(numbers))))
+
+
+def _linear_divisors(integer):
+    """原divisors的做法: 逐个试除1到integer"""
+    return [i for i in range(1, integer + 1) if integer % i == 0]
+
+
+def bench_divisors(numbers=(720720, 9699690, 73513440, 10 ** 18 + 9)):
+    """由质因数分解组合因子与逐个试除对比"""
+    for n in numbers:
+        _report(f"divisors({n})", _timeit(divisors, n))
+        _report(f"iter_divisors({n})", _timeit(lambda: sum(1 for d in iter_divisors(n))))
+        if n <= 10 ** 8:
+            _report(f"linear scan({n})", _timeit(_linear_divisors, n, repeat=1))
+
+
+def _fold(function, integers):
+    """原gcf和lcf的做法: 从左到右逐个折叠"""
+    result = integers[0]
+    for integer in integers[1:]:
+        result = function(result, integer)
+    return result
+
+
+def bench_gcd_lcm(size=10 ** 6, lcm_size=10 ** 4):
+    """分块/分层归约与从左到右折叠对比"""
+    column = [randrange(1, 10 ** 9) * 6 for i in range(size)]
+    _report(f"gcd_reduce ({size})", _timeit(gcd_reduce, column))
+    _report(f"gcd fold ({size})", _timeit(_fold, gcd, column, repeat=1))
+    values = [randrange(1, 10 ** 6) for i in range(lcm_size)]
+    _report(f"lcm_reduce ({lcm_size})", _timeit(lcm_reduce, values))
+    _report(f"lcm fold ({lcm_size})", _timeit(_fold, lcm, values, repeat=1))
+
+
+def bench_modular(size=10 ** 5, modulus=(1 << 32) - 5, large_modulus=(1 << 61) - 1):
+    """
+    批量模运算与逐个调用pow对比
+    modpow_many只有在NumPy数组且模数小于2^32时走向量化路径, 其他情况就是pow循环, 所以只测这一种
+    """
+    np = number_theory.np
+    exponent = randrange(1 << 60, 1 << 61)
+    if np is None:
+        print("modpow_many: NumPy is not installed, skipped")
+    else:
+        bases = [randrange(1, modulus) for i in range(size)]
+        array = np.array(bases, dtype=np.uint64)
+        _report(f"modpow_many, uint64 array ({size})", _timeit(modpow_many, array, exponent, modulus))
+        _report(f"pow loop ({size})", _timeit(lambda: [pow(b, exponent, modulus) for b in bases]))
+    bases = [randrange(1, large_modulus) for i in range(size)]
+    _report(f"mod_inverse_many ({size})", _timeit(mod_inverse_many, bases, large_modulus))
+    _report(f"pow(a, -1, m) loop ({size})", _timeit(lambda: [pow(b, -1, large_modulus) for b in bases]))
+
+
+def bench_prime_counting(limits=(10 ** 8, 10 ** 9, 10 ** 10, 10 ** 11, 10 ** 12), ks=(10 ** 6, 10 ** 7, 10 ** 8, 10 ** 9)):
+    """质数计数和第k个质数"""
+    for x in limits:
+        _report(f"prime_pi({x})", _timeit(prime_pi, x, repeat=1))
+    for k in ks:
+        _report(f"nth_prime({k})", _timeit(nth_prime, k, repeat=1))
+
+
+def bench_parallel_primes(start=10 ** 12, length=10 ** 9, worker_counts=None):
+    """并行分段筛的吞吐量随进程数的变化"""
+    if worker_counts is None:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= (os.cpu_count() or 1):
+            worker_counts.append(worker_counts[-1] * 2)
+    for workers in worker_counts:
+        seconds = _timeit(lambda: sum(map(len, parallel_prime_segments(start, start + length, workers))), repeat=1)
+        _report(f"parallel sieve, {workers} workers", seconds)
+        print(f"{'':<8}{length / seconds / 1e6:.1f} M numbers/s")
+
+
+def _rational_loops(cls, pairs):
+    """加法, 乘法和比较的循环"""
+    values = [cls(n, d) for n, d in pairs]
+    total = cls(0, 1)
+    for value in values:
+        total = total + value
+    product = cls(1, 1)
+    for value in values:
+        product = product * value
+    return total, product, sum(1 for a, b in zip(values, values[1:]) if a < b)
+
+
+def bench_rational(size=10 ** 5):
+    """RationalNumber与fractions.Fraction对比"""
+    pairs = [(randrange(-10 ** 6, 10 ** 6), randrange(1, 10 ** 3)) for i in range(size)]
+    small = pairs[:2000]
+    for cls in (RationalNumber, Fraction):
+        _report(f"{cls.__name__} construct ({size})", _timeit(lambda: [cls(n, d) for n, d in pairs]))
+        _report(f"{cls.__name__} add/mul/compare ({len(small)})", _timeit(_rational_loops, cls, small))
+
+
+def bench_rational_array(size=10 ** 6):
+    """RationalArray逐元素运算与RationalNumber列表对比"""
+    numerators = [randrange(-10 ** 6, 10 ** 6) for i in range(size)]
+    denominators = [randrange(1, 10 ** 3) for i in range(size)]
+    values = RationalArray(numerators, denominators)
+    objects = values.to_rationals()
+    _report(f"RationalArray add+mul ({size})", _timeit(lambda: values + values * values, repeat=1))
+    _report(f"RationalNumber list add+mul ({size})", _timeit(lambda: [a + a * a for a in objects], repeat=1))
+
+
+def bench_best_rational(size=10 ** 5, max_denominator=10 ** 6):
+    """浮点数列转换成最佳有理逼近, 与Fraction.limit_denominator对比"""
+    column = [random() * 1000 - 500 for i in range(size)]
+    _report(f"best_rational ({size})", _timeit(lambda: [best_rational(x, max_denominator) for x in column]))
+    _report(f"best_rationals ({size})", _timeit(best_rationals, column, max_denominator))
+    _report(f"Fraction.limit_denominator ({size})",
+            _timeit(lambda: [Fraction(x).limit_denominator(max_denominator) for x in column]))
+
+
+def bench_matrix_backends(sizes=(50, 100, 200), backends=('numpy', 'python')):
+    """Matrix和Vector在NumPy后端与纯Python后端下的对比"""
+    for backend in backends:
+        if backend == 'numpy' and linear_algebra.np is None:
+            continue
+        linear_algebra.set_backend(backend)
+        for n in sizes:
+            a = Matrix([[random() for j in range(n)] for i in range(n)])
+            b = Matrix([[random() for j in range(n)] for i in range(n)])
+            v = Vector([random() for i in range(n)])
+            _report(f"{backend} matmul ({n}x{n})", _timeit(lambda: a * b, repeat=1))
+            _report(f"{backend} matvec+transpose ({n}x{n})", _timeit(lambda: a.transpose() * v))
+            _report(f"{backend} dot+norm ({n})", _timeit(lambda: (v.dot(v), v.norm())))
+    linear_algebra.set_backend('numpy' if linear_algebra.np is not None else 'python')
+
+
+def bench_lu(sizes=(10, 50, 100, 200), exact_sizes=(10, 20, 40)):
+    """基于LU分解的行列式, 逆矩阵和解方程组"""
+    for n in sizes:
+        rows = [[random() for j in range(n)] for i in range(n)]
+        b = Vector([random() for i in range(n)])
+        _report(f"float determinant+inverse+solve ({n}x{n})",
+                _timeit(lambda: (lambda a: (a.determinant(), a.inverse(), a.solve(b)))(Matrix(rows))))
+    for n in exact_sizes:
+        rows = [[randrange(-100, 100) for j in range(n)] for i in range(n)]
+        b = Vector([randrange(-100, 100) for i in range(n)])
+        _report(f"Bareiss determinant+inverse+solve ({n}x{n})",
+                _timeit(lambda: (lambda a: (a.determinant(), a.inverse(), a.solve(b)))(Matrix(rows)), repeat=1))
+
+
+def _naive_matmul(a, b):
+    """原Matrix.__mul__的做法: 按列下标逐个取右矩阵的元素"""
+    return [[sum([a[i][k] * b[k][j] for k in range(len(b))]) for j in range(len(b[0]))] for i in range(len(a))]
+
+
+def bench_matmul(sizes=(64, 128, 256, 512, 1024), naive_limit=256):
+    """纯Python分块矩阵乘法(单进程和多进程)与原来的三重循环对比"""
+    linear_algebra.set_backend('python')
+    for n in sizes:
+        a = Matrix([[random() for j in range(n)] for i in range(n)])
+        b = Matrix([[random() for j in range(n)] for i in range(n)])
+        _report(f"blocked matmul ({n}x{n})", _timeit(a.matmul, b, 1, repeat=1))
+        if (os.cpu_count() or 1) > 1:
+            _report(f"parallel matmul ({n}x{n})", _timeit(a.matmul, b, repeat=1))
+        if n <= naive_limit:
+            _report(f"naive matmul ({n}x{n})", _timeit(_naive_matmul, a.matrix, b.matrix, repeat=1))
+    linear_algebra.set_backend('numpy' if linear_algebra.np is not None else 'python')
+
+
+def bench_sparse(nodes=10 ** 6, degree=4):
+    """百万行随机图上的稀疏矩阵构造, 乘向量, 转置和稀疏乘法"""
+    edges = [(randrange(nodes), randrange(nodes), random()) for i in range(nodes * degree)]
+    _report(f"CSRMatrix.from_edges ({nodes} rows, {len(edges)} edges)",
+            _timeit(CSRMatrix.from_edges, edges, (nodes, nodes), repeat=1))
+    graph = CSRMatrix.from_edges(edges, (nodes, nodes))
+    x = Vector([random() for i in range(nodes)])
+    seconds = _timeit(graph.matvec, x)
+    _report(f"CSRMatrix.matvec ({graph.nnz()} nnz)", seconds)
+    print(f"{'':<8}{graph.nnz() / seconds / 1e6:.1f} M nnz/s")
+    _report(f"CSRMatrix.transpose ({graph.nnz()} nnz)", _timeit(graph.transpose, repeat=1))
+    small = CSRMatrix.from_edges(edges[:nodes // 10], (nodes, nodes))
+    _report(f"CSRMatrix.matmul ({small.nnz()} nnz)", _timeit(small.matmul, small, repeat=1))
+
+
+def _poisson(side):
+    """side*side网格上的二维Poisson矩阵(五点差分), 对称正定"""
+    def edges():
+        for i in range(side):
+            for j in range(side):
+                k = i * side + j
+                yield k, k, 4.0
+                for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                    if 0 <= i + di < side and 0 <= j + dj < side:
+                        yield k, (i + di) * side + j + dj, -1.0
+    return CSRMatrix.from_edges(edges(), (side * side, side * side))
+
+
+def bench_solvers(sizes=(50, 100, 200), side=300):
+    """直接法, 最小二乘和大型稀疏系统上的迭代法"""
+    for n in sizes:
+        a = Matrix([[random() + (n if i == j else 0) for j in range(n)] for i in range(n)])
+        b = Vector([random() for i in range(n)])
+        _report(f"solve ({n}x{n})", _timeit(lambda: solve(Matrix(a.matrix), b)))
+        _report(f"inverse * b ({n}x{n})", _timeit(lambda: Matrix(a.matrix).inverse() * b))
+        tall = Matrix([[random() for j in range(n)] for i in range(2 * n)])
+        _report(f"lstsq ({2 * n}x{n})", _timeit(lstsq, tall, Vector([random() for i in range(2 * n)])))
+    poisson = _poisson(side)
+    b = Vector([1.0] * (side * side))
+    for name, function in (('conjugate_gradient', conjugate_gradient), ('gmres', gmres)):
+        for preconditioner in (None, jacobi_preconditioner(poisson)):
+            start = perf_counter()
+            result = function(poisson, b, tol=1e-8, preconditioner=preconditioner)
+            label = f"{name}{' + jacobi' if preconditioner else ''} ({side * side} unknowns)"
+            _report(label, perf_counter() - start)
+            print(f"{'':<8}converged={result.converged}, iterations={result.iterations}, "
+                  f"residual={result.residuals[-1]:.3e}")
+
+
+def bench_spectral(sizes=(20, 50, 100, 200), backends=('python', 'numpy'), side=300, k=5):
+    """对称特征分解, 一般特征值, 奇异值分解, 以及大型稀疏矩阵上的幂迭代和Lanczos"""
+    for backend in backends:
+        if backend == 'numpy' and linear_algebra.np is None:
+            continue
+        linear_algebra.set_backend(backend)
+        for n in sizes:
+            rows = [[random() for j in range(n)] for i in range(n)]
+            a = Matrix(rows)
+            symmetric = Matrix([[rows[i][j] + rows[j][i] for j in range(n)] for i in range(n)])
+            tall = Matrix([[random() for j in range(n)] for i in range(2 * n)])
+            _report(f"{backend} eigh ({n}x{n})", _timeit(eigh, symmetric, repeat=1))
+            _report(f"{backend} eigvals ({n}x{n})", _timeit(eigvals, a, repeat=1))
+            _report(f"{backend} svd ({2 * n}x{n})", _timeit(svd, tall, repeat=1))
+    linear_algebra.set_backend('numpy' if linear_algebra.np is not None else 'python')
+    poisson = _poisson(side)
+    _report(f"power_iteration ({side * side}x{side * side} sparse)",
+            _timeit(lambda: power_iteration(poisson, tol=1e-6, max_iterations=10 ** 5), repeat=1))
+    _report(f"lanczos top {k} ({side * side}x{side * side} sparse)", _timeit(lanczos, poisson, k, repeat=1))
+
+
+def _particle_step_allocating(positions, velocities, forces, dt):
+    """每一步都构造新向量的写法"""
+    for i in range(len(positions)):
+        velocities[i] = velocities[i] + forces[i] * dt
+        positions[i] = positions[i] + velocities[i] * dt
+
+
+def _particle_step_inplace(positions, velocities, forces, dt):
+    """原地更新的写法"""
+    for position, velocity, force in zip(positions, velocities, forces):
+        velocity.axpy(dt, force)
+        position.axpy(dt, velocity)
+
+
+def _allocated_per_step(step, *state):
+    """
+    tracemalloc统计一步中分配的内存
+    step之前的状态保持引用, 被替换掉的旧向量不会释放, 所以峰值就是这一步新分配的内存
+    """
+    tracemalloc.start()
+    try:
+        retained = [list(vectors) for vectors in state if isinstance(vectors, list)]
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        step(*state)
+        allocated = tracemalloc.get_traced_memory()[1] - current
+        del retained
+        return allocated
+    finally:
+        tracemalloc.stop()
+
+
+def bench_vector_updates(particles=10 ** 4, dimension=3, steps=10, dt=0.01):
+    """粒子更新循环: 每步新建向量与原地axpy对比, 以及每步临时分配的内存"""
+    def state():
+        return [[Vector([random() for j in range(dimension)]) for i in range(particles)] for k in range(3)]
+    for name, step in (('allocating', _particle_step_allocating), ('in-place axpy', _particle_step_inplace)):
+        positions, velocities, forces = state()
+        _report(f"{name} particle update ({particles}x{dimension}, {steps} steps)",
+                _timeit(lambda: [step(positions, velocities, forces, dt) for i in range(steps)]))
+        allocated = _allocated_per_step(step, positions, velocities, forces, dt)
+        print(f"{'':<8}{allocated / 1024:.1f} KiB allocated per step")
+    u, v = Vector([random() for i in range(dimension)]), Vector([random() for i in range(dimension)])
+    _report(f"norm+dot ({dimension}) x {particles}", _timeit(lambda: [(u.norm(), u.dot(v)) for i in range(particles)]))
+
+
+def bench_vector_batch(size=10 ** 6, points=10 ** 5, queries=10 ** 3, k=10):
+    """VectorBatch整批运算与逐个Vector对比, 以及k近邻查询"""
+    batch_a = VectorBatch([[random(), random(), random()] for i in range(size)])
+    batch_b = VectorBatch([[random(), random(), random()] for i in range(size)])
+    vectors_a, vectors_b = list(batch_a), list(batch_b)
+    for name, batched, single in (
+            ('dot', lambda: batch_a.dot(batch_b), lambda: [a.dot(b) for a, b in zip(vectors_a, vectors_b)]),
+            ('norm', batch_a.norm, lambda: [a.norm() for a in vectors_a]),
+            ('angle', lambda: batch_a.angle(batch_b), lambda: [a.angle(b) for a, b in zip(vectors_a, vectors_b)]),
+            ('cross', lambda: batch_a.cross(batch_b), lambda: [a.cross(b) for a, b in zip(vectors_a, vectors_b)])):
+        _report(f"VectorBatch.{name} ({size})", _timeit(batched))
+        _report(f"Vector.{name} loop ({size})", _timeit(single, repeat=1))
+    cloud = VectorBatch([[random(), random(), random()] for i in range(points)])
+    probes = VectorBatch([[random(), random(), random()] for i in range(queries)])
+    _report(f"VectorBatch.knn ({queries} queries, {points} points, k={k})", _timeit(cloud.knn, probes, k))
+    _report(f"pairwise_distances ({queries}x{queries})", _timeit(probes.pairwise_distances))
+
+
+def bench_lazy(n=200, terms=8, backends=('numpy', 'python')):
+    """延迟计算表达式与逐步计算对比: 连乘的顺序优化和加法/数乘的合并"""
+    for backend in backends:
+        if backend == 'numpy' and linear_algebra.np is None:
+            continue
+        linear_algebra.set_backend(backend)
+        a, b, c, d = (Matrix([[random() for j in range(n)] for i in range(n)]) for k in range(4))
+        v, w = Vector([random() for i in range(n)]), Vector([random() for i in range(n)])
+        _report(f"{backend} eager A*B*C*v + w ({n}x{n})", _timeit(lambda: a * b * c * v + w, repeat=1))
+        _report(f"{backend} lazy A*B*C*v + w ({n}x{n})", _timeit(lambda: (a.lazy() * b * c * v + w).evaluate()))
+        matrices = [a, b, c, d] * (terms // 4)
+        _report(f"{backend} eager sum of {terms} scaled ({n}x{n})",
+                _timeit(lambda: sum((m * (k + 1) for k, m in enumerate(matrices[1:])), matrices[0])))
+        _report(f"{backend} lazy sum of {terms} scaled ({n}x{n})",
+                _timeit(lambda: sum((m.lazy() * (k + 1) for k, m in enumerate(matrices[1:])), matrices[0].lazy()).evaluate()))
+    linear_algebra.set_backend('numpy' if linear_algebra.np is not None else 'python')
+
+
+def bench_polynomial(size=10 ** 5, variables=5):
+    """稀疏多项式的加法与逐项累加"""
+    unknowns = [Var(f'x{i}') for i in range(variables)]
+
+    def polynomial():
+        terms = {tuple(randrange(30) for v in unknowns): randrange(1, 10) for i in range(size)}
+        return Expression._wrap(Polynomial(unknowns, terms))
+
+    p, q = polynomial(), polynomial()
+    monomials = [Monomial(randrange(1, 10), {v: randrange(30) for v in unknowns}) for i in range(size)]
+    _report(f"Expression add ({size} + {size} terms)", _timeit(lambda: p + q))
+    _report(f"Expression from {size} monomials", _timeit(Expression, monomials))
+    _report(f"Expression mul ({size // 300} x {size // 300} terms)",
+            _timeit(lambda: Expression(monomials[:size // 300]) * Expression(monomials[-(size // 300):])))
+
+
+if __name__ == '__main__':
+    bench_primes()
+    bench_spf()
+    bench_divisors()
+    bench_gcd_lcm()
+    bench_modular()
+    bench_prime_counting()
+    bench_parallel_primes()
+    bench_rational()
+    bench_rational_array()
+    bench_best_rational()
+    bench_matrix_backends()
+    bench_lu()
+    bench_matmul()
+    bench_sparse()
+    bench_solvers()
+    bench_spectral()
+    bench_vector_updates()
+    bench_vector_batch()
+    bench_lazy()
+    bench_polynomial()
@@ -1,273 +1,546 @@
-"""代数式"""
-
-
-from mathematics.number import *
-
-
-__all__ = ['Var', 'Monomial', 'Expression']
-
-
-class Var:
-    """数学变量"""
-
-    def __init__(self, string):
-        self.string = string
-
-    def __str__(self):
-        return(self.string)
-    
-    def __repr__(self):
-        return(self.string)
-
-
-class Monomial:
-    """单项式"""
-
-    def __init__(self, coefficient, unknowns: dict):
-        """初始化属性coefficient和unknowns"""
-        if not isinstance(coefficient, (int, float, RationalNumber)):
-            raise TypeError('coefficient must be a number')
-        if not isinstance(unknowns, dict):
-            raise TypeError('unknowns must be a dictionary')
-        if not all(isinstance(k, Var) for k in unknowns.keys()):
-            raise TypeError('unknowns keys must be vars')
-        if not all(isinstance(v, (int, float, RationalNumber)) for v in unknowns.values()):
-            raise TypeError('unknowns values must be numbers')
-        self.coefficient = coefficient
-        self.unknowns = unknowns
-        self.reduce()
-    
-    def time(self) -> str:
-        """返回单项式的次数"""
-        time = 0
-        for v in self.unknowns.values():
-            time += v
-        return time
-    
-    def __str__(self) -> str:
-        """字符串表示"""
-        s = ''
-        if self.coefficient != 1 and self.coefficient != -1:
-            s += str(self.coefficient)
-        s += ''.join([str(k) + '^' + str(v) for k, v in self.unknown.items()])
-        return s
-    
-    def reduce(self):
-        items = self.unknowns.copy()
-        for k, v in self.unknowns.items():
-            if v == 0:
-                del items[k]
-        if self.unknowns.copy() == {}:
-            return Monomial(0, {})
-        return (self.coefficient, items)
-    
-    def value(self, var_value: dict):
-        """带入求值"""
-        new_coefficient = self.coefficient
-        un = self.unknowns.copy()
-        for k, v in self.unknowns.items():
-            for i in var_value.keys():
-                if k is i:
-                    new_coefficient *= var_value[i] ** v
-                    del un[k]
-        if not un:
-            return new_coefficient
-        else:
-            result = Monomial(new_coefficient, un)
-            return result
-    
-    def __eq__(self, other) -> bool:
-        """判断是否相等"""
-        if isinstance(other, Monomial):
-            return self.coefficient == other.coefficient and self.unknowns == other.unknowns
-        return False
-    
-    def __hash__(self) -> int:
-        """哈希值"""
-        return hash((self.coefficient, tuple(self.unknowns.items())))
-    
-    def __pos__(self) -> 'Monomial':
-        """取正"""
-        return self
-    
-    def __neg__(self) -> 'Monomial':
-        """取负"""
-        return Monomial(-self.coefficient, self.unknowns)
-    
-    def __invert__(self) -> 'Monomial':
-        """取倒数"""
-        new_unknowns = {k: -v for k, v in self.unknowns.items()}
-        new_coefficient = 1 / self.coefficient
-        m = Monomial(new_coefficient, new_unknowns)
-        return m
-    
-    def __abs__(self) -> 'Monomial':
-        """取绝对值"""
-        self.coefficient = abs(self.coefficient)
-        return self
-    
-    def is_similar(self, other) -> bool:
-        """判断是否为同类项"""
-        if isinstance(other, Monomial):
-            if self.unknowns == other.unknowns:
-                return True
-        return False
-    
-    def __add__(self, other) -> 'Monomial':
-        """加法"""
-        if isinstance(other, (int, float, RationalNumber)):
-            return Expression([self], other)
-        if isinstance(other, Monomial):
-            if self.is_similar(other):
-                self.coefficient += other.coefficient
-                m = Monomial(self.coefficient, self.unknowns)
-                return m
-            else:
-                return Expression([self, other], 0)
-    
-    def __radd__(self, other) -> 'Monomial':
-        """右加法"""
-        return self.__add__(other)
-    
-    def __sub__(self, other) -> 'Monomial':
-        """减法"""
-        return self.__add__(-other)
-    
-    def __rsub__(self, other) -> 'Monomial':
-        """右减法"""
-        return -self.__sub__(other)
-    
-    def __mul__(self, other) -> 'Monomial':
-        """乘法"""
-        if isinstance(other, (int, float, RationalNumber)):
-            self.coefficient *= other
-            m = Monomial(self.coefficient, self.unknowns)
-            return m
-        
-        if isinstance(other, Monomial):
-            new_unknowns = self.unknowns.copy()
-            for k, v in other.unknowns.items():
-                if k in new_unknowns:
-                    new_unknowns[k] += v
-                else:
-                    new_unknowns[k] = v
-            new_coefficient = self.coefficient * other.coefficient
-            m = Monomial(new_coefficient, new_unknowns)
-            return m
-        
-    def __truediv__(self, other) -> 'Monomial':
-        """除法"""
-        if isinstance(other, (int, float, RationalNumber)):
-            self.coefficient /= other
-            m = Monomial(self.coefficient, self.unknowns)
-            return m
-        
-        if isinstance(other, Monomial):
-            new_unknowns = self.unknowns.copy()
-            for k, v in other.unknowns.items():
-                if k in new_unknowns:
-                    new_unknowns[k] -= v
-                else:
-                    new_unknowns[k] = -v
-            new_coefficient = self.coefficient / other.coefficient
-            m = Monomial(new_coefficient, new_unknowns)
-            return m
-    
-    def __pow__(self, other) -> 'Monomial':
-        """乘方"""
-        if not isinstance(other, (int, float, RationalNumber)):
-            raise TypeError('exponent must be a number')
-        if other == 0:
-            return Monomial(1, {})
-        if other < 0:
-            return 1 / self ** (-other)
-        new_unknowns = {k: v * other for k, v in self.unknowns.items()}
-        new_coefficient = self.coefficient ** other
-        m = Monomial(new_coefficient, new_unknowns)
-        return m
-    
-    def __repr__(self):
-        """字符串表示"""
-        s = ''
-        if self.coefficient == -1:
-            s += ' -'
-            s += str(self.coefficient) + ' '
-        for k, v in self.unknowns.items():
-            s += str(k) + '^' + str(v)
-        return s
-
-
-class Expression:
-    def __init__(self, monomials: list , constant=0):
-        """初始化属性monomials和constant"""
-        if not isinstance(monomials, list):
-            raise TypeError('monomials must be a list')
-        if not all(isinstance(m, Monomial) for m in monomials):
-            raise TypeError('monomials must be a list of Monomial objects')
-        if not isinstance(constant, (int, RationalNumber)):
-            raise TypeError('constant must be a number')
-        self.monomials = monomials
-        self.constant = constant
-    
-    def __str__(self) -> str:
-        """字符串表示"""
-        s = ''
-        if self.monomials:
-            if self.monomials[0]:
-                for m in self.monomials[0:]:
-                    s += ' + ' + str(m)
-        if self.constant != 0:
-            s += ' + ' + str(self.constant)
-        return s
-    
-    def value(self, var_value: dict):
-        """带入求值"""
-        value = Expression([], self.constant)
-        value += sum(m.value(var_value) for m in self.monomials)
-        return value
-    
-    def __eq__(self, other):
-        return self.monomials == other.monomials and self.constant == other.constant
-    
-    def __add__(self, other) -> 'Expression':
-        """加法"""
-        new_monomials = self.monomials.copy()
-        new_constant = self.constant
-
-        if isinstance(other, (int, RationalNumber)):
-            new_constant += other
-        
-        if isinstance(other, Monomial):
-            found = False
-            for m in new_monomials:
-                if m.is_similar(other):
-                    m.coefficient += other.coefficient
-                    found = True
-                    break
-            if not found:
-                new_monomials.append(other)
-        
-        if isinstance(other, Expression):
-            for m in other.monomials:
-                self += m
-            self.constant += other.constant
-            return self
-        
-        return Expression(new_monomials, new_constant)
-    
-    def __radd__(self, other) -> 'Expression':
-        """右加法"""
-        return self.__add__(other)
-    
-    def __sub__(self, other) -> 'Expression':
-        """减法"""
-        pass
-    
-    def __repr__(self) -> str:
-        """字符串表示"""
-        s = ''
-        if self.monomials[0]:
-            s += ' + '.join([str(m) for m in self.monomials])
-            if self.constant != 0:
-                s += ' + ' + str(self.constant)
-        return s
\ No newline at end of file
+"""代数式"""
+
+
+from itertools import count
+from operator import add
+
+from mathematics.number import *
+
+
+__all__ = ['Var', 'Monomial', 'Expression', 'Polynomial']
+
+
+_var_keys = count()
+_exponent_tuples = {}
+
+
+def _intern(exponents: tuple) -> tuple:
+    """驻留指数元组, 相同的指数组合共用同一个元组对象"""
+    return _exponent_tuples.setdefault(exponents, exponents)
+
+
+def _var_key(var) -> int:
+    return var.key
+
+
+class Var:
+    """数学变量, key是创建顺序, 多项式中的变量按它排列"""
+
+    def __init__(self, string):
+        self.string = string
+        self.key = next(_var_keys)
+
+    def __str__(self):
+        return(self.string)
+    
+    def __repr__(self):
+        return(self.string)
+
+
+def _merge_variables(a: tuple, b: tuple) -> tuple:
+    """两个有序变量元组的并集, 仍按创建顺序排列"""
+    if a == b or all(v in a for v in b):
+        return a
+    seen = set(a)
+    return tuple(sorted(a + tuple(v for v in b if v not in seen), key=_var_key))
+
+
+def _format_term(coefficient, variables, exponents) -> str:
+    """一项的字符串表示"""
+    unknowns = ''.join(str(k) if v == 1 else f'{k}^{v}' for k, v in zip(variables, exponents) if v != 0)
+    if not unknowns:
+        return str(coefficient)
+    if coefficient == 1:
+        return unknowns
+    if coefficient == -1:
+        return '-' + unknowns
+    return str(coefficient) + unknowns
+
+
+class Polynomial:
+    """
+    稀疏多项式
+    variables是按创建顺序排列的变量元组, terms把与之对应的指数元组映射到非零系数, 全零的指数元组是常数项
+    指数元组经过驻留, 合并同类项只需一次字典查找
+    """
+
+    __slots__ = ('variables', 'terms')
+
+    def __init__(self, variables=(), terms=None):
+        """初始化属性variables和terms"""
+        variables = tuple(variables)
+        if not all(isinstance(v, Var) for v in variables):
+            raise TypeError('variables must be vars')
+        if len(set(variables)) != len(variables):
+            raise ValueError('variables must be distinct')
+        order = sorted(range(len(variables)), key=lambda i: variables[i].key)
+        self.variables = tuple(variables[i] for i in order)
+        self.terms = {}
+        for exponents, coefficient in (terms or {}).items():
+            if len(exponents) != len(variables):
+                raise ValueError('exponents must match variables')
+            if not isinstance(coefficient, (int, float, RationalNumber)):
+                raise TypeError('coefficients must be numbers')
+            self._add_term(_intern(tuple(exponents[i] for i in order)), coefficient)
+
+    @classmethod
+    def _make(cls, variables: tuple, terms: dict) -> 'Polynomial':
+        """不检查参数直接构造"""
+        polynomial = cls.__new__(cls)
+        polynomial.variables, polynomial.terms = variables, terms
+        return polynomial
+
+    def copy(self) -> 'Polynomial':
+        return Polynomial._make(self.variables, self.terms.copy())
+
+    @property
+    def constant(self):
+        """常数项"""
+        return self.terms.get((0,) * len(self.variables), 0)
+
+    def __len__(self) -> int:
+        """非零项的个数"""
+        return len(self.terms)
+
+    def _add_term(self, exponents: tuple, coefficient):
+        """原地合并一项, exponents需已驻留且与variables对应"""
+        coefficient += self.terms.get(exponents, 0)
+        if coefficient == 0:
+            self.terms.pop(exponents, None)
+        else:
+            self.terms[exponents] = coefficient
+
+    def _aligned(self, variables: tuple) -> dict:
+        """各项换到包含self.variables的变量元组variables上"""
+        if variables == self.variables:
+            return self.terms
+        positions = [variables.index(v) for v in self.variables]
+        zeros = [0] * len(variables)
+        terms = {}
+        for exponents, coefficient in self.terms.items():
+            aligned = zeros.copy()
+            for i, e in zip(positions, exponents):
+                aligned[i] = e
+            terms[_intern(tuple(aligned))] = coefficient
+        return terms
+
+    def _add_monomial(self, coefficient, variables: tuple, exponents: tuple):
+        """原地加上一个单项式, variables是它自己的有序变量元组"""
+        if coefficient == 0:
+            return
+        if variables != self.variables:
+            merged = _merge_variables(self.variables, variables)
+            if merged is not self.variables:
+                self.terms = self._aligned(merged)
+                self.variables = merged
+            aligned = [0] * len(merged)
+            for v, e in zip(variables, exponents):
+                aligned[merged.index(v)] = e
+            exponents = _intern(tuple(aligned))
+        self._add_term(exponents, coefficient)
+
+    def _add_aligned(self, terms: dict):
+        """原地加上已经与variables对应的各项, 只有同类项需要逐个相加"""
+        own = self.terms
+        if len(terms) == 1:
+            for exponents, coefficient in terms.items():
+                self._add_term(exponents, coefficient)
+            return
+        sums = [(e, own[e] + terms[e]) for e in own.keys() & terms.keys()]
+        own.update(terms)
+        for exponents, coefficient in sums:
+            if coefficient == 0:
+                del own[exponents]
+            else:
+                own[exponents] = coefficient
+
+    def _iadd(self, other, sign=1) -> 'Polynomial':
+        """原地加上(sign为-1时减去)一个数或多项式, 每项O(1)"""
+        if isinstance(other, (int, float, RationalNumber)):
+            self._add_term(_intern((0,) * len(self.variables)), sign * other)
+            return self
+        variables = _merge_variables(self.variables, other.variables)
+        if variables != self.variables:
+            self.terms = self._aligned(variables)
+            self.variables = variables
+        terms = other._aligned(variables)
+        self._add_aligned(terms if sign == 1 else {e: -c for e, c in terms.items()})
+        return self
+
+    def __add__(self, other) -> 'Polynomial':
+        """加法"""
+        if not isinstance(other, (int, float, RationalNumber, Polynomial)):
+            return NotImplemented
+        return self.copy()._iadd(other)
+
+    def __radd__(self, other) -> 'Polynomial':
+        """右加法"""
+        return self.__add__(other)
+
+    def __sub__(self, other) -> 'Polynomial':
+        """减法"""
+        if not isinstance(other, (int, float, RationalNumber, Polynomial)):
+            return NotImplemented
+        return self.copy()._iadd(other, -1)
+
+    def __rsub__(self, other) -> 'Polynomial':
+        """右减法"""
+        return (-self).__add__(other)
+
+    def __neg__(self) -> 'Polynomial':
+        """取负"""
+        return Polynomial._make(self.variables, {e: -c for e, c in self.terms.items()})
+
+    def __mul__(self, other) -> 'Polynomial':
+        """乘法"""
+        if isinstance(other, (int, float, RationalNumber)):
+            if other == 0:
+                return Polynomial._make(self.variables, {})
+            return Polynomial._make(self.variables, {e: c * other for e, c in self.terms.items()})
+        if not isinstance(other, Polynomial):
+            return NotImplemented
+        variables = _merge_variables(self.variables, other.variables)
+        result = Polynomial._make(variables, {})
+        right = other._aligned(variables).items()
+        for e1, c1 in self._aligned(variables).items():
+            for e2, c2 in right:
+                result._add_term(_intern(tuple(map(add, e1, e2))), c1 * c2)
+        return result
+
+    def __rmul__(self, other) -> 'Polynomial':
+        """右乘法"""
+        return self.__mul__(other)
+
+    def __eq__(self, other) -> bool:
+        """判断是否相等, 与变量元组的排列和多余的零次变量无关"""
+        if isinstance(other, (int, float, RationalNumber)):
+            other = Polynomial()._iadd(other)
+        if not isinstance(other, Polynomial):
+            return False
+        variables = _merge_variables(self.variables, other.variables)
+        return self._aligned(variables) == other._aligned(variables)
+
+    __hash__ = None
+
+    def value(self, var_value: dict) -> 'Polynomial':
+        """带入求值, 代入的变量从结果中去掉"""
+        substituted = [i for i, v in enumerate(self.variables) if v in var_value]
+        kept = [i for i, v in enumerate(self.variables) if v not in var_value]
+        result = Polynomial._make(tuple(self.variables[i] for i in kept), {})
+        for exponents, coefficient in self.terms.items():
+            for i in substituted:
+                coefficient *= var_value[self.variables[i]] ** exponents[i]
+            result._add_term(_intern(tuple(exponents[i] for i in kept)), coefficient)
+        return result
+
+    def __str__(self) -> str:
+        """字符串表示"""
+        if not self.terms:
+            return '0'
+        terms = sorted(self.terms.items(), key=lambda term: not any(term[0]))
+        return ' + '.join(_format_term(c, self.variables, e) for e, c in terms)
+
+    def __repr__(self) -> str:
+        return f'Polynomial: {self}'
+
+
+class Monomial:
+    """
+    单项式, 只保存按创建顺序排列的非零次变量和驻留的指数元组, 相当于只有一项的Polynomial
+    可以哈希, 因此是不可变的, 运算总是返回新的单项式
+    """
+
+    __slots__ = ('_coefficient', '_variables', '_exponents')
+
+    def __init__(self, coefficient, unknowns: dict):
+        """初始化属性coefficient和unknowns"""
+        if not isinstance(coefficient, (int, float, RationalNumber)):
+            raise TypeError('coefficient must be a number')
+        if not isinstance(unknowns, dict):
+            raise TypeError('unknowns must be a dictionary')
+        if not all(isinstance(k, Var) for k in unknowns.keys()):
+            raise TypeError('unknowns keys must be vars')
+        if not all(isinstance(v, (int, float, RationalNumber)) for v in unknowns.values()):
+            raise TypeError('unknowns values must be numbers')
+        items = sorted(((k, v) for k, v in unknowns.items() if v != 0), key=lambda item: item[0].key)
+        self._coefficient = coefficient
+        self._variables = tuple(k for k, v in items)
+        self._exponents = _intern(tuple(v for k, v in items))
+
+    @classmethod
+    def _from_term(cls, coefficient, variables: tuple, exponents: tuple) -> 'Monomial':
+        """由多项式中的一项构造, 去掉零次的变量"""
+        monomial = cls.__new__(cls)
+        monomial._coefficient = coefficient
+        if 0 in exponents:
+            pairs = [(k, v) for k, v in zip(variables, exponents) if v != 0]
+            variables = tuple(k for k, v in pairs)
+            exponents = _intern(tuple(v for k, v in pairs))
+        monomial._variables, monomial._exponents = variables, exponents
+        return monomial
+
+    @property
+    def coefficient(self):
+        """系数"""
+        return self._coefficient
+
+    @property
+    def unknowns(self) -> dict:
+        """变量到指数的字典, 返回的是新字典"""
+        return dict(zip(self._variables, self._exponents))
+
+    def polynomial(self) -> Polynomial:
+        """转换成Polynomial"""
+        return Polynomial._make(self._variables, {self._exponents: self.coefficient} if self.coefficient != 0 else {})
+    
+    def time(self) -> str:
+        """返回单项式的次数"""
+        return sum(self._exponents)
+    
+    def __str__(self) -> str:
+        """字符串表示"""
+        return _format_term(self.coefficient, self._variables, self._exponents)
+    
+    def reduce(self):
+        """系数和去掉零次变量后的unknowns"""
+        return (self.coefficient, self.unknowns)
+    
+    def value(self, var_value: dict):
+        """带入求值"""
+        new_coefficient = self.coefficient
+        un = {}
+        for k, v in zip(self._variables, self._exponents):
+            if k in var_value:
+                new_coefficient *= var_value[k] ** v
+            else:
+                un[k] = v
+        if not un:
+            return new_coefficient
+        return Monomial(new_coefficient, un)
+    
+    def __eq__(self, other) -> bool:
+        """判断是否相等"""
+        if isinstance(other, Monomial):
+            return self.coefficient == other.coefficient and self.is_similar(other)
+        return False
+    
+    def __hash__(self) -> int:
+        """哈希值, 与unknowns的插入顺序无关"""
+        return hash((self.coefficient, self._variables, self._exponents))
+    
+    def __pos__(self) -> 'Monomial':
+        """取正"""
+        return self
+    
+    def __neg__(self) -> 'Monomial':
+        """取负"""
+        return Monomial._from_term(-self.coefficient, self._variables, self._exponents)
+    
+    def __invert__(self) -> 'Monomial':
+        """取倒数"""
+        return Monomial._from_term(1 / self.coefficient, self._variables, tuple(-v for v in self._exponents))
+    
+    def __abs__(self) -> 'Monomial':
+        """取绝对值"""
+        return Monomial._from_term(abs(self.coefficient), self._variables, self._exponents)
+    
+    def is_similar(self, other) -> bool:
+        """判断是否为同类项"""
+        if isinstance(other, Monomial):
+            return self._variables == other._variables and self._exponents == other._exponents
+        return False
+    
+    def __add__(self, other):
+        """加法"""
+        if isinstance(other, (int, float, RationalNumber)):
+            return Expression([self], other)
+        if isinstance(other, Monomial):
+            if self.is_similar(other):
+                return Monomial._from_term(self.coefficient + other.coefficient, self._variables, self._exponents)
+            return Expression([self, other], 0)
+        return NotImplemented
+    
+    def __radd__(self, other):
+        """右加法"""
+        return self.__add__(other)
+    
+    def __sub__(self, other):
+        """减法"""
+        if not isinstance(other, (int, float, RationalNumber, Monomial)):
+            return NotImplemented
+        return self.__add__(-other)
+    
+    def __rsub__(self, other):
+        """右减法"""
+        return (-self).__add__(other)
+    
+    def __mul__(self, other) -> 'Monomial':
+        """乘法"""
+        if isinstance(other, (int, float, RationalNumber)):
+            return Monomial._from_term(self.coefficient * other, self._variables, self._exponents)
+        if isinstance(other, Monomial):
+            new_unknowns = self.unknowns
+            for k, v in zip(other._variables, other._exponents):
+                new_unknowns[k] = new_unknowns.get(k, 0) + v
+            return Monomial(self.coefficient * other.coefficient, new_unknowns)
+        return NotImplemented
+
+    def __rmul__(self, other) -> 'Monomial':
+        """右乘法"""
+        return self.__mul__(other)
+        
+    def __truediv__(self, other) -> 'Monomial':
+        """除法"""
+        if isinstance(other, (int, float, RationalNumber)):
+            return Monomial._from_term(self.coefficient / other, self._variables, self._exponents)
+        if isinstance(other, Monomial):
+            return self * ~other
+        return NotImplemented
+    
+    def __pow__(self, other) -> 'Monomial':
+        """乘方"""
+        if not isinstance(other, (int, float, RationalNumber)):
+            raise TypeError('exponent must be a number')
+        if other == 0:
+            return Monomial(1, {})
+        if other < 0:
+            return ~(self ** (-other))
+        return Monomial._from_term(self.coefficient ** other, self._variables, tuple(v * other for v in self._exponents))
+    
+    def __repr__(self):
+        """字符串表示"""
+        return str(self)
+
+
+class Expression:
+    """
+    多项式, 是Polynomial的视图, monomials和constant都由它的各项得到
+    +和-返回新的Expression; +=和-=像list一样原地修改(每个单项式O(1)), 指向同一个对象的其他名字也会看到变化
+    """
+
+    def __init__(self, monomials: list , constant=0):
+        """初始化属性monomials和constant"""
+        if not isinstance(monomials, list):
+            raise TypeError('monomials must be a list')
+        if not all(isinstance(m, Monomial) for m in monomials):
+            raise TypeError('monomials must be a list of Monomial objects')
+        if not isinstance(constant, (int, float, RationalNumber)):
+            raise TypeError('constant must be a number')
+        self._polynomial = Polynomial()
+        for m in monomials:
+            self._polynomial._add_monomial(m.coefficient, m._variables, m._exponents)
+        self._polynomial._iadd(constant)
+
+    @classmethod
+    def _wrap(cls, polynomial: Polynomial) -> 'Expression':
+        """直接包装一个Polynomial"""
+        expression = cls.__new__(cls)
+        expression._polynomial = polynomial
+        return expression
+
+    @property
+    def polynomial(self) -> Polynomial:
+        """底层的稀疏多项式"""
+        return self._polynomial
+
+    @property
+    def monomials(self) -> list:
+        """非常数项"""
+        variables = self._polynomial.variables
+        return [Monomial._from_term(c, variables, e) for e, c in self._polynomial.terms.items() if any(e)]
+
+    @property
+    def constant(self):
+        """常数项"""
+        return self._polynomial.constant
+    
+    def __str__(self) -> str:
+        """字符串表示"""
+        return str(self._polynomial)
+    
+    def value(self, var_value: dict):
+        """带入求值, 所有变量都代入时返回数"""
+        polynomial = self._polynomial.value(var_value)
+        if not polynomial.variables:
+            return polynomial.constant
+        return Expression._wrap(polynomial)
+    
+    def __eq__(self, other):
+        other = _as_polynomial(other)
+        return other is not None and self._polynomial == other
+
+    def __iadd__(self, other) -> 'Expression':
+        """原地加法, 每个单项式O(1), 修改的是self本身而不是副本"""
+        if isinstance(other, Monomial):
+            self._polynomial._add_monomial(other.coefficient, other._variables, other._exponents)
+            return self
+        other = _as_polynomial(other)
+        if other is None:
+            return NotImplemented
+        self._polynomial._iadd(other)
+        return self
+
+    def __isub__(self, other) -> 'Expression':
+        """原地减法, 修改的是self本身而不是副本"""
+        if isinstance(other, Monomial):
+            self._polynomial._add_monomial(-other.coefficient, other._variables, other._exponents)
+            return self
+        other = _as_polynomial(other)
+        if other is None:
+            return NotImplemented
+        self._polynomial._iadd(other, -1)
+        return self
+    
+    def __add__(self, other) -> 'Expression':
+        """加法"""
+        other = _as_polynomial(other)
+        if other is None:
+            return NotImplemented
+        return Expression._wrap(self._polynomial + other)
+    
+    def __radd__(self, other) -> 'Expression':
+        """右加法"""
+        return self.__add__(other)
+    
+    def __sub__(self, other) -> 'Expression':
+        """减法"""
+        other = _as_polynomial(other)
+        if other is None:
+            return NotImplemented
+        return Expression._wrap(self._polynomial - other)
+
+    def __rsub__(self, other) -> 'Expression':
+        """右减法"""
+        return (-self).__add__(other)
+
+    def __neg__(self) -> 'Expression':
+        """取负"""
+        return Expression._wrap(-self._polynomial)
+
+    def __mul__(self, other) -> 'Expression':
+        """乘法"""
+        other = _as_polynomial(other)
+        if other is None:
+            return NotImplemented
+        return Expression._wrap(self._polynomial * other)
+
+    def __rmul__(self, other) -> 'Expression':
+        """右乘法"""
+        return self.__mul__(other)
+    
+    def __repr__(self) -> str:
+        """字符串表示"""
+        return str(self)
+
+
+def _as_polynomial(value):
+    """把数, 单项式或代数式转换成Polynomial, 其他类型返回None"""
+    if isinstance(value, Expression):
+        return value.polynomial
+    if isinstance(value, Monomial):
+        return value.polynomial()
+    if isinstance(value, Polynomial):
+        return value
+    if isinstance(value, (int, float, RationalNumber)):
+        return Polynomial()._iadd(value)
+    return None
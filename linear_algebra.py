@@ -1,162 +1,2676 @@
-"""线性代数"""
-
-
-import math
-
-
-class Vector:
-    """向量"""
-
-    def __init__(self, coordinates: list):
-        self.coordinates = coordinates
-
-    def __str__(self) -> str:
-        """字符串表示"""
-        return f'Vector: {self.coordinates}'
-
-    def __repr__(self) -> str:
-        return f'Vector: {self.coordinates}'
-    
-    def dimension(self) -> int:
-        """维数"""
-        return len(self.coordinates)
-
-    def __eq__(self, other):
-        """判断相等"""
-        return self.coordinates == other.coordinates
-
-    def __add__(self, other):
-        """相加"""
-        return Vector([x + y for x, y in zip(self.coordinates, other.coordinates)])
-
-    def __sub__(self, other):
-        """相减"""
-        return Vector([x - y for x, y in zip(self.coordinates, other.coordinates)])
-
-    def __mul__(self, other: int | float):
-        """数乘"""
-        return Vector([x*other for x in self.coordinates])
-
-    def __rmul__(self, other):
-        """右乘法"""
-        return self.__mul__(other)
-
-    def norm(self):
-        """模"""
-        return (sum([x**2 for x in self.coordinates])) ** 0.5
-
-    def unit(self):
-        """单位向量"""
-        mag = self.norm()
-        return Vector([x/mag for x in self.coordinates])
-
-    def dot(self, other):
-        """点积"""
-        return sum([x*y for x, y in zip(self.coordinates, other.coordinates)])
-
-    def angle(self, other):
-        """
-        夹角
-        在0和pi之间
-        """
-        mag1 = self.norm()
-        mag2 = other.norm()
-        dot_product = self.dot(other)
-        return math.acos(dot_product / mag1 / mag2)
-
-    def cross(self, other):
-        """叉积"""
-        x1, y1, z1 = self.coordinates
-        x2, y2, z2 = other.coordinates
-        return Vector([y1*z2 - y2*z1, z1*x2 - z2*x1, x1*y2 - x2*y1])
-
-
-class Matrix:
-    """矩阵"""
-
-    def __init__(self, matrix: list):
-        self.matrix = matrix
-
-    def __str__(self) -> str:
-        """字符串表示"""
-        return f'Matrix: {self.matrix}'
-
-    def __repr__(self) -> str:
-        return f'Matrix: {self.matrix}'
-
-    def __eq__(self, other):
-        """判断相等"""
-        return self.matrix == other.matrix
-
-    def __add__(self, other):
-        """相加"""
-        return Matrix([[x + y for x, y in zip(row1, row2)] for row1, row2 in zip(self.matrix, other.matrix)])
-
-    def __sub__(self, other):
-        """相减"""
-        return Matrix([[x - y for x, y in zip(row1, row2)] for row1, row2 in zip(self.matrix, other.matrix)])
-
-    def __mul__(self, other):
-        """矩阵乘法"""
-        if isinstance(other, Matrix):
-            if self.num_columns() != other.num_rows():
-                raise ValueError('Number of columns in first matrix must be equal to number of rows in second matrix.')
-            return Matrix([[sum([self.matrix[i][k] * other.matrix[k][j] for k in range(self.num_columns())]) for j in range(other.num_columns())] for i in range(self.num_rows())])
-        elif isinstance(other, Vector):
-            if self.num_columns() != other.dimension():
-                raise ValueError('Number of columns in matrix must be equal to dimension of vector.')
-            return Vector([sum([self.matrix[i][k] * other.coordinates[k] for k in range(self.num_columns())]) for i in range(self.num_rows())])
-        else:
-            return Matrix([[x*other for x in row] for row in self.matrix])
-
-    def __rmul__(self, other):
-        """右乘法"""
-        return self.__mul__(other)
-
-    def num_rows(self) -> int:
-        """行数"""
-        return len(self.matrix)
-
-    def num_columns(self) -> int:
-        """列数"""
-        return len(self.matrix[0])
-
-    def transpose(self):
-        """转置"""
-        return Matrix([[self.matrix[j][i] for j in range(self.num_rows())] for i in range(self.num_columns())])
-
-    def determinant(self):
-        """行列式"""
-        if self.num_rows() != self.num_columns():
-            raise ValueError('Matrix must be square.')
-        if self.num_rows() == 1:
-            return self.matrix[0][0]
-        elif self.num_rows() == 2:
-            return self.matrix[0][0]*self.matrix[1][1] - self.matrix[0][1]*self.matrix[1][0]
-        else:
-            det = 0
-            for j in range(self.num_columns()):
-                minor = self.submatrix(0, j)
-                det += ((-1) ** j) * self.matrix[0][j] * minor.determinant()
-            return det
-
-    def submatrix(self, i: int, j: int):
-        """子矩阵"""
-        return Matrix([[self.matrix[x][y] for y in range(self.num_columns()) if y != j] for x in range(1, self.num_rows())])
-
-    def inverse(self):
-        """逆矩阵"""
-        if self.num_rows() != self.num_columns():
-            raise ValueError('Matrix must be square.')
-        det = self.determinant()
-        if det == 0:
-            raise ValueError('Matrix is not invertible.')
-        cofactors = []
-        for i in range(self.num_rows()):
-            cofactor_row = []
-            for j in range(self.num_columns()):
-                minor = self.submatrix(i, j)
-                cofactor_row.append(((-1) ** (i+j)) * minor.determinant())
-            cofactors.append(cofactor_row)
-        cofactors = Matrix(cofactors).transpose()
-        return (1/det) * cofactors
\ No newline at end of file
+"""线性代数"""
+
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+from itertools import repeat
+import math
+from operator import add as _add, mul, sub as _sub
+import os
+import random
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # 没有NumPy时使用纯Python实现
+    np = None
+
+from mathematics.number import RationalNumber
+
+
+# 新建矩阵时使用的存储后端, 'numpy'或'python'
+_backend = 'numpy' if np is not None else 'python'
+
+
+def get_backend() -> str:
+    """当前的存储后端"""
+    return _backend
+
+
+def set_backend(name: str) -> None:
+    """
+    设置存储后端
+    'numpy'把矩阵数据存成连续的NumPy数组, 'python'使用嵌套列表
+    只影响之后新建的矩阵
+    """
+    global _backend
+    if name not in ('numpy', 'python'):
+        raise ValueError("Backend must be 'numpy' or 'python'")
+    if name == 'numpy' and np is None:
+        raise ValueError("NumPy is not available")
+    _backend = name
+
+
+def _as_array(data, ndim):
+    """
+    尽量不复制地把data转换成ndim维的NumPy数组
+    只接受浮点数和复数; 整数, 布尔值和RationalNumber等精确数据, 以及当前后端不是NumPy时返回None, 由纯Python实现处理
+    (int64会溢出回绕, 而Python整数是精确的)
+    """
+    if _backend != 'numpy':
+        return None
+    try:
+        array = np.asarray(data)
+    except (ValueError, TypeError):
+        return None
+    if array.ndim != ndim or array.dtype.kind not in 'fc':
+        return None
+    return array
+
+
+def _flat_list(data) -> list:
+    """把支持缓冲区协议的对象或序列展开成一维列表"""
+    try:
+        return memoryview(data).tolist()
+    except TypeError:
+        return list(data)
+
+
+def _nested_lists(data) -> list:
+    """复制成嵌套列表, NumPy数组的元素转换成Python数值"""
+    if np is not None and isinstance(data, np.ndarray):
+        return data.tolist()
+    return [list(row) for row in data]
+
+
+def _scalar(value):
+    """把NumPy标量转换成Python数值"""
+    return value.item() if np is not None and isinstance(value, np.generic) else value
+
+
+try:
+    from math import sumprod as _dot
+except ImportError:  # Python 3.12之前没有math.sumprod
+    def _dot(p, q):
+        """两个序列的点积"""
+        return sum(map(mul, p, q))
+
+
+# 纯Python矩阵乘法每次处理的列数, 这些列在内层循环中反复使用, 保持在缓存里
+MATMUL_BLOCK = 64
+# 乘法次数超过这个值时把行块分给多个进程计算
+PARALLEL_MATMUL_THRESHOLD = 256 ** 3
+
+_worker_columns = None
+
+
+def _matmul_block(rows, columns, block=MATMUL_BLOCK) -> list:
+    """
+    rows乘以转置后的右矩阵columns
+    按列分块, 每块列与所有行做完点积再换下一块
+    """
+    result = [[] for row in rows]
+    for start in range(0, len(columns), block):
+        tile = columns[start:start + block]
+        for row, result_row in zip(rows, result):
+            result_row.extend([_dot(row, column) for column in tile])
+    return result
+
+
+def _init_matmul_worker(columns) -> None:
+    """子进程初始化: 保存转置后的右矩阵, 每个进程只传一次"""
+    global _worker_columns
+    _worker_columns = columns
+
+
+def _matmul_task(rows) -> list:
+    """子进程中计算一个行块"""
+    return _matmul_block(rows, _worker_columns)
+
+
+def _matmul_rows(a, b, workers=None) -> list:
+    """
+    纯Python的矩阵乘法, a和b是嵌套列表
+    右矩阵只转置一次, 之后每个元素都是两个连续列表的点积
+    运算量足够大时按行块分给多个进程
+    """
+    columns = [list(column) for column in zip(*b)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(a) * len(b) * len(columns) >= PARALLEL_MATMUL_THRESHOLD:
+        size = -(-len(a) // (4 * workers))
+        with ProcessPoolExecutor(workers, initializer=_init_matmul_worker, initargs=(columns,)) as executor:
+            blocks = executor.map(_matmul_task, [a[i:i + size] for i in range(0, len(a), size)])
+            return [row for block in blocks for row in block]
+    return _matmul_block(a, columns)
+
+
+# 维数不小于这个值时, 浮点向量的运算通过不复制的NumPy视图完成
+NUMPY_THRESHOLD = 64
+
+
+def _vector_storage(values):
+    """
+    向量坐标的存储
+    有浮点数的实数坐标存进连续的array('d'), 全是整数或者有其他类型(比如RationalNumber)时用列表, 保持精确
+    """
+    values = values if isinstance(values, list) else list(values)
+    if any(isinstance(x, float) for x in values) and all(isinstance(x, (int, float)) for x in values):
+        return array('d', values)
+    return values
+
+
+def _float_views(*vectors):
+    """几个向量都是维数足够大的浮点向量时返回它们的NumPy视图(不复制数据), 否则返回None"""
+    if np is None or len(vectors[0]._data) < NUMPY_THRESHOLD:
+        return None
+    if not all(isinstance(vector._data, array) and len(vector._data) == len(vectors[0]._data) for vector in vectors):
+        return None
+    return [np.frombuffer(vector._data) for vector in vectors]
+
+
+class Vector:
+    """
+    向量
+    实数坐标存放在连续的array('d')中, 整数和其他精确类型(比如RationalNumber)的坐标存放在列表中
+    维数较大时, 浮点向量的运算通过不复制的NumPy视图完成
+    """
+
+    __slots__ = ('_data',)
+
+    def __init__(self, coordinates: list):
+        """
+        初始化坐标
+        coordinates可以是列表, Vector, NumPy数组或任何支持缓冲区协议的对象, array('d')直接使用而不复制
+        """
+        if isinstance(coordinates, Vector):
+            coordinates = coordinates._data[:]
+        if isinstance(coordinates, array) and coordinates.typecode == 'd':
+            self._data = coordinates
+        elif np is not None and isinstance(coordinates, np.ndarray) and coordinates.dtype.kind == 'f':
+            self._data = array('d', coordinates.astype(float, copy=False).tobytes())
+        elif np is not None and isinstance(coordinates, np.ndarray):
+            self._data = _vector_storage(coordinates.tolist())
+        else:
+            self._data = _vector_storage(_flat_list(coordinates))
+
+    @classmethod
+    def _wrap(cls, data) -> 'Vector':
+        """直接用array('d')或列表构造, 不做转换"""
+        vector = cls.__new__(cls)
+        vector._data = data
+        return vector
+
+    @property
+    def coordinates(self) -> list:
+        """坐标列表, 浮点向量返回的是副本"""
+        if isinstance(self._data, list):
+            return self._data
+        return self._data.tolist()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getitem__(self, index):
+        return self._data[index]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __str__(self) -> str:
+        """字符串表示"""
+        return f'Vector: {self.coordinates}'
+
+    def __repr__(self) -> str:
+        return f'Vector: {self.coordinates}'
+
+    def dimension(self) -> int:
+        """维数"""
+        return len(self._data)
+
+    def __eq__(self, other):
+        """判断相等"""
+        if type(self._data) is type(other._data):
+            return self._data == other._data
+        return list(self._data) == list(other._data)
+
+    def _elementwise(self, other, function):
+        """逐项运算, 结果是新的向量"""
+        a, b = self._data, other._data
+        if isinstance(a, array) and isinstance(b, array):
+            views = _float_views(self, other)
+            if views is not None:
+                result = array('d', a)
+                view = np.frombuffer(result)
+                if function is _add:
+                    view += views[1]
+                else:
+                    view -= views[1]
+                return Vector._wrap(result)
+            return Vector._wrap(array('d', list(map(function, a, b))))
+        return Vector(list(map(function, a, b)))
+
+    def __add__(self, other):
+        """相加"""
+        if isinstance(other, LazyExpression):
+            return NotImplemented
+        return self._elementwise(other, _add)
+
+    def __sub__(self, other):
+        """相减"""
+        if isinstance(other, LazyExpression):
+            return NotImplemented
+        return self._elementwise(other, _sub)
+
+    def __mul__(self, other: int | float):
+        """数乘"""
+        if isinstance(other, LazyExpression):
+            return NotImplemented
+        data = self._data
+        if isinstance(data, array) and isinstance(other, (int, float)):
+            if _float_views(self) is None:
+                return Vector._wrap(array('d', [x*other for x in data]))
+            result = array('d', data)
+            view = np.frombuffer(result)
+            view *= other
+            return Vector._wrap(result)
+        return Vector([x*other for x in data])
+
+    def __rmul__(self, other):
+        """右乘法"""
+        return self.__mul__(other)
+
+    def axpy(self, a, x: 'Vector') -> 'Vector':
+        """
+        原地计算 self += a * x 并返回self
+        浮点向量直接修改array('d'), 不产生新的向量
+        """
+        data, other = self._data, x._data
+        if isinstance(data, array) and isinstance(a, (int, float)) and len(data) == len(other):
+            views = _float_views(self, x)
+            if views is not None:
+                if a == 1:
+                    views[0] += views[1]
+                elif a == -1:
+                    views[0] -= views[1]
+                else:
+                    views[0] += a * views[1]
+            else:
+                for i in range(len(data)):
+                    data[i] += a * other[i]
+        else:
+            self._data = _vector_storage([p + a * q for p, q in zip(data, other)])
+        return self
+
+    def __iadd__(self, other):
+        """原地相加"""
+        return self.axpy(1, other)
+
+    def __isub__(self, other):
+        """原地相减"""
+        return self.axpy(-1, other)
+
+    def __imul__(self, other):
+        """原地数乘"""
+        data = self._data
+        if isinstance(data, array) and isinstance(other, (int, float)):
+            views = _float_views(self)
+            if views is not None:
+                views[0] *= other
+            else:
+                for i in range(len(data)):
+                    data[i] *= other
+        else:
+            self._data = _vector_storage([x*other for x in data])
+        return self
+
+    def norm(self):
+        """模, 不构造临时列表"""
+        views = _float_views(self)
+        if views is not None:
+            return math.sqrt(float(views[0] @ views[0]))
+        return math.sqrt(_dot(self._data, self._data))
+
+    def unit(self):
+        """单位向量"""
+        mag = self.norm()
+        if isinstance(self._data, array):
+            return self * (1 / mag)
+        return Vector([x/mag for x in self._data])
+
+    def dot(self, other):
+        """点积, 不构造临时列表"""
+        views = _float_views(self, other)
+        if views is not None:
+            return float(views[0] @ views[1])
+        return _dot(self._data, other._data)
+
+    def angle(self, other):
+        """
+        夹角
+        在0和pi之间
+        """
+        mag1 = self.norm()
+        mag2 = other.norm()
+        dot_product = self.dot(other)
+        return math.acos(dot_product / mag1 / mag2)
+
+    def cross(self, other):
+        """叉积"""
+        x1, y1, z1 = self._data
+        x2, y2, z2 = other._data
+        return Vector([y1*z2 - y2*z1, z1*x2 - z2*x1, x1*y2 - x2*y1])
+
+    def lazy(self) -> 'LazyExpression':
+        """转换成延迟计算的表达式, 作为n*1的列参与运算"""
+        return LazyExpression._leaf(self)
+
+
+# 用NumPy做k近邻查询时, 每批距离矩阵最多这么多个元素
+KNN_BLOCK = 1 << 22
+
+
+class VectorBatch:
+    """
+    一批维数相同的向量
+    N个d维向量按行连续存放在一个长度为N*d的array('d')中
+    有NumPy时整批运算在不复制的N*d视图上完成, 否则用纯Python逐行计算
+    逐个向量的结果(点积, 模, 夹角)以array('d')返回
+    """
+
+    __slots__ = ('_data', '_dimension')
+
+    def __init__(self, vectors, dimension: int = None):
+        """
+        vectors可以是Vector或序列组成的可迭代对象, 也可以是二维NumPy数组
+        给出dimension时vectors是按行展开的一维数据(array('d')直接使用而不复制)
+        """
+        if dimension is not None:
+            data = vectors if isinstance(vectors, array) and vectors.typecode == 'd' else array('d', _flat_list(vectors))
+        elif np is not None and isinstance(vectors, np.ndarray):
+            if vectors.ndim != 2:
+                raise ValueError('Array of vectors must be two-dimensional.')
+            dimension = vectors.shape[1]
+            data = array('d', np.ascontiguousarray(vectors, dtype=float).tobytes())
+        else:
+            data = array('d')
+            for vector in vectors:
+                coordinates = vector._data if isinstance(vector, Vector) else vector
+                if dimension is None:
+                    dimension = len(coordinates)
+                elif len(coordinates) != dimension:
+                    raise ValueError('All vectors must have the same dimension.')
+                data.extend(coordinates)
+            dimension = dimension or 0
+        if dimension and len(data) % dimension:
+            raise ValueError('Size of data is not a multiple of the dimension.')
+        self._data = data
+        self._dimension = dimension
+
+    @classmethod
+    def _wrap(cls, data, dimension) -> 'VectorBatch':
+        """直接用array('d')构造"""
+        batch = cls.__new__(cls)
+        batch._data, batch._dimension = data, dimension
+        return batch
+
+    @classmethod
+    def _from_array(cls, values) -> 'VectorBatch':
+        """由二维NumPy数组构造"""
+        return cls._wrap(array('d', np.ascontiguousarray(values, dtype=float).tobytes()), values.shape[1])
+
+    @property
+    def dimension(self) -> int:
+        """每个向量的维数"""
+        return self._dimension
+
+    def __len__(self) -> int:
+        """向量个数"""
+        return len(self._data) // self._dimension if self._dimension else 0
+
+    def __getitem__(self, index: int) -> Vector:
+        """第index个向量(副本)"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Index out of range.')
+        d = self._dimension
+        return Vector._wrap(self._data[index * d:(index + 1) * d])
+
+    def __iter__(self):
+        """逐个生成Vector"""
+        for i in range(len(self)):
+            yield self[i]
+
+    def __str__(self) -> str:
+        """字符串表示"""
+        return f'VectorBatch: {len(self)} vectors of dimension {self._dimension}'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def _view(self):
+        """N*d的NumPy视图, 不复制数据"""
+        return np.frombuffer(self._data).reshape(len(self), self._dimension)
+
+    def _rows(self):
+        """逐个生成每一行(array('d')切片)"""
+        d = self._dimension
+        data = self._data
+        return (data[i:i + d] for i in range(0, len(data) if d else 0, d or 1))
+
+    def _check(self, other) -> None:
+        """检查另一批向量(或单个向量)的形状"""
+        if isinstance(other, Vector):
+            if other.dimension() != self._dimension:
+                raise ValueError('Vectors must have the same dimension.')
+        elif other._dimension != self._dimension or len(other) != len(self):
+            raise ValueError('Batches must have the same shape.')
+
+    def _other_view(self, other):
+        """另一批向量的N*d视图, 或者单个向量的一维数组(按行广播)"""
+        if isinstance(other, Vector):
+            return np.asarray(other._data, dtype=float)
+        return other._view()
+
+    def _other_rows(self, other):
+        """另一批向量的各行, 单个向量时重复使用"""
+        if isinstance(other, Vector):
+            return repeat(other._data)
+        return other._rows()
+
+    def dot(self, other) -> array:
+        """逐行点积, other是同样形状的VectorBatch或者一个Vector"""
+        self._check(other)
+        if np is not None:
+            if isinstance(other, Vector):
+                return array('d', (self._view() @ self._other_view(other)).tobytes())
+            return array('d', np.einsum('ij,ij->i', self._view(), other._view()).tobytes())
+        return array('d', map(_dot, self._rows(), self._other_rows(other)))
+
+    def norm(self) -> array:
+        """每个向量的模"""
+        if np is not None:
+            view = self._view()
+            return array('d', np.sqrt(np.einsum('ij,ij->i', view, view)).tobytes())
+        return array('d', [math.sqrt(_dot(row, row)) for row in self._rows()])
+
+    def unit(self) -> 'VectorBatch':
+        """每个向量的单位向量"""
+        if np is not None:
+            view = self._view()
+            return VectorBatch._from_array(view / np.sqrt(np.einsum('ij,ij->i', view, view))[:, None])
+        data = array('d')
+        for row in self._rows():
+            mag = math.sqrt(_dot(row, row))
+            data.extend([x / mag for x in row])
+        return VectorBatch._wrap(data, self._dimension)
+
+    def angle(self, other) -> array:
+        """
+        逐行夹角, 在0和pi之间
+        other是同样形状的VectorBatch或者一个Vector
+        """
+        self._check(other)
+        if np is not None:
+            view = self._view()
+            other_view = self._other_view(other)
+            if isinstance(other, Vector):
+                dots = view @ other_view
+                other_norms = math.sqrt(float(other_view @ other_view))
+            else:
+                dots = np.einsum('ij,ij->i', view, other_view)
+                other_norms = np.sqrt(np.einsum('ij,ij->i', other_view, other_view))
+            cosines = dots / np.sqrt(np.einsum('ij,ij->i', view, view)) / other_norms
+            return array('d', np.arccos(np.clip(cosines, -1.0, 1.0)).tobytes())
+        result = array('d')
+        for row, other_row in zip(self._rows(), self._other_rows(other)):
+            cosine = _dot(row, other_row) / math.sqrt(_dot(row, row)) / math.sqrt(_dot(other_row, other_row))
+            result.append(math.acos(max(-1.0, min(1.0, cosine))))
+        return result
+
+    def cross(self, other) -> 'VectorBatch':
+        """逐行叉积, 只适用于三维向量, other是同样形状的VectorBatch或者一个Vector"""
+        if self._dimension != 3:
+            raise ValueError('Cross product is only defined for three-dimensional vectors.')
+        self._check(other)
+        if np is not None:
+            return VectorBatch._from_array(np.cross(self._view(), self._other_view(other)))
+        data = array('d')
+        for (x1, y1, z1), (x2, y2, z2) in zip(self._rows(), self._other_rows(other)):
+            data.extend((y1*z2 - y2*z1, z1*x2 - z2*x1, x1*y2 - x2*y1))
+        return VectorBatch._wrap(data, 3)
+
+    def _squared_distances(self, queries):
+        """queries中每个向量到self中每个向量的距离平方(NumPy), 返回M*N数组"""
+        view = self._view()
+        squared = (np.einsum('ij,ij->i', queries, queries)[:, None] + np.einsum('ij,ij->i', view, view)[None, :]
+                   - 2.0 * (queries @ view.T))
+        return np.maximum(squared, 0.0, out=squared)
+
+    def pairwise_distances(self, other: 'VectorBatch' = None) -> 'Matrix':
+        """
+        两两之间的欧氏距离, 返回N*M的Matrix, 第i行第j列是self[i]到other[j]的距离
+        other为None时计算self内部的距离
+        """
+        other = self if other is None else other
+        if other._dimension != self._dimension:
+            raise ValueError('Vectors must have the same dimension.')
+        if np is not None:
+            return Matrix._wrap(np.sqrt(other._squared_distances(self._view())))
+        columns = list(other._rows())
+        return Matrix([[math.dist(row, column) for column in columns] for row in self._rows()])
+
+    def knn(self, queries, k: int) -> tuple:
+        """
+        k近邻查询, 返回(下标, 距离)两个列表, 第i项是离queries[i]最近的k个向量的下标和距离, 从近到远
+        queries是VectorBatch或者一个Vector
+        NumPy实现把查询分批, 每批的距离矩阵不超过KNN_BLOCK个元素
+        """
+        if isinstance(queries, Vector):
+            queries = VectorBatch([queries])
+        if queries._dimension != self._dimension:
+            raise ValueError('Vectors must have the same dimension.')
+        n = len(self)
+        if not 0 < k <= n:
+            raise ValueError('k must be between 1 and the number of vectors.')
+        indices, distances = [], []
+        if np is not None:
+            query_view = queries._view()
+            block = max(1, KNN_BLOCK // max(n, 1))
+            for start in range(0, len(queries), block):
+                squared = self._squared_distances(query_view[start:start + block])
+                nearest = np.argpartition(squared, k - 1, axis=1)[:, :k] if k < n else np.tile(np.arange(n), (len(squared), 1))
+                nearest_squared = np.take_along_axis(squared, nearest, axis=1)
+                order = np.argsort(nearest_squared, axis=1, kind='stable')
+                indices.extend(np.take_along_axis(nearest, order, axis=1).tolist())
+                distances.extend(np.sqrt(np.take_along_axis(nearest_squared, order, axis=1)).tolist())
+            return indices, distances
+        rows = list(self._rows())
+        for query in queries._rows():
+            nearest = heapq.nsmallest(k, ((math.dist(query, row), i) for i, row in enumerate(rows)))
+            indices.append([i for distance, i in nearest])
+            distances.append([distance for distance, i in nearest])
+        return indices, distances
+
+
+class _RowView:
+    """NumPy矩阵一行的视图, 用法和列表一样, 赋值会写回数组"""
+
+    __slots__ = ('_row',)
+
+    def __init__(self, row):
+        self._row = row
+
+    def __len__(self) -> int:
+        return len(self._row)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._row[index].tolist()
+        return self._row[index].item()
+
+    def __setitem__(self, index, value):
+        self._row[index] = value
+
+    def __iter__(self):
+        return iter(self._row.tolist())
+
+    def __eq__(self, other) -> bool:
+        return self._row.tolist() == (other._row.tolist() if isinstance(other, _RowView) else other)
+
+    def __repr__(self) -> str:
+        return repr(self._row.tolist())
+
+
+class _RowsView:
+    """NumPy矩阵的按行视图, 用法和嵌套列表一样, M.matrix[i][j] = x 会写回数组"""
+
+    __slots__ = ('_array',)
+
+    def __init__(self, array):
+        self._array = array
+
+    def __len__(self) -> int:
+        return len(self._array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [_RowView(row) for row in self._array[index]]
+        return _RowView(self._array[index])
+
+    def __setitem__(self, index, row):
+        self._array[index] = row
+
+    def __iter__(self):
+        return (_RowView(row) for row in self._array)
+
+    def __eq__(self, other) -> bool:
+        return self._array.tolist() == (other._array.tolist() if isinstance(other, _RowsView) else other)
+
+    def __repr__(self) -> str:
+        return repr(self._array.tolist())
+
+
+class Matrix:
+    """
+    矩阵
+    有NumPy时数据存放在连续的二维NumPy数组中, 否则存放在嵌套列表中
+    元素不是普通数值(比如RationalNumber)时总是使用嵌套列表, 保持精确运算
+    """
+
+    def __init__(self, matrix: list, shape: tuple = None):
+        """
+        初始化数据
+        matrix可以是嵌套列表, NumPy数组或任何支持缓冲区协议的对象
+        shape不为None时把一维的matrix按(行数, 列数)排成矩阵, NumPy后端下不会复制数据
+        """
+        if isinstance(matrix, Matrix):
+            matrix = matrix._array if matrix._array is not None else matrix._rows
+        if shape is not None:
+            rows, columns = shape
+            array = _as_array(matrix, 1)
+            if array is not None:
+                self._array, self._rows, self._lu = array.reshape(rows, columns), None, None
+                return
+            flat = _flat_list(matrix)
+            if len(flat) != rows * columns:
+                raise ValueError('Size of data does not match the shape.')
+            matrix = [flat[i * columns:(i + 1) * columns] for i in range(rows)]
+        self._array = _as_array(matrix, 2)
+        self._rows = None if self._array is not None else _nested_lists(matrix)
+        self._lu = None
+
+    @classmethod
+    def _wrap(cls, data) -> 'Matrix':
+        """直接用NumPy数组或嵌套列表构造, 不做转换"""
+        matrix = cls.__new__(cls)
+        if np is not None and isinstance(data, np.ndarray):
+            if data.dtype.kind not in 'fc':
+                return cls(data)
+            matrix._array, matrix._rows = data, None
+        else:
+            matrix._array, matrix._rows = None, data
+        matrix._lu = None
+        return matrix
+
+    @property
+    def matrix(self) -> list:
+        """
+        按行访问的数据, 两种后端下都可以原地修改: M.matrix[i][j] = x 会写回矩阵
+        纯Python后端下就是内部的嵌套列表, NumPy后端下是写穿到数组的行视图
+        """
+        if self._array is not None:
+            return _RowsView(self._array)
+        return self._rows
+
+    @matrix.setter
+    def matrix(self, matrix: list):
+        """替换数据, 和构造时一样重新选择存储方式"""
+        self._array = _as_array(matrix, 2)
+        self._rows = None if self._array is not None else _nested_lists(matrix)
+        self._lu = None
+
+    def _lists(self) -> list:
+        """嵌套列表形式的数据, 只用来读取, NumPy后端下是副本"""
+        if self._array is not None:
+            return self._array.tolist()
+        return self._rows
+
+    @property
+    def backend(self) -> str:
+        """存储后端"""
+        return 'python' if self._array is None else 'numpy'
+
+    def _numpy_pair(self, other):
+        """两个矩阵都能用NumPy计算时返回两个数组, 否则返回None"""
+        if self._array is None:
+            return None
+        if other._array is not None:
+            return self._array, other._array
+        other_array = _as_array(other._rows, 2)
+        if other_array is None:
+            return None
+        return self._array, other_array
+
+    def __str__(self) -> str:
+        """字符串表示"""
+        return f'Matrix: {self._lists()}'
+
+    def __repr__(self) -> str:
+        return f'Matrix: {self._lists()}'
+
+    def __eq__(self, other):
+        """判断相等"""
+        pair = self._numpy_pair(other)
+        if pair is not None:
+            return pair[0].shape == pair[1].shape and bool(np.array_equal(*pair))
+        return self._lists() == other._lists()
+
+    def __add__(self, other):
+        """相加"""
+        if isinstance(other, LazyExpression):
+            return NotImplemented
+        pair = self._numpy_pair(other)
+        if pair is not None:
+            return Matrix._wrap(pair[0] + pair[1])
+        return Matrix([[x + y for x, y in zip(row1, row2)] for row1, row2 in zip(self._lists(), other._lists())])
+
+    def __sub__(self, other):
+        """相减"""
+        if isinstance(other, LazyExpression):
+            return NotImplemented
+        pair = self._numpy_pair(other)
+        if pair is not None:
+            return Matrix._wrap(pair[0] - pair[1])
+        return Matrix([[x - y for x, y in zip(row1, row2)] for row1, row2 in zip(self._lists(), other._lists())])
+
+    def __mul__(self, other):
+        """矩阵乘法"""
+        if isinstance(other, Matrix):
+            return self.matmul(other)
+        elif isinstance(other, (CSRMatrix, COOMatrix, LazyExpression)):
+            return NotImplemented
+        elif isinstance(other, Vector):
+            if self.num_columns() != other.dimension():
+                raise ValueError('Number of columns in matrix must be equal to dimension of vector.')
+            if self._array is not None:
+                vector = _as_array(other._data, 1)
+                if vector is not None:
+                    return Vector(self._array @ vector)
+            v = other._data
+            return Vector([_dot(row, v) for row in self._lists()])
+        else:
+            if self._array is not None and isinstance(other, (int, float)):
+                return Matrix._wrap(self._array * other)
+            return Matrix([[x*other for x in row] for row in self._lists()])
+
+    def __rmul__(self, other):
+        """右乘法"""
+        return self.__mul__(other)
+
+    def matmul(self, other: 'Matrix', workers: int = None) -> 'Matrix':
+        """
+        矩阵乘法
+        纯Python实现中workers是并行计算的进程数, 默认使用所有CPU, 只在矩阵足够大时启用
+        """
+        if self.num_columns() != other.num_rows():
+            raise ValueError('Number of columns in first matrix must be equal to number of rows in second matrix.')
+        pair = self._numpy_pair(other)
+        if pair is not None:
+            return Matrix._wrap(pair[0] @ pair[1])
+        return Matrix(_matmul_rows(self._lists(), other._lists(), workers))
+
+    def num_rows(self) -> int:
+        """行数"""
+        if self._array is not None:
+            return self._array.shape[0]
+        return len(self._rows)
+
+    def num_columns(self) -> int:
+        """列数"""
+        if self._array is not None:
+            return self._array.shape[1]
+        return len(self._rows[0])
+
+    def lazy(self) -> 'LazyExpression':
+        """转换成延迟计算的表达式, 之后的运算只记录下来, 调用evaluate()时才计算"""
+        return LazyExpression._leaf(self)
+
+    def transpose(self):
+        """转置"""
+        if self._array is not None:
+            return Matrix._wrap(self._array.T)
+        return Matrix([[self._rows[j][i] for j in range(self.num_rows())] for i in range(self.num_columns())])
+
+    def lu(self) -> 'LUDecomposition':
+        """
+        LU分解
+        结果缓存在矩阵上, 之后的determinant, inverse, rank和solve都复用它
+        缓存时保存数据的副本, 数据被原地修改过(包括通过matrix修改行或修改传入的NumPy数组)时重新分解
+        """
+        if self._array is not None:
+            if self._lu is not None and np.array_equal(self._lu[0], self._array):
+                return self._lu[1]
+            snapshot = self._array.copy()
+        else:
+            if self._lu is not None and self._lu[0] == self._rows:
+                return self._lu[1]
+            snapshot = [list(row) for row in self._rows]
+        decomposition = LUDecomposition(self)
+        self._lu = (snapshot, decomposition)
+        return decomposition
+
+    def determinant(self):
+        """行列式"""
+        if self.num_rows() != self.num_columns():
+            raise ValueError('Matrix must be square.')
+        return self.lu().determinant()
+
+    def rank(self) -> int:
+        """秩"""
+        return self.lu().rank()
+
+    def solve(self, b):
+        """
+        解线性方程组 self * x = b
+        b是Vector时返回Vector, 是Matrix时按列求解并返回Matrix
+        """
+        lu = self.lu()
+        if isinstance(b, Vector):
+            if b.dimension() != self.num_rows():
+                raise ValueError('Dimension of vector must be equal to number of rows in matrix.')
+            return Vector(lu.solve(b._data))
+        if b.num_rows() != self.num_rows():
+            raise ValueError('Number of rows in both matrices must be equal.')
+        if lu.factors_are_arrays():
+            return Matrix._wrap(lu.solve(b._array if b._array is not None else b._lists()))
+        columns = [lu.solve(column) for column in zip(*b._lists())]
+        return Matrix([list(row) for row in zip(*columns)])
+
+    def submatrix(self, i: int, j: int):
+        """去掉第i行和第j列得到的子矩阵"""
+        if self._array is not None:
+            return Matrix._wrap(np.delete(np.delete(self._array, i, axis=0), j, axis=1))
+        return Matrix([[self._rows[x][y] for y in range(self.num_columns()) if y != j] for x in range(self.num_rows()) if x != i])
+
+    def inverse(self):
+        """逆矩阵"""
+        n = self.num_rows()
+        if n != self.num_columns():
+            raise ValueError('Matrix must be square.')
+        lu = self.lu()
+        if lu.rank() < n:
+            raise ValueError('Matrix is not invertible.')
+        if lu.factors_are_arrays():
+            return Matrix._wrap(lu.solve(np.eye(n)))
+        columns = [lu.solve([int(i == j) for i in range(n)]) for j in range(n)]
+        return Matrix([list(row) for row in zip(*columns)])
+
+
+def _shape(operand) -> tuple:
+    """矩阵或向量(看作n*1的列)的形状"""
+    if isinstance(operand, Vector):
+        return (operand.dimension(), 1)
+    return (operand.num_rows(), operand.num_columns())
+
+
+def _chain_order(dimensions) -> list:
+    """
+    矩阵链乘法的动态规划
+    第i个因子的形状是dimensions[i] * dimensions[i+1], 返回split, split[i][j]是因子i到j最优的分割点
+    """
+    n = len(dimensions) - 1
+    cost = [[0] * n for i in range(n)]
+    split = [[0] * n for i in range(n)]
+    for length in range(1, n):
+        for i in range(n - length):
+            j = i + length
+            cost[i][j] = None
+            for k in range(i, j):
+                candidate = cost[i][k] + cost[k + 1][j] + dimensions[i] * dimensions[k + 1] * dimensions[j + 1]
+                if cost[i][j] is None or candidate < cost[i][j]:
+                    cost[i][j] = candidate
+                    split[i][j] = k
+    return split
+
+
+def _fused_sum(terms):
+    """
+    一次遍历计算 sum(c * X), X是形状相同的Matrix或Vector
+    不会为每一步加法或数乘构造中间结果
+    """
+    coefficients = [c for c, operand in terms]
+    operands = [operand for c, operand in terms]
+
+    def combine(rows):
+        # 逐行累加, 只保留一行长的中间结果
+        result = None
+        for c, row in zip(coefficients, rows):
+            scaled = row if c == 1 else map(mul, repeat(c, len(row)), row)
+            result = list(scaled) if result is None else list(map(_add, result, scaled))
+        return result
+
+    if isinstance(operands[0], Vector):
+        views = _float_views(*operands)
+        if views is not None and all(isinstance(c, (int, float)) for c in coefficients):
+            result = array('d', bytes(8 * len(operands[0])))
+            _accumulate(np.frombuffer(result), coefficients, views)
+            return Vector._wrap(result)
+        return Vector(combine([operand._data for operand in operands]))
+    if all(operand._array is not None for operand in operands) and all(isinstance(c, (int, float)) for c in coefficients):
+        arrays = [operand._array for operand in operands]
+        result = np.zeros(arrays[0].shape, dtype=np.result_type(*arrays, *coefficients))
+        return Matrix._wrap(_accumulate(result, coefficients, arrays))
+    return Matrix([combine(rows) for rows in zip(*(operand._lists() for operand in operands))])
+
+
+def _accumulate(result, coefficients, arrays):
+    """在result上原地累加 c * X, 数乘用一块复用的缓冲区"""
+    scratch = None
+    for c, x in zip(coefficients, arrays):
+        if c == 1:
+            result += x
+        elif c == -1:
+            result -= x
+        else:
+            if scratch is None:
+                scratch = np.empty_like(result)
+            np.multiply(x, c, out=scratch)
+            result += scratch
+    return result
+
+
+class LazyExpression:
+    """
+    延迟计算的矩阵表达式
+    用Matrix.lazy()或Vector.lazy()开始, 之后的加减, 数乘和乘法只记录成表达式图, evaluate()时才计算
+    连乘按矩阵链动态规划选择乘法顺序(A*B*C*v会按A*(B*(C*v))计算), 加减和数乘合并成一次逐元素遍历
+    """
+
+    __slots__ = ('_kind', '_operands', '_shape')
+
+    @classmethod
+    def _make(cls, kind, operands, shape) -> 'LazyExpression':
+        expression = cls.__new__(cls)
+        expression._kind, expression._operands, expression._shape = kind, operands, shape
+        return expression
+
+    @classmethod
+    def _leaf(cls, operand) -> 'LazyExpression':
+        """叶子节点, 包装一个Matrix或Vector"""
+        return cls._make('leaf', operand, _shape(operand))
+
+    @staticmethod
+    def _wrap(operand) -> 'LazyExpression':
+        """把Matrix或Vector包装成叶子节点"""
+        if isinstance(operand, LazyExpression):
+            return operand
+        if isinstance(operand, (Matrix, Vector)):
+            return LazyExpression._leaf(operand)
+        raise TypeError('Operand must be a Matrix, Vector or LazyExpression.')
+
+    @property
+    def shape(self) -> tuple:
+        """结果的形状, 向量看作n*1的列"""
+        return self._shape
+
+    def lazy(self) -> 'LazyExpression':
+        return self
+
+    def _terms(self) -> list:
+        """作为加法的各项 [(系数, 表达式)]"""
+        if self._kind == 'sum':
+            return self._operands
+        return [(1, self)]
+
+    def _factors(self) -> list:
+        """作为连乘的各因子"""
+        if self._kind == 'product':
+            return self._operands
+        return [self]
+
+    def _sum(self, other, sign) -> 'LazyExpression':
+        """记录加法或减法"""
+        other = LazyExpression._wrap(other)
+        if other._shape != self._shape:
+            raise ValueError('Operands must have the same shape.')
+        terms = self._terms() + [(sign * c, term) for c, term in other._terms()]
+        return LazyExpression._make('sum', terms, self._shape)
+
+    def _scale(self, c) -> 'LazyExpression':
+        """记录数乘, 系数直接乘到各项上"""
+        if not isinstance(c, (int, float, RationalNumber)) and not (np is not None and isinstance(c, np.number)):
+            raise TypeError('Scalar must be a number.')
+        return LazyExpression._make('sum', [(c * coefficient, term) for coefficient, term in self._terms()], self._shape)
+
+    @staticmethod
+    def _product(left, right) -> 'LazyExpression':
+        """记录乘法, 连乘展平成一个因子列表"""
+        if left._shape[1] != right._shape[0]:
+            raise ValueError('Number of columns in first matrix must be equal to number of rows in second matrix.')
+        return LazyExpression._make('product', left._factors() + right._factors(), (left._shape[0], right._shape[1]))
+
+    def __add__(self, other):
+        """相加"""
+        return self._sum(other, 1)
+
+    def __radd__(self, other):
+        return LazyExpression._wrap(other)._sum(self, 1)
+
+    def __sub__(self, other):
+        """相减"""
+        return self._sum(other, -1)
+
+    def __rsub__(self, other):
+        return LazyExpression._wrap(other)._sum(self, -1)
+
+    def __neg__(self):
+        return self._scale(-1)
+
+    def __mul__(self, other):
+        """乘以矩阵, 向量, 表达式或数"""
+        if isinstance(other, (Matrix, Vector, LazyExpression)):
+            return self._product(self, LazyExpression._wrap(other))
+        return self._scale(other)
+
+    def __rmul__(self, other):
+        """左乘矩阵或数"""
+        if isinstance(other, (Matrix, Vector)):
+            return self._product(LazyExpression._wrap(other), self)
+        return self._scale(other)
+
+    def evaluate(self):
+        """计算表达式, 结果是Matrix, 或者最后一个因子是向量时得到Vector"""
+        if self._kind == 'leaf':
+            return self._operands
+        if self._kind == 'sum':
+            terms = [(c, term.evaluate()) for c, term in self._operands]
+            if len(terms) == 1 and terms[0][0] == 1:
+                return terms[0][1]
+            return _fused_sum(terms)
+        factors = [factor.evaluate() for factor in self._operands]
+        if any(isinstance(factor, Vector) for factor in factors[:-1]):
+            raise ValueError('Only the last factor of a product can be a vector.')
+        dimensions = [_shape(factor)[0] for factor in factors] + [_shape(factors[-1])[1]]
+        split = _chain_order(dimensions)
+
+        def multiply(i, j):
+            if i == j:
+                return factors[i]
+            k = split[i][j]
+            return multiply(i, k) * multiply(k + 1, j)
+
+        return multiply(0, len(factors) - 1)
+
+    def cost(self) -> int:
+        """按最优顺序计算所有乘法需要的标量乘法次数"""
+        total = 0
+        if self._kind == 'sum':
+            total = sum(term.cost() for c, term in self._operands)
+        elif self._kind == 'product':
+            total = sum(factor.cost() for factor in self._operands)
+            dimensions = [factor._shape[0] for factor in self._operands] + [self._shape[1]]
+            split = _chain_order(dimensions)
+
+            def chain_cost(i, j):
+                if i == j:
+                    return 0
+                k = split[i][j]
+                return chain_cost(i, k) + chain_cost(k + 1, j) + dimensions[i] * dimensions[k + 1] * dimensions[j + 1]
+
+            total += chain_cost(0, len(self._operands) - 1)
+        return total
+
+    def __str__(self) -> str:
+        """字符串表示"""
+        if self._kind == 'leaf':
+            return f'{type(self._operands).__name__}[{self._shape[0]}x{self._shape[1]}]'
+        if self._kind == 'product':
+            return '(' + ' * '.join(map(str, self._operands)) + ')'
+        return '(' + ' + '.join(str(term) if c == 1 else f'{c}*{term}' for c, term in self._operands) + ')'
+
+    def __repr__(self) -> str:
+        return f'LazyExpression: {self}'
+
+
+def _is_exact(value) -> bool:
+    """是否是可以精确运算的数(整数或RationalNumber)"""
+    return isinstance(value, (int, RationalNumber))
+
+
+def _exact_div(a, b):
+    """
+    Bareiss消去中的整除
+    整数直接用//, RationalNumber本身就是精确的
+    """
+    if isinstance(a, int) and isinstance(b, int):
+        return a // b
+    return a / b
+
+
+def _rational_div(a, b):
+    """精确的除法, 两个整数相除得到RationalNumber"""
+    if isinstance(a, int) and isinstance(b, int):
+        return RationalNumber(a, b)
+    return a / b
+
+
+class LUDecomposition:
+    """
+    矩阵的LU分解 PA = LU
+    浮点数矩阵使用部分主元的高斯消去, 整数和RationalNumber矩阵使用无分数的Bareiss消去(PA = L D^-1 U)
+    消去时跳过没有主元的列, 所以对奇异矩阵和非方阵也能得到正确的秩
+    """
+
+    __slots__ = ('_factors', '_permutation', '_sign', '_pivots', '_exact', '_shape')
+
+    def __init__(self, matrix: Matrix):
+        """对matrix做分解"""
+        self._shape = (matrix.num_rows(), matrix.num_columns())
+        self._permutation = list(range(self._shape[0]))
+        self._sign = 1
+        self._pivots = []
+        if matrix._array is not None and matrix._array.dtype.kind in 'fc':
+            self._exact = False
+            self._factor_array(matrix._array)
+            return
+        rows = [list(row) for row in matrix._lists()]
+        self._exact = all(_is_exact(x) for row in rows for x in row)
+        if self._exact:
+            self._factor_bareiss(rows)
+        else:
+            self._factor_rows(rows)
+
+    def _swap(self, a, r, p):
+        """交换第r行和第p行"""
+        a[r], a[p] = a[p], a[r]
+        self._permutation[r], self._permutation[p] = self._permutation[p], self._permutation[r]
+        self._sign = -self._sign
+
+    def _factor_rows(self, a):
+        """嵌套列表上的部分主元消去, L的乘数存放在主元列的下方"""
+        m, n = self._shape
+        tolerance = max(m, n) * sys.float_info.epsilon * max((abs(x) for row in a for x in row), default=0)
+        r = 0
+        for c in range(n):
+            if r == m:
+                break
+            p = max(range(r, m), key=lambda i: abs(a[i][c]))
+            if abs(a[p][c]) <= tolerance:
+                continue
+            if p != r:
+                self._swap(a, r, p)
+            pivot_row = a[r]
+            pivot = pivot_row[c]
+            tail = pivot_row[c + 1:]
+            for i in range(r + 1, m):
+                row = a[i]
+                if row[c]:
+                    factor = row[c] / pivot
+                    row[c] = factor
+                    row[c + 1:] = [x - factor * y for x, y in zip(row[c + 1:], tail)]
+            self._pivots.append(c)
+            r += 1
+        self._factors = a
+
+    def _factor_array(self, array):
+        """NumPy数组上的部分主元消去, 每一步用一次秩1更新完成"""
+        m, n = self._shape
+        a = np.array(array, dtype=np.result_type(array, float))
+        tolerance = max(m, n) * np.finfo(float).eps * (np.abs(a).max() if a.size else 0)
+        r = 0
+        for c in range(n):
+            if r == m:
+                break
+            p = r + int(np.argmax(np.abs(a[r:, c])))
+            if abs(a[p, c]) <= tolerance:
+                continue
+            if p != r:
+                a[[r, p]] = a[[p, r]]
+                self._permutation[r], self._permutation[p] = self._permutation[p], self._permutation[r]
+                self._sign = -self._sign
+            a[r + 1:, c] /= a[r, c]
+            a[r + 1:, c + 1:] -= np.outer(a[r + 1:, c], a[r, c + 1:])
+            self._pivots.append(c)
+            r += 1
+        self._factors = a
+
+    def _factor_bareiss(self, a):
+        """
+        无分数的Bareiss消去
+        每一步的除法都是整除, 中间结果始终是原矩阵的子式, 不会出现分数和系数膨胀
+        消去后主元列下方保留消去时的元素, 它们就是L的列
+        """
+        m, n = self._shape
+        previous = 1
+        r = 0
+        for c in range(n):
+            if r == m:
+                break
+            p = next((i for i in range(r, m) if a[i][c] != 0), None)
+            if p is None:
+                continue
+            if p != r:
+                self._swap(a, r, p)
+            pivot_row = a[r]
+            pivot = pivot_row[c]
+            tail = pivot_row[c + 1:]
+            for i in range(r + 1, m):
+                row = a[i]
+                factor = row[c]
+                row[c + 1:] = [_exact_div(pivot * x - factor * y, previous) for x, y in zip(row[c + 1:], tail)]
+            self._pivots.append(c)
+            previous = pivot
+            r += 1
+        self._factors = a
+
+    def factors_are_arrays(self) -> bool:
+        """分解结果是否存放在NumPy数组中"""
+        return np is not None and isinstance(self._factors, np.ndarray)
+
+    @property
+    def permutation(self) -> list:
+        """行置换, 第i行来自原矩阵的第permutation[i]行"""
+        return self._permutation
+
+    def rank(self) -> int:
+        """秩"""
+        return len(self._pivots)
+
+    def determinant(self):
+        """行列式"""
+        m, n = self._shape
+        if m != n:
+            raise ValueError('Matrix must be square.')
+        if len(self._pivots) < n:
+            return 0
+        a = self._factors
+        if self._exact:
+            return self._sign * a[n - 1][n - 1] if n else 1
+        if self.factors_are_arrays():
+            return (self._sign * np.prod(np.diagonal(a))).item()
+        return self._sign * math.prod(a[i][i] for i in range(n))
+
+    def solve(self, b):
+        """
+        用分解结果解 A x = b
+        b是一维的列表或数组, NumPy分解时也可以是二维数组(按列求解)
+        """
+        m, n = self._shape
+        if m != n:
+            raise ValueError('Matrix must be square.')
+        if len(self._pivots) < n:
+            raise ValueError('Matrix is singular.')
+        if self.factors_are_arrays():
+            return self._solve_array(np.asarray(b))
+        b = list(b)
+        if self._exact:
+            return self._solve_bareiss(b)
+        return self._solve_rows(b)
+
+    def _solve_rows(self, b) -> list:
+        """前代和回代"""
+        a = self._factors
+        n = len(a)
+        y = []
+        for i in range(n):
+            y.append(b[self._permutation[i]] - sum(map(mul, a[i][:i], y)))
+        x = [0] * n
+        for i in range(n - 1, -1, -1):
+            row = a[i]
+            x[i] = (y[i] - sum(map(mul, row[i + 1:], x[i + 1:]))) / row[i]
+        return x
+
+    def _solve_array(self, b):
+        """NumPy上的前代和回代, 每一行是一次向量运算"""
+        a = self._factors
+        n = a.shape[0]
+        y = b[self._permutation].astype(np.result_type(a, b))
+        for i in range(1, n):
+            y[i] -= a[i, :i] @ y[:i]
+        for i in range(n - 1, -1, -1):
+            y[i] = (y[i] - a[i, i + 1:] @ y[i + 1:]) / a[i, i]
+        return y
+
+    def _solve_bareiss(self, b) -> list:
+        """
+        用PA = L D^-1 U求解
+        L的对角线和U的对角线都是主元p_k, D的对角线是p_(k-1) * p_k
+        """
+        a = self._factors
+        n = len(a)
+        w = []
+        for i in range(n):
+            row = a[i]
+            w.append(_rational_div(b[self._permutation[i]] - sum(map(mul, row[:i], w)), row[i]))
+        x = [0] * n
+        pivots = [a[i][i] for i in range(n)]
+        for i in range(n - 1, -1, -1):
+            row = a[i]
+            previous = pivots[i - 1] if i else 1
+            x[i] = _rational_div(previous * pivots[i] * w[i] - sum(map(mul, row[i + 1:], x[i + 1:])), pivots[i])
+        return x
+
+
+def _pack_values(values):
+    """
+    非零元的值尽量存进array('q')或array('d')
+    其他类型(比如RationalNumber或超出int64的整数)存进列表, 保持精确
+    """
+    values = list(values)
+    if all(type(value) is int for value in values):
+        try:
+            return array('q', values)
+        except OverflowError:
+            return values
+    if all(type(value) in (int, float) for value in values):
+        return array('d', values)
+    return values
+
+
+def _append_value(values, value):
+    """往_pack_values得到的存储里追加一个值, 类型放不下时重新打包"""
+    if isinstance(values, list):
+        values.append(value)
+        return values
+    if type(value) is float and values.typecode == 'q':
+        return _pack_values(values.tolist() + [value])
+    if type(value) in (int, float):
+        try:
+            values.append(value)
+            return values
+        except OverflowError:
+            pass
+    return values.tolist() + [value]
+
+
+def _numeric_array(values):
+    """array('q')或array('d')不复制地转换成NumPy数组, 其他情况返回None"""
+    if np is None or not isinstance(values, array):
+        return None
+    return np.asarray(values)
+
+
+class COOMatrix:
+    """
+    三元组(行, 列, 值)形式的稀疏矩阵
+    适合逐条添加元素或者从边的流中构造, 运算时转换成CSRMatrix
+    同一位置的多个元素在转换时相加
+    """
+
+    __slots__ = ('_shape', '_rows', '_columns', '_data')
+
+    def __init__(self, shape: tuple, rows=(), columns=(), data=()):
+        """按形状和三个等长的序列初始化"""
+        self._shape = tuple(shape)
+        self._rows = array('q', rows)
+        self._columns = array('q', columns)
+        self._data = _pack_values(data)
+        if not len(self._rows) == len(self._columns) == len(self._data):
+            raise ValueError('Rows, columns and data must have the same length.')
+        m, n = self._shape
+        if self._rows and not (0 <= min(self._rows) and max(self._rows) < m
+                               and 0 <= min(self._columns) and max(self._columns) < n):
+            raise IndexError('Index out of range.')
+
+    @classmethod
+    def from_triplets(cls, triplets, shape: tuple = None) -> 'COOMatrix':
+        """由(行, 列, 值)三元组构造, shape为None时由最大的下标决定"""
+        rows, columns, data = array('q'), array('q'), []
+        for i, j, value in triplets:
+            rows.append(i)
+            columns.append(j)
+            data.append(value)
+        if shape is None:
+            shape = (max(rows, default=-1) + 1, max(columns, default=-1) + 1)
+        return cls(shape, rows, columns, data)
+
+    @classmethod
+    def from_edges(cls, edges, shape: tuple = None, weight=1) -> 'COOMatrix':
+        """
+        由边的流构造邻接矩阵
+        每条边是(起点, 终点)或(起点, 终点, 权重), 没有权重时使用weight
+        边逐条读取, 不会在内存中保留整个输入
+        """
+        return cls.from_triplets(((edge[0], edge[1], edge[2] if len(edge) > 2 else weight) for edge in edges), shape)
+
+    @classmethod
+    def from_dense(cls, matrix) -> 'COOMatrix':
+        """由Matrix或嵌套列表构造, 只保留非零元"""
+        rows = matrix._lists() if isinstance(matrix, Matrix) else matrix
+        return cls.from_triplets(((i, j, value) for i, row in enumerate(rows) for j, value in enumerate(row) if value),
+                                 (len(rows), len(rows[0]) if rows else 0))
+
+    def append(self, i: int, j: int, value) -> None:
+        """添加一个元素"""
+        if not (0 <= i < self._shape[0] and 0 <= j < self._shape[1]):
+            raise IndexError('Index out of range.')
+        self._rows.append(i)
+        self._columns.append(j)
+        self._data = _append_value(self._data, value)
+
+    @property
+    def shape(self) -> tuple:
+        """(行数, 列数)"""
+        return self._shape
+
+    def nnz(self) -> int:
+        """存储的元素个数"""
+        return len(self._data)
+
+    def __iter__(self):
+        """逐个生成(行, 列, 值)"""
+        return zip(self._rows, self._columns, self._data)
+
+    def __str__(self) -> str:
+        """字符串表示"""
+        return f'COOMatrix: shape={self._shape}, nnz={self.nnz()}'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def transpose(self) -> 'COOMatrix':
+        """转置, 只需交换行和列"""
+        matrix = COOMatrix.__new__(COOMatrix)
+        matrix._shape = self._shape[::-1]
+        matrix._rows, matrix._columns, matrix._data = array('q', self._columns), array('q', self._rows), self._data[:]
+        return matrix
+
+    def to_csr(self) -> 'CSRMatrix':
+        """转换成CSRMatrix, 每行按列排序, 同一位置的元素相加"""
+        m, n = self._shape
+        values = _numeric_array(self._data)
+        if values is not None:
+            rows, columns = np.asarray(self._rows), np.asarray(self._columns)
+            keys = rows * n + columns
+            order = np.argsort(keys, kind='stable')
+            keys, rows, columns, values = keys[order], rows[order], columns[order], values[order]
+            if len(order):
+                starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+                rows, columns, values = rows[starts], columns[starts], np.add.reduceat(values, starts)
+            indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=m))))
+            return CSRMatrix._from_parts(self._shape, array('q', indptr.tobytes()),
+                                         array('q', columns.tobytes()), array(self._data.typecode, values.tobytes()))
+        buckets = [[] for i in range(m)]
+        for i, j, value in zip(self._rows, self._columns, self._data):
+            buckets[i].append((j, value))
+        indptr, indices, data = array('q', [0]), array('q'), []
+        for bucket in buckets:
+            bucket.sort(key=lambda item: item[0])
+            for j, value in bucket:
+                if indices and len(indices) > indptr[-1] and indices[-1] == j:
+                    data[-1] += value
+                else:
+                    indices.append(j)
+                    data.append(value)
+            indptr.append(len(indices))
+        return CSRMatrix._from_parts(self._shape, indptr, indices, _pack_values(data))
+
+    def to_dense(self) -> Matrix:
+        """转换成稠密的Matrix"""
+        return self.to_csr().to_dense()
+
+    def __mul__(self, other):
+        """乘法, 转换成CSRMatrix计算"""
+        return self.to_csr() * other
+
+    def __rmul__(self, other):
+        """右乘法"""
+        return self.to_csr().__rmul__(other)
+
+
+class CSRMatrix:
+    """
+    压缩行存储(CSR)的稀疏矩阵
+    第i行的非零元的列号是indices[indptr[i]:indptr[i+1]], 值是data中相同的区间
+    下标存放在array('q')中, 值存放在array('q'), array('d')或列表中, 占用的内存与非零元个数成正比
+    """
+
+    __slots__ = ('_shape', '_indptr', '_indices', '_data')
+
+    def __init__(self, shape: tuple, indptr, indices, data):
+        """由CSR的三个数组初始化"""
+        self._shape = tuple(shape)
+        self._indptr = array('q', indptr)
+        self._indices = array('q', indices)
+        self._data = _pack_values(data)
+        if len(self._indptr) != self._shape[0] + 1 or self._indptr[0] != 0 or self._indptr[-1] != len(self._indices):
+            raise ValueError('Invalid row pointer array.')
+        if len(self._indices) != len(self._data):
+            raise ValueError('Indices and data must have the same length.')
+        if self._indices and not (0 <= min(self._indices) and max(self._indices) < self._shape[1]):
+            raise IndexError('Index out of range.')
+
+    @classmethod
+    def _from_parts(cls, shape, indptr, indices, data) -> 'CSRMatrix':
+        """直接使用已经打包好的数组, 不做检查"""
+        matrix = cls.__new__(cls)
+        matrix._shape, matrix._indptr, matrix._indices, matrix._data = tuple(shape), indptr, indices, data
+        return matrix
+
+    @classmethod
+    def from_triplets(cls, triplets, shape: tuple = None) -> 'CSRMatrix':
+        """由(行, 列, 值)三元组构造, 同一位置的元素相加"""
+        return COOMatrix.from_triplets(triplets, shape).to_csr()
+
+    @classmethod
+    def from_edges(cls, edges, shape: tuple = None, weight=1) -> 'CSRMatrix':
+        """由边的流构造邻接矩阵, 见COOMatrix.from_edges"""
+        return COOMatrix.from_edges(edges, shape, weight).to_csr()
+
+    @classmethod
+    def from_dense(cls, matrix) -> 'CSRMatrix':
+        """由Matrix或嵌套列表构造, 只保留非零元"""
+        return COOMatrix.from_dense(matrix).to_csr()
+
+    @property
+    def shape(self) -> tuple:
+        """(行数, 列数)"""
+        return self._shape
+
+    def num_rows(self) -> int:
+        """行数"""
+        return self._shape[0]
+
+    def num_columns(self) -> int:
+        """列数"""
+        return self._shape[1]
+
+    def nnz(self) -> int:
+        """存储的元素个数"""
+        return len(self._data)
+
+    def __str__(self) -> str:
+        """字符串表示"""
+        return f'CSRMatrix: shape={self._shape}, nnz={self.nnz()}'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __eq__(self, other):
+        """判断相等(存储的结构和值都相同)"""
+        if not isinstance(other, CSRMatrix):
+            return NotImplemented
+        return (self._shape == other._shape and self._indptr == other._indptr and self._indices == other._indices
+                and list(self._data) == list(other._data))
+
+    def row(self, i: int):
+        """逐个生成第i行的(列, 值)"""
+        start, end = self._indptr[i], self._indptr[i + 1]
+        return zip(self._indices[start:end], self._data[start:end])
+
+    def to_coo(self) -> COOMatrix:
+        """转换成COOMatrix"""
+        rows = array('q')
+        for i in range(self._shape[0]):
+            rows.extend(repeat(i, self._indptr[i + 1] - self._indptr[i]))
+        matrix = COOMatrix.__new__(COOMatrix)
+        matrix._shape, matrix._rows, matrix._columns, matrix._data = self._shape, rows, self._indices[:], self._data[:]
+        return matrix
+
+    def to_dense(self) -> Matrix:
+        """转换成稠密的Matrix"""
+        m, n = self._shape
+        rows = [[0] * n for i in range(m)]
+        for i, row in enumerate(rows):
+            for j, value in self.row(i):
+                row[j] = value
+        return Matrix(rows)
+
+    def transpose(self) -> 'CSRMatrix':
+        """转置, 用计数排序按列重新分组, O(nnz)"""
+        m, n = self._shape
+        values = _numeric_array(self._data)
+        if values is not None:
+            indices = np.asarray(self._indices)
+            rows = np.repeat(np.arange(m, dtype=np.int64), np.diff(np.asarray(self._indptr)))
+            order = np.argsort(indices, kind='stable')
+            indptr = np.concatenate(([0], np.cumsum(np.bincount(indices, minlength=n))))
+            return CSRMatrix._from_parts((n, m), array('q', indptr.tobytes()), array('q', rows[order].tobytes()),
+                                         array(self._data.typecode, values[order].tobytes()))
+        counts = [0] * (n + 1)
+        for j in self._indices:
+            counts[j + 1] += 1
+        for j in range(n):
+            counts[j + 1] += counts[j]
+        indptr = array('q', counts)
+        positions = counts[:-1]
+        indices = array('q', bytes(8 * len(self._indices)))
+        data = [0] * len(self._data)
+        for i in range(m):
+            for k in range(self._indptr[i], self._indptr[i + 1]):
+                j = self._indices[k]
+                position = positions[j]
+                indices[position] = i
+                data[position] = self._data[k]
+                positions[j] = position + 1
+        return CSRMatrix._from_parts((n, m), indptr, indices, _pack_values(data))
+
+    def matvec(self, x) -> Vector:
+        """稀疏矩阵乘以向量, x可以是Vector或任何序列"""
+        coordinates = x._data if isinstance(x, Vector) else x
+        if len(coordinates) != self._shape[1]:
+            raise ValueError('Number of columns in matrix must be equal to dimension of vector.')
+        values = _numeric_array(self._data)
+        if values is not None:
+            vector = np.asarray(coordinates)
+            if vector.dtype.kind in 'biuf':
+                products = values * vector[np.asarray(self._indices)]
+                indptr = np.asarray(self._indptr)
+                result = np.zeros(self._shape[0], dtype=products.dtype)
+                nonempty = indptr[:-1] < indptr[1:]
+                if products.size:
+                    result[nonempty] = np.add.reduceat(products, indptr[:-1][nonempty])
+                return Vector(result)
+        indptr, indices, data = self._indptr, self._indices, self._data
+        get = coordinates.__getitem__
+        return Vector([sum(map(mul, data[indptr[i]:indptr[i + 1]], map(get, indices[indptr[i]:indptr[i + 1]])))
+                       for i in range(self._shape[0])])
+
+    def matmul(self, other: 'CSRMatrix') -> 'CSRMatrix':
+        """
+        稀疏矩阵乘法(Gustavson算法)
+        逐行把左矩阵的非零元乘以右矩阵对应的行, 累加到以列号为键的字典里
+        """
+        if self._shape[1] != other._shape[0]:
+            raise ValueError('Number of columns in first matrix must be equal to number of rows in second matrix.')
+        indptr, indices, data = array('q', [0]), array('q'), []
+        b_indptr, b_indices, b_data = other._indptr, other._indices, other._data
+        for i in range(self._shape[0]):
+            accumulator = {}
+            for k in range(self._indptr[i], self._indptr[i + 1]):
+                a = self._data[k]
+                column = self._indices[k]
+                for t in range(b_indptr[column], b_indptr[column + 1]):
+                    j = b_indices[t]
+                    accumulator[j] = accumulator.get(j, 0) + a * b_data[t]
+            for j in sorted(accumulator):
+                indices.append(j)
+                data.append(accumulator[j])
+            indptr.append(len(indices))
+        return CSRMatrix._from_parts((self._shape[0], other._shape[1]), indptr, indices, _pack_values(data))
+
+    def __mul__(self, other):
+        """乘以CSRMatrix, COOMatrix, Matrix, Vector或数"""
+        if isinstance(other, COOMatrix):
+            other = other.to_csr()
+        if isinstance(other, CSRMatrix):
+            return self.matmul(other)
+        if isinstance(other, Vector):
+            return self.matvec(other)
+        if isinstance(other, Matrix):
+            if self._shape[1] != other.num_rows():
+                raise ValueError('Number of columns in first matrix must be equal to number of rows in second matrix.')
+            dense = other._lists()
+            rows = []
+            for i in range(self._shape[0]):
+                row = [0] * other.num_columns()
+                for k, a in self.row(i):
+                    row = [x + a * y for x, y in zip(row, dense[k])]
+                rows.append(row)
+            return Matrix(rows)
+        return CSRMatrix._from_parts(self._shape, self._indptr, self._indices,
+                                     _pack_values([value * other for value in self._data]))
+
+    def __rmul__(self, other):
+        """数乘, 或者稠密矩阵乘以稀疏矩阵"""
+        if isinstance(other, Matrix):
+            return (self.transpose() * other.transpose()).transpose()
+        return self.__mul__(other)
+
+
+def _dense(A) -> Matrix:
+    """把稀疏矩阵和嵌套列表转换成Matrix"""
+    if isinstance(A, (CSRMatrix, COOMatrix)):
+        return A.to_dense()
+    return A if isinstance(A, Matrix) else Matrix(A)
+
+
+def solve(A, b):
+    """
+    用LU分解解线性方程组 A x = b
+    A可以是Matrix, 稀疏矩阵或嵌套列表, b可以是Vector, Matrix或序列
+    """
+    A = _dense(A)
+    return A.solve(b if isinstance(b, (Vector, Matrix)) else Vector(b))
+
+
+def _householder_rows(columns, m, n) -> list:
+    """
+    对列表形式的各列做Householder变换, 原地变成R的各列, 返回每一步的反射(v, beta)
+    H = I - beta * v v^T, 某一列已经全为0时对应的反射为None
+    """
+    reflectors = []
+    for k in range(n):
+        column = columns[k]
+        x = column[k:]
+        norm = math.sqrt(_dot(x, x))
+        if norm == 0:
+            reflectors.append(None)
+            continue
+        alpha = -math.copysign(norm, x[0])
+        v = x
+        v[0] -= alpha
+        beta = 2 / _dot(v, v)
+        column[k:] = [alpha] + [0.0] * (m - k - 1)
+        for j in range(k + 1, n):
+            tail = columns[j][k:]
+            s = beta * _dot(v, tail)
+            columns[j][k:] = [t - s * u for t, u in zip(tail, v)]
+        reflectors.append((v, beta))
+    return reflectors
+
+
+def _householder_array(a) -> list:
+    """NumPy数组上的Householder变换, 原地把a变成上三角的R, 返回每一步的反射(v, beta)"""
+    m, n = a.shape
+    reflectors = []
+    for k in range(n):
+        x = a[k:, k]
+        norm = np.linalg.norm(x)
+        if norm == 0:
+            reflectors.append(None)
+            continue
+        alpha = -math.copysign(norm, x[0])
+        v = x.copy()
+        v[0] -= alpha
+        beta = 2 / (v @ v)
+        a[k:, k:] -= np.outer(beta * v, v @ a[k:, k:])
+        a[k + 1:, k] = 0
+        reflectors.append((v, beta))
+    return reflectors
+
+
+def _apply_reflectors(reflectors, y):
+    """计算Q^T y, y是列表或NumPy数组, 原地修改"""
+    for k, reflector in enumerate(reflectors):
+        if reflector is None:
+            continue
+        v, beta = reflector
+        tail = y[k:]
+        s = beta * _dot(v, tail) if isinstance(tail, list) else beta * (v @ tail)
+        if isinstance(tail, list):
+            y[k:] = [t - s * u for t, u in zip(tail, v)]
+        else:
+            y[k:] -= s * v
+    return y
+
+
+def qr(A) -> tuple:
+    """
+    Householder QR分解, 返回(Q, R)
+    A是m*n矩阵(m >= n), Q是m*n的列正交矩阵, R是n*n的上三角矩阵
+    """
+    A = _dense(A)
+    m, n = A.num_rows(), A.num_columns()
+    if m < n:
+        raise ValueError('Matrix must have at least as many rows as columns.')
+    if A._array is not None:
+        a = np.array(A._array, dtype=np.result_type(A._array, float))
+        reflectors = _householder_array(a)
+        q = np.eye(m, n)
+        for k in range(n - 1, -1, -1):
+            if reflectors[k] is not None:
+                v, beta = reflectors[k]
+                q[k:, :] -= np.outer(beta * v, v @ q[k:, :])
+        return Matrix._wrap(q), Matrix._wrap(np.triu(a[:n]))
+    columns = [[float(x) for x in column] for column in zip(*A._lists())]
+    reflectors = _householder_rows(columns, m, n)
+    q_columns = []
+    for j in range(n):
+        y = [float(i == j) for i in range(m)]
+        for k in range(n - 1, -1, -1):
+            if reflectors[k] is not None:
+                v, beta = reflectors[k]
+                tail = y[k:]
+                s = beta * _dot(v, tail)
+                y[k:] = [t - s * u for t, u in zip(tail, v)]
+        q_columns.append(y)
+    return (Matrix([list(row) for row in zip(*q_columns)]),
+            Matrix([[columns[j][i] if j >= i else 0.0 for j in range(n)] for i in range(n)]))
+
+
+def lstsq(A, b) -> Vector:
+    """
+    最小二乘解, 使 |A x - b| 最小
+    用Householder QR分解, 不需要构造Q, 也不会像正规方程那样把条件数平方
+    A需要列满秩
+    """
+    A = _dense(A)
+    m, n = A.num_rows(), A.num_columns()
+    if m < n:
+        raise ValueError('Matrix must have at least as many rows as columns.')
+    b = b.coordinates if isinstance(b, Vector) else list(b)
+    if len(b) != m:
+        raise ValueError('Dimension of vector must be equal to number of rows in matrix.')
+    if A._array is not None:
+        a = np.array(A._array, dtype=np.result_type(A._array, float))
+        reflectors = _householder_array(a)
+        y = _apply_reflectors(reflectors, np.array(b, dtype=a.dtype))
+        diagonal = [a[i, i] for i in range(n)]
+        rows = a
+    else:
+        columns = [[float(x) for x in column] for column in zip(*A._lists())]
+        reflectors = _householder_rows(columns, m, n)
+        y = _apply_reflectors(reflectors, [float(x) for x in b])
+        diagonal = [columns[i][i] for i in range(n)]
+        rows = [list(row) for row in zip(*columns)]
+    tolerance = max(m, n) * sys.float_info.epsilon * max(map(abs, diagonal), default=0)
+    if any(abs(d) <= tolerance for d in diagonal):
+        raise ValueError('Matrix does not have full column rank.')
+    x = [0.0] * n
+    for i in range(n - 1, -1, -1):
+        x[i] = (y[i] - sum(rows[i][j] * x[j] for j in range(i + 1, n))) / diagonal[i]
+    return Vector([_scalar(value) for value in x])
+
+
+class IterativeResult:
+    """迭代法的结果和收敛信息"""
+
+    __slots__ = ('x', 'converged', 'iterations', 'residuals')
+
+    def __init__(self, x: Vector, converged: bool, iterations: int, residuals: list):
+        """x是解, residuals是每次迭代后残差的2-范数, 第一项是初始残差"""
+        self.x = x
+        self.converged = converged
+        self.iterations = iterations
+        self.residuals = residuals
+
+    def __str__(self) -> str:
+        """字符串表示"""
+        residual = self.residuals[-1] if self.residuals else None
+        return f'IterativeResult: converged={self.converged}, iterations={self.iterations}, residual={residual}'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+def _coordinates(vector):
+    """取出Vector, 列表或数组的坐标, 有NumPy时转换成float数组, 否则转换成float列表"""
+    if isinstance(vector, Vector):
+        vector = vector._data
+    if np is not None:
+        return np.asarray(vector, dtype=float)
+    return [float(x) for x in vector]
+
+
+def _linear_operator(A):
+    """
+    把线性算子统一成对坐标的函数
+    A可以是Matrix, 稀疏矩阵, 有matvec方法的对象或者函数
+    """
+    if isinstance(A, COOMatrix):
+        A = A.to_csr()
+    if isinstance(A, Matrix):
+        if A._array is not None:
+            return lambda x: _coordinates(A._array @ x)
+        return lambda x: _coordinates(A * Vector(x))
+    if hasattr(A, 'matvec'):
+        return lambda x: _coordinates(A.matvec(x))
+    if callable(A):
+        return lambda x: _coordinates(A(x))
+    raise TypeError('Operator must be a matrix, have a matvec method or be callable.')
+
+
+def _inner(x, y) -> float:
+    """内积"""
+    return float(x @ y) if np is not None else _dot(x, y)
+
+
+def _scale(a, x):
+    """a*x"""
+    if np is not None:
+        return a * x
+    return [a * u for u in x]
+
+
+def _combine(a, x, b, y):
+    """a*x + b*y"""
+    if np is not None:
+        return a * x + b * y
+    return [a * u + b * v for u, v in zip(x, y)]
+
+
+def jacobi_preconditioner(A):
+    """对角(Jacobi)预条件子, 返回计算 D^-1 x 的函数"""
+    if isinstance(A, COOMatrix):
+        A = A.to_csr()
+    if isinstance(A, CSRMatrix):
+        diagonal = [0.0] * min(A.shape)
+        for i in range(len(diagonal)):
+            for j, value in A.row(i):
+                if j == i:
+                    diagonal[i] += value
+    else:
+        rows = A._lists()
+        diagonal = [rows[i][i] for i in range(min(len(rows), len(rows[0])))]
+    if any(d == 0 for d in diagonal):
+        raise ValueError('Diagonal has zero entries.')
+    inverse = _coordinates([1 / d for d in diagonal])
+    if np is not None:
+        return lambda x: inverse * _coordinates(x)
+    return lambda x: [u * v for u, v in zip(inverse, _coordinates(x))]
+
+
+def conjugate_gradient(A, b, x0=None, tol=1e-10, max_iterations=None, preconditioner=None) -> IterativeResult:
+    """
+    (预条件)共轭梯度法解 A x = b, A需要对称正定
+    A和preconditioner可以是Matrix, 稀疏矩阵, 有matvec方法的对象或者函数, preconditioner计算M^-1 x
+    相对残差 |b - A x| / |b| 不超过tol时停止
+    """
+    operator = _linear_operator(A)
+    precondition = _linear_operator(preconditioner) if preconditioner is not None else None
+    b = _coordinates(b)
+    n = len(b)
+    max_iterations = 10 * n if max_iterations is None else max_iterations
+    x = _coordinates(x0) if x0 is not None else _coordinates([0.0] * n)
+    r = _combine(1, b, -1, operator(x))
+    z = precondition(r) if precondition else r
+    p = z
+    rz = _inner(r, z)
+    threshold = tol * (math.sqrt(_inner(b, b)) or 1)
+    residuals = [math.sqrt(_inner(r, r))]
+    iterations = 0
+    while residuals[-1] > threshold and iterations < max_iterations:
+        ap = operator(p)
+        curvature = _inner(p, ap)
+        if curvature <= 0:
+            break
+        alpha = rz / curvature
+        x = _combine(1, x, alpha, p)
+        r = _combine(1, r, -alpha, ap)
+        iterations += 1
+        residuals.append(math.sqrt(_inner(r, r)))
+        z = precondition(r) if precondition else r
+        rz, previous = _inner(r, z), rz
+        p = _combine(1, z, rz / previous, p)
+    return IterativeResult(Vector(x), residuals[-1] <= threshold, iterations, residuals)
+
+
+def gmres(A, b, x0=None, tol=1e-10, restart=30, max_iterations=None, preconditioner=None) -> IterativeResult:
+    """
+    重启的GMRES(restart)解 A x = b, A可以是任意非奇异矩阵
+    使用右预条件 A M^-1 u = b, x = M^-1 u, 所以记录的是真实残差 |b - A x|
+    Arnoldi过程用修正的Gram-Schmidt正交化, 用Givens旋转逐步求解最小二乘问题
+    """
+    operator = _linear_operator(A)
+    precondition = _linear_operator(preconditioner) if preconditioner is not None else None
+    b = _coordinates(b)
+    n = len(b)
+    max_iterations = 10 * n if max_iterations is None else max_iterations
+    x = _coordinates(x0) if x0 is not None else _coordinates([0.0] * n)
+    threshold = tol * (math.sqrt(_inner(b, b)) or 1)
+    r = _combine(1, b, -1, operator(x))
+    residuals = [math.sqrt(_inner(r, r))]
+    iterations = 0
+    while residuals[-1] > threshold and iterations < max_iterations:
+        beta = residuals[-1]
+        basis = [_scale(1 / beta, r)]
+        hessenberg = []
+        cosines, sines = [], []
+        g = [beta]
+        for j in range(restart):
+            w = operator(precondition(basis[j]) if precondition else basis[j])
+            column = []
+            for v in basis:
+                h = _inner(w, v)
+                w = _combine(1, w, -h, v)
+                column.append(h)
+            norm = math.sqrt(_inner(w, w))
+            column.append(norm)
+            for i in range(j):
+                column[i], column[i + 1] = (cosines[i] * column[i] + sines[i] * column[i + 1],
+                                            -sines[i] * column[i] + cosines[i] * column[i + 1])
+            radius = math.hypot(column[j], column[j + 1])
+            cosines.append(column[j] / radius)
+            sines.append(column[j + 1] / radius)
+            column[j], column[j + 1] = radius, 0.0
+            g.append(-sines[j] * g[j])
+            g[j] *= cosines[j]
+            hessenberg.append(column)
+            iterations += 1
+            residuals.append(abs(g[j + 1]))
+            if residuals[-1] <= threshold or iterations >= max_iterations or norm == 0:
+                break
+            basis.append(_scale(1 / norm, w))
+        k = len(hessenberg)
+        y = [0.0] * k
+        for i in range(k - 1, -1, -1):
+            y[i] = (g[i] - sum(hessenberg[j][i] * y[j] for j in range(i + 1, k))) / hessenberg[i][i]
+        update = _scale(y[0], basis[0])
+        for coefficient, v in zip(y[1:], basis[1:]):
+            update = _combine(1, update, coefficient, v)
+        x = _combine(1, x, 1, precondition(update) if precondition else update)
+        r = _combine(1, b, -1, operator(x))
+        residuals[-1] = math.sqrt(_inner(r, r))
+    return IterativeResult(Vector(x), residuals[-1] <= threshold, iterations, residuals)
+
+
+def _float_columns(A) -> list:
+    """Matrix的各列, 元素转换成float"""
+    return [[float(x) for x in column] for column in zip(*A._lists())]
+
+
+def _rotate(columns, i, j, c, s) -> None:
+    """对第i列和第j列做平面旋转: (x_i, x_j) <- (c x_i + s x_j, -s x_i + c x_j)"""
+    x, y = columns[i], columns[j]
+    columns[i] = [c * u + s * v for u, v in zip(x, y)]
+    columns[j] = [c * v - s * u for u, v in zip(x, y)]
+
+
+def _tred2(rows) -> tuple:
+    """
+    用Householder变换把实对称矩阵化成三对角矩阵
+    rows会被覆盖成累积的正交变换, 返回(对角线d, 次对角线e), e[i]是第i行和第i+1行之间的元素
+    """
+    n = len(rows)
+    V = rows
+    d = V[n - 1][:]
+    e = [0.0] * n
+    for i in range(n - 1, 0, -1):
+        scale = sum(abs(d[k]) for k in range(i))
+        h = 0.0
+        if scale == 0.0:
+            e[i] = d[i - 1]
+            for j in range(i):
+                d[j] = V[i - 1][j]
+                V[i][j] = 0.0
+                V[j][i] = 0.0
+        else:
+            for k in range(i):
+                d[k] /= scale
+                h += d[k] * d[k]
+            f = d[i - 1]
+            g = math.sqrt(h)
+            if f > 0:
+                g = -g
+            e[i] = scale * g
+            h -= f * g
+            d[i - 1] = f - g
+            for j in range(i):
+                e[j] = 0.0
+            for j in range(i):
+                f = d[j]
+                V[j][i] = f
+                g = e[j] + V[j][j] * f
+                for k in range(j + 1, i):
+                    g += V[k][j] * d[k]
+                    e[k] += V[k][j] * f
+                e[j] = g
+            f = 0.0
+            for j in range(i):
+                e[j] /= h
+                f += e[j] * d[j]
+            hh = f / (h + h)
+            for j in range(i):
+                e[j] -= hh * d[j]
+            for j in range(i):
+                f, g = d[j], e[j]
+                for k in range(j, i):
+                    V[k][j] -= f * e[k] + g * d[k]
+                d[j] = V[i - 1][j]
+                V[i][j] = 0.0
+        d[i] = h
+    for i in range(n - 1):
+        V[n - 1][i] = V[i][i]
+        V[i][i] = 1.0
+        h = d[i + 1]
+        if h != 0.0:
+            for k in range(i + 1):
+                d[k] = V[k][i + 1] / h
+            for j in range(i + 1):
+                g = sum(V[k][i + 1] * V[k][j] for k in range(i + 1))
+                for k in range(i + 1):
+                    V[k][j] -= g * d[k]
+        for k in range(i + 1):
+            V[k][i + 1] = 0.0
+    for j in range(n):
+        d[j] = V[n - 1][j]
+        V[n - 1][j] = 0.0
+    V[n - 1][n - 1] = 1.0
+    return d, e[1:] + [0.0]
+
+
+def _tql2(d, e, columns) -> None:
+    """
+    隐式QL方法求对称三对角矩阵的特征值和特征向量
+    d是对角线, e是次对角线(e[n-1] = 0), columns的各列被依次右乘上每一步的旋转
+    结束后d是特征值, columns是特征向量, 都按特征值从小到大排列
+    """
+    n = len(d)
+    f = 0.0
+    norm = 0.0
+    epsilon = sys.float_info.epsilon
+    for l in range(n):
+        norm = max(norm, abs(d[l]) + abs(e[l]))
+        m = l
+        while m < n - 1 and abs(e[m]) > epsilon * norm:
+            m += 1
+        if m > l:
+            iterations = 0
+            while True:
+                iterations += 1
+                if iterations > 30 * n:
+                    raise ValueError('Eigenvalue iteration did not converge.')
+                g = d[l]
+                p = (d[l + 1] - g) / (2.0 * e[l])
+                r = math.copysign(math.hypot(p, 1.0), p)
+                d[l] = e[l] / (p + r)
+                d[l + 1] = e[l] * (p + r)
+                dl1 = d[l + 1]
+                h = g - d[l]
+                for i in range(l + 2, n):
+                    d[i] -= h
+                f += h
+                p = d[m]
+                c = c2 = c3 = 1.0
+                el1 = e[l + 1]
+                s = s2 = 0.0
+                for i in range(m - 1, l - 1, -1):
+                    c3, c2, s2 = c2, c, s
+                    g = c * e[i]
+                    h = c * p
+                    r = math.hypot(p, e[i])
+                    e[i + 1] = s * r
+                    s = e[i] / r
+                    c = p / r
+                    p = c * d[i] - s * g
+                    d[i + 1] = h + s * (c * g + s * d[i])
+                    _rotate(columns, i, i + 1, c, -s)
+                p = -s * s2 * c3 * el1 * e[l] / dl1
+                e[l] = s * p
+                d[l] = c * p
+                if abs(e[l]) <= epsilon * norm:
+                    break
+        d[l] += f
+        e[l] = 0.0
+    order = sorted(range(n), key=d.__getitem__)
+    d[:] = [d[i] for i in order]
+    columns[:] = [columns[i] for i in order]
+
+
+def eigh(A) -> tuple:
+    """
+    实对称矩阵的特征分解, 返回(特征值列表, 以特征向量为列的Matrix), 特征值从小到大
+    先用Householder变换化成三对角矩阵, 再用隐式QL方法迭代, O(n^3)
+    """
+    A = _dense(A)
+    n = A.num_rows()
+    if n != A.num_columns():
+        raise ValueError('Matrix must be square.')
+    if A._array is not None:
+        values, vectors = np.linalg.eigh(A._array)
+        return values.tolist(), Matrix._wrap(vectors)
+    rows = [[float(x) for x in row] for row in A._lists()]
+    d, e = _tred2(rows)
+    columns = [list(column) for column in zip(*rows)]
+    _tql2(d, e, columns)
+    return d, Matrix([list(row) for row in zip(*columns)])
+
+
+def _hessenberg(H) -> None:
+    """用Householder变换把H原地化成上Hessenberg矩阵(相似变换)"""
+    n = len(H)
+    for m in range(1, n - 1):
+        scale = sum(abs(H[i][m - 1]) for i in range(m, n))
+        if scale == 0.0:
+            continue
+        u = [H[i][m - 1] / scale for i in range(m, n)]
+        h = _dot(u, u)
+        g = -math.copysign(math.sqrt(h), u[0])
+        h -= u[0] * g
+        u[0] -= g
+        for j in range(m - 1, n):
+            f = sum(u[i - m] * H[i][j] for i in range(m, n)) / h
+            for i in range(m, n):
+                H[i][j] -= f * u[i - m]
+        for row in H:
+            tail = row[m:]
+            f = _dot(u, tail) / h
+            row[m:] = [x - f * y for x, y in zip(tail, u)]
+
+
+def _hqr(a) -> list:
+    """
+    带Francis双步位移的QR方法求上Hessenberg矩阵的全部特征值
+    实特征值是float, 共轭复特征值成对给出complex
+    """
+    n = len(a)
+    values = [0.0] * n
+    norm = sum(abs(a[i][j]) for i in range(n) for j in range(max(i - 1, 0), n))
+    nn = n - 1
+    t = 0.0
+    while nn >= 0:
+        iterations = 0
+        while True:
+            l = nn
+            while l >= 1:
+                s = abs(a[l - 1][l - 1]) + abs(a[l][l])
+                if s == 0.0:
+                    s = norm
+                if abs(a[l][l - 1]) + s == s:
+                    a[l][l - 1] = 0.0
+                    break
+                l -= 1
+            x = a[nn][nn]
+            if l == nn:
+                values[nn] = x + t
+                nn -= 1
+            else:
+                y = a[nn - 1][nn - 1]
+                w = a[nn][nn - 1] * a[nn - 1][nn]
+                if l == nn - 1:
+                    p = 0.5 * (y - x)
+                    q = p * p + w
+                    z = math.sqrt(abs(q))
+                    x += t
+                    if q >= 0.0:
+                        z = p + math.copysign(z, p)
+                        values[nn - 1] = values[nn] = x + z
+                        if z:
+                            values[nn] = x - w / z
+                    else:
+                        values[nn - 1] = complex(x + p, -z)
+                        values[nn] = complex(x + p, z)
+                    nn -= 2
+                else:
+                    if iterations == 30:
+                        raise ValueError('Eigenvalue iteration did not converge.')
+                    if iterations in (10, 20):
+                        # 特殊位移, 打破可能的循环
+                        t += x
+                        for i in range(nn + 1):
+                            a[i][i] -= x
+                        s = abs(a[nn][nn - 1]) + abs(a[nn - 1][nn - 2])
+                        x = y = 0.75 * s
+                        w = -0.4375 * s * s
+                    iterations += 1
+                    m = nn - 2
+                    while m >= l:
+                        z = a[m][m]
+                        r = x - z
+                        s = y - z
+                        p = (r * s - w) / a[m + 1][m] + a[m][m + 1]
+                        q = a[m + 1][m + 1] - z - r - s
+                        r = a[m + 2][m + 1]
+                        s = abs(p) + abs(q) + abs(r)
+                        p /= s
+                        q /= s
+                        r /= s
+                        if m == l:
+                            break
+                        u = abs(a[m][m - 1]) * (abs(q) + abs(r))
+                        v = abs(p) * (abs(a[m - 1][m - 1]) + abs(z) + abs(a[m + 1][m + 1]))
+                        if u + v == v:
+                            break
+                        m -= 1
+                    for i in range(m + 2, nn + 1):
+                        a[i][i - 2] = 0.0
+                        if i != m + 2:
+                            a[i][i - 3] = 0.0
+                    for k in range(m, nn):
+                        if k != m:
+                            p = a[k][k - 1]
+                            q = a[k + 1][k - 1]
+                            r = a[k + 2][k - 1] if k != nn - 1 else 0.0
+                            x = abs(p) + abs(q) + abs(r)
+                            if x != 0.0:
+                                p /= x
+                                q /= x
+                                r /= x
+                        s = math.copysign(math.sqrt(p * p + q * q + r * r), p)
+                        if s == 0.0:
+                            continue
+                        if k == m:
+                            if l != m:
+                                a[k][k - 1] = -a[k][k - 1]
+                        else:
+                            a[k][k - 1] = -s * x
+                        p += s
+                        x = p / s
+                        y = q / s
+                        z = r / s
+                        q /= p
+                        r /= p
+                        for j in range(k, nn + 1):
+                            p = a[k][j] + q * a[k + 1][j]
+                            if k != nn - 1:
+                                p += r * a[k + 2][j]
+                                a[k + 2][j] -= p * z
+                            a[k + 1][j] -= p * y
+                            a[k][j] -= p * x
+                        for i in range(l, min(nn, k + 3) + 1):
+                            p = x * a[i][k] + y * a[i][k + 1]
+                            if k != nn - 1:
+                                p += z * a[i][k + 2]
+                                a[i][k + 2] -= p * r
+                            a[i][k + 1] -= p * q
+                            a[i][k] -= p
+            if nn < 0 or l >= nn - 1:
+                break
+    return values
+
+
+def _eigenvalue_key(value) -> tuple:
+    """特征值按实部, 再按虚部排序"""
+    return (value.real, value.imag)
+
+
+def eigvals(A) -> list:
+    """
+    一般实方阵的全部特征值, 按实部从小到大排列
+    先化成上Hessenberg矩阵, 再用带位移的QR方法迭代
+    """
+    A = _dense(A)
+    n = A.num_rows()
+    if n != A.num_columns():
+        raise ValueError('Matrix must be square.')
+    if A._array is not None:
+        values = [value.real if value.imag == 0 else value for value in np.linalg.eigvals(A._array).tolist()]
+        return sorted((complex(value) if isinstance(value, complex) else value for value in values),
+                      key=_eigenvalue_key)
+    rows = [[float(x) for x in row] for row in A._lists()]
+    _hessenberg(rows)
+    return sorted(_hqr(rows), key=_eigenvalue_key)
+
+
+def _golub_kahan(columns, m, n) -> tuple:
+    """
+    m >= n时的奇异值分解, columns是A的各列
+    先用Householder变换化成上双对角矩阵(Golub-Kahan), 再用隐式位移QR迭代
+    返回(U的各列, 奇异值, V的各列), 奇异值从大到小
+    """
+    A = columns
+    s = [0.0] * n
+    e = [0.0] * n
+    U = [[0.0] * m for j in range(n)]
+    V = [[0.0] * n for j in range(n)]
+    work = [0.0] * m
+    nct = min(m - 1, n)
+    nrt = max(0, min(n - 2, m))
+    for k in range(max(nct, nrt)):
+        if k < nct:
+            column = A[k]
+            s[k] = math.sqrt(_dot(column[k:], column[k:]))
+            if s[k] != 0.0:
+                if column[k] < 0.0:
+                    s[k] = -s[k]
+                column[k:] = [x / s[k] for x in column[k:]]
+                column[k] += 1.0
+            s[k] = -s[k]
+        for j in range(k + 1, n):
+            if k < nct and s[k] != 0.0:
+                t = -_dot(A[k][k:], A[j][k:]) / A[k][k]
+                A[j][k:] = [x + t * y for x, y in zip(A[j][k:], A[k][k:])]
+            e[j] = A[j][k]
+        if k < nct:
+            U[k][k:] = A[k][k:]
+        if k < nrt:
+            e[k] = math.sqrt(_dot(e[k + 1:], e[k + 1:]))
+            if e[k] != 0.0:
+                if e[k + 1] < 0.0:
+                    e[k] = -e[k]
+                e[k + 1:] = [x / e[k] for x in e[k + 1:]]
+                e[k + 1] += 1.0
+            e[k] = -e[k]
+            if k + 1 < m and e[k] != 0.0:
+                work[k + 1:] = [0.0] * (m - k - 1)
+                for j in range(k + 1, n):
+                    work[k + 1:] = [w + e[j] * x for w, x in zip(work[k + 1:], A[j][k + 1:])]
+                for j in range(k + 1, n):
+                    t = -e[j] / e[k + 1]
+                    A[j][k + 1:] = [x + t * w for x, w in zip(A[j][k + 1:], work[k + 1:])]
+            V[k][k + 1:] = e[k + 1:]
+
+    p = n
+    if nct < n:
+        s[nct] = A[nct][nct]
+    if m < p:
+        s[p - 1] = 0.0
+    if nrt + 1 < p:
+        e[nrt] = A[p - 1][nrt]
+    e[p - 1] = 0.0
+
+    for j in range(nct, n):
+        U[j] = [0.0] * m
+        U[j][j] = 1.0
+    for k in range(nct - 1, -1, -1):
+        if s[k] != 0.0:
+            for j in range(k + 1, n):
+                t = -_dot(U[k][k:], U[j][k:]) / U[k][k]
+                U[j][k:] = [x + t * y for x, y in zip(U[j][k:], U[k][k:])]
+            U[k][k:] = [-x for x in U[k][k:]]
+            U[k][k] += 1.0
+            U[k][:k] = [0.0] * k
+        else:
+            U[k] = [0.0] * m
+            U[k][k] = 1.0
+    for k in range(n - 1, -1, -1):
+        if k < nrt and e[k] != 0.0:
+            for j in range(k + 1, n):
+                t = -_dot(V[k][k + 1:], V[j][k + 1:]) / V[k][k + 1]
+                V[j][k + 1:] = [x + t * y for x, y in zip(V[j][k + 1:], V[k][k + 1:])]
+        V[k] = [0.0] * n
+        V[k][k] = 1.0
+    return _golub_kahan_iterate(U, s, e, V, m, n)
+
+
+def _golub_kahan_iterate(U, s, e, V, m, n) -> tuple:
+    """对上双对角矩阵(对角线s, 上次对角线e)做隐式位移QR迭代, 旋转同时作用在U和V的列上"""
+    p = n
+    pp = p - 1
+    iterations = 0
+    epsilon = sys.float_info.epsilon
+    tiny = 2.0 ** -966
+    while p > 0:
+        k = p - 2
+        while k >= 0:
+            if abs(e[k]) <= tiny + epsilon * (abs(s[k]) + abs(s[k + 1])):
+                e[k] = 0.0
+                break
+            k -= 1
+        if k == p - 2:
+            kase = 4
+        else:
+            ks = p - 1
+            while ks > k:
+                t = (abs(e[ks]) if ks != p else 0.0) + (abs(e[ks - 1]) if ks != k + 1 else 0.0)
+                if abs(s[ks]) <= tiny + epsilon * t:
+                    s[ks] = 0.0
+                    break
+                ks -= 1
+            if ks == k:
+                kase = 3
+            elif ks == p - 1:
+                kase = 1
+            else:
+                kase = 2
+                k = ks
+        k += 1
+
+        if kase == 1:
+            # s[p-1]可以忽略, 消去e[p-2]
+            f = e[p - 2]
+            e[p - 2] = 0.0
+            for j in range(p - 2, k - 1, -1):
+                t = math.hypot(s[j], f)
+                cs, sn = s[j] / t, f / t
+                s[j] = t
+                if j != k:
+                    f = -sn * e[j - 1]
+                    e[j - 1] = cs * e[j - 1]
+                _rotate(V, j, p - 1, cs, sn)
+        elif kase == 2:
+            # s[k-1]可以忽略, 在这里分裂
+            f = e[k - 1]
+            e[k - 1] = 0.0
+            for j in range(k, p):
+                t = math.hypot(s[j], f)
+                cs, sn = s[j] / t, f / t
+                s[j] = t
+                f = -sn * e[j]
+                e[j] = cs * e[j]
+                _rotate(U, j, k - 1, cs, sn)
+        elif kase == 3:
+            # 一步QR迭代, 位移取右下角2*2块的特征值
+            if iterations > 75 * n:
+                raise ValueError('Singular value iteration did not converge.')
+            scale = max(abs(s[p - 1]), abs(s[p - 2]), abs(e[p - 2]), abs(s[k]), abs(e[k]))
+            sp, spm1, epm1 = s[p - 1] / scale, s[p - 2] / scale, e[p - 2] / scale
+            sk, ek = s[k] / scale, e[k] / scale
+            b = ((spm1 + sp) * (spm1 - sp) + epm1 * epm1) / 2.0
+            c = (sp * epm1) ** 2
+            shift = 0.0
+            if b != 0.0 or c != 0.0:
+                shift = math.copysign(math.sqrt(b * b + c), b)
+                shift = c / (b + shift)
+            f = (sk + sp) * (sk - sp) + shift
+            g = sk * ek
+            for j in range(k, p - 1):
+                t = math.hypot(f, g)
+                cs, sn = f / t, g / t
+                if j != k:
+                    e[j - 1] = t
+                f = cs * s[j] + sn * e[j]
+                e[j] = cs * e[j] - sn * s[j]
+                g = sn * s[j + 1]
+                s[j + 1] = cs * s[j + 1]
+                _rotate(V, j, j + 1, cs, sn)
+                t = math.hypot(f, g)
+                cs, sn = f / t, g / t
+                s[j] = t
+                f = cs * e[j] + sn * s[j + 1]
+                s[j + 1] = -sn * e[j] + cs * s[j + 1]
+                g = sn * e[j + 1]
+                e[j + 1] = cs * e[j + 1]
+                if j < m - 1:
+                    _rotate(U, j, j + 1, cs, sn)
+            e[p - 2] = f
+            iterations += 1
+        else:
+            # 收敛, 使奇异值非负并按从大到小排好
+            if s[k] <= 0.0:
+                s[k] = -s[k] if s[k] < 0.0 else 0.0
+                V[k] = [-x for x in V[k]]
+            while k < pp and s[k] < s[k + 1]:
+                s[k], s[k + 1] = s[k + 1], s[k]
+                V[k], V[k + 1] = V[k + 1], V[k]
+                U[k], U[k + 1] = U[k + 1], U[k]
+                k += 1
+            iterations = 0
+            p -= 1
+    return U, s, V
+
+
+def svd(A) -> tuple:
+    """
+    瘦奇异值分解 A = U diag(s) V^T, 返回(U, 奇异值列表, V)
+    A是m*n矩阵, r = min(m, n), U是m*r矩阵, V是n*r矩阵, 奇异值从大到小
+    """
+    A = _dense(A)
+    m, n = A.num_rows(), A.num_columns()
+    if A._array is not None:
+        u, s, vt = np.linalg.svd(A._array, full_matrices=False)
+        return Matrix._wrap(u), s.tolist(), Matrix._wrap(vt.T)
+    if m < n:
+        v, s, u = svd(A.transpose())
+        return u, s, v
+    U, s, V = _golub_kahan(_float_columns(A), m, n)
+    return Matrix([list(row) for row in zip(*U)]), s, Matrix([list(row) for row in zip(*V)])
+
+
+def _dimension(A, x0) -> int:
+    """线性算子的列数, 只是函数的算子需要给出初始向量"""
+    if x0 is not None:
+        return len(x0.coordinates if isinstance(x0, Vector) else x0)
+    if hasattr(A, 'num_columns'):
+        return A.num_columns()
+    if hasattr(A, 'shape'):
+        return A.shape[1]
+    raise ValueError('A starting vector is required for this operator.')
+
+
+def _start_vector(n) -> list:
+    """
+    默认的初始向量, 用固定种子的伪随机数
+    全1之类有规律的向量经常和对称矩阵的主特征向量正交, 迭代会收敛到别的特征值
+    """
+    generator = random.Random(n)
+    return [generator.uniform(0.5, 1.5) for i in range(n)]
+
+
+def power_iteration(A, x0=None, tol=1e-10, max_iterations=1000) -> tuple:
+    """
+    幂迭代求模最大的特征值和对应的特征向量, 返回(特征值, Vector)
+    A可以是Matrix, 稀疏矩阵, 有matvec方法的对象或者函数, 只需要矩阵乘向量
+    残差 |A x - lambda x| 不超过tol * |lambda|时停止, 否则抛出ValueError
+    """
+    operator = _linear_operator(A)
+    if x0 is None:
+        x0 = _start_vector(_dimension(A, x0))
+    x = _coordinates(x0)
+    x = _scale(1 / math.sqrt(_inner(x, x)), x)
+    for iteration in range(max_iterations):
+        y = operator(x)
+        value = _inner(x, y)
+        residual = _combine(1, y, -value, x)
+        if math.sqrt(_inner(residual, residual)) <= tol * abs(value):
+            return value, Vector(x)
+        norm = math.sqrt(_inner(y, y))
+        if norm == 0:
+            return 0.0, Vector(x)
+        x = _scale(1 / norm, y)
+    raise ValueError('Power iteration did not converge.')
+
+
+def _symmetric_eigen(rows) -> tuple:
+    """小型实对称矩阵(嵌套列表)的特征值和特征向量的各列, 特征值从小到大"""
+    rows = [row[:] for row in rows]
+    d, e = _tred2(rows)
+    columns = [list(column) for column in zip(*rows)]
+    _tql2(d, e, columns)
+    return d, columns
+
+
+def _linear_combination(coefficients, vectors):
+    """sum(c * v)"""
+    result = _scale(coefficients[0], vectors[0])
+    for coefficient, v in zip(coefficients[1:], vectors[1:]):
+        result = _combine(1, result, coefficient, v)
+    return result
+
+
+def lanczos(A, k=1, which='largest', tol=1e-10, basis_size=None, max_restarts=1000, x0=None) -> tuple:
+    """
+    Lanczos迭代求实对称矩阵的k个特征对, 返回(特征值列表, 特征向量Vector列表)
+    which是'largest'(最大的), 'smallest'(最小的)或'magnitude'(模最大的)
+    A可以是Matrix, 稀疏矩阵, 有matvec方法的对象或者函数, 只需要矩阵乘向量, 适合大矩阵
+    Krylov基最多basis_size个向量, 并做完全重正交化; 基满了以后保留最好的一批Ritz向量重新开始(thick restart),
+    所以内存只有basis_size个向量. 所需的Ritz对的残差都不超过tol * |lambda|时停止
+    """
+    if which not in ('largest', 'smallest', 'magnitude'):
+        raise ValueError("which must be 'largest', 'smallest' or 'magnitude'")
+    operator = _linear_operator(A)
+    n = _dimension(A, x0)
+    if not 0 < k <= n:
+        raise ValueError('k must be between 1 and the dimension of the matrix.')
+    basis_size = min(n, max(2 * k + 10, 20) if basis_size is None else max(basis_size, k + 1))
+    keep = min(basis_size - 1, k + (basis_size - k) // 2)
+    if x0 is None:
+        x0 = _start_vector(n)
+    q = _coordinates(x0)
+    basis = [_scale(1 / math.sqrt(_inner(q, q)), q)]
+    H = [[0.0]]
+    restarts = 0
+    while True:
+        w = operator(basis[-1])
+        coefficients = [0.0] * len(basis)
+        for sweep in range(2):
+            for i, v in enumerate(basis):
+                h = _inner(w, v)
+                coefficients[i] += h
+                w = _combine(1, w, -h, v)
+        j = len(basis) - 1
+        for i in range(j):
+            H[i][j] = H[j][i] = coefficients[i]
+        H[j][j] = coefficients[j]
+        beta = math.sqrt(_inner(w, w))
+        size = len(basis)
+        if beta == 0 and size < k:
+            raise ValueError('Krylov subspace is exhausted, try another starting vector.')
+        full = size == basis_size or beta == 0
+        if size >= k and (full or size % 5 == 0):
+            values, columns = _symmetric_eigen(H)
+            if which == 'largest':
+                order = list(range(size - 1, -1, -1))
+            elif which == 'smallest':
+                order = list(range(size))
+            else:
+                order = sorted(range(size), key=lambda i: -abs(values[i]))
+            if beta == 0 or all(abs(beta * columns[i][-1]) <= tol * abs(values[i]) for i in order[:k]):
+                return ([values[i] for i in order[:k]],
+                        [Vector(_linear_combination(columns[i], basis)) for i in order[:k]])
+            if full:
+                restarts += 1
+                if restarts > max_restarts:
+                    raise ValueError('Lanczos iteration did not converge.')
+                basis = [_linear_combination(columns[i], basis) for i in order[:keep]]
+                H = [[0.0] * keep for i in range(keep)]
+                for a, i in enumerate(order[:keep]):
+                    H[a][a] = values[i]
+        for row in H:
+            row.append(0.0)
+        H.append([0.0] * (len(H) + 1))
+        basis.append(_scale(1 / beta, w))
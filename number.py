@@ -1,283 +1,1308 @@
-"""数"""
-
-
-from mathematics.number_theory import gcd, prime_factorization
-
-
-__all__ = ['RationalNumber', 'RealNumber']
-
-
-class RationalNumber:
-    """
-    有理数
-    numerator:分子
-    denominator:分母
-    """
-
-    def __init__(self, numerator, denominator):
-        """初始化属性numerator和denominator"""
-        if isinstance(numerator, float) or isinstance(denominator, float):
-            raise ValueError("Unsupport dealing with floats")
-        if denominator == 0:
-            raise ValueError("Denominator cannot be zero")
-        if denominator < 0:
-            numerator = -numerator
-            denominator = -denominator
-        if isinstance(numerator, int) and isinstance(denominator, int):
-            self.numerator = numerator
-            self.denominator = denominator
-        if isinstance(numerator, RationalNumber) or isinstance(denominator, RationalNumber):
-            self = numerator / denominator
-    
-    def __eq__(self, other) -> bool:
-        """判断相等"""
-        if isinstance(other, (float, int)):
-            return self.numerator == other * self.denominator
-        
-        if isinstance(other, RationalNumber):
-            return self.numerator * other.denominator == self.denominator * other.numerator
-        
-        raise TypeError("Invalid operand type for ==")
-    
-    def __ne__(self, other) -> bool:
-        """判断不等"""
-        return not self.__eq__(other)
-    
-    def __lt__(self, other) -> bool:
-        """判断小于"""
-        if isinstance(other, (int, float)):
-            return self.denominator < other * self.numerator
-        
-        if isinstance(other, RationalNumber):
-            return self.denominator * other.numerator < self.numerator * other.denominator
-        
-        raise TypeError("Invalid operand type for <")
-    
-    def __le__(self, other) -> bool:
-        """判断小于等于"""
-        return self.__lt__(other) or self.__eq__(other)
-    
-    def __gt__(self, other) -> bool:
-        """判断大于"""
-        return not self.__le__(other)
-    
-    def __ge__(self, other) -> bool:
-        """判断大于等于"""
-        return not self.__lt__(other)
-    
-    def __str__(self) -> str:
-        """字符串表示"""
-        return f"{self.numerator}/{self.denominator}"
-    
-    def __float__(self) -> float:
-        """浮点数表示"""
-        return float(self.numerator) / float(self.denominator)
-    
-    def __int__(self) -> int:
-        """整数表示"""
-        return int(float(self))
-    
-    def __abs__(self) -> "RationalNumber":
-        """绝对值"""
-        return RationalNumber(abs(self.numerator), abs(self.denominator))
-    
-    def __pos__(self) -> "RationalNumber":
-        """取正"""
-        return RationalNumber(self.numerator, self.denominator)
-    
-    def __neg__(self) -> "RationalNumber":
-        """取负"""
-        return RationalNumber(-self.numerator, self.denominator)
-    
-    def __round__(self, n=0) -> "RationalNumber":
-        """四舍五入"""
-        return RationalNumber(round(float(self), n), 1)
-    
-    def __floor__(self) -> "RationalNumber":
-        """向下取整"""
-        return RationalNumber(int(float(self)), 1)
-    
-    def __ceil__(self) -> "RationalNumber":
-        """向上取整"""
-        return RationalNumber(int(float(self) + 1), 1)
-    
-    def reduce(self) -> None:
-        """约分"""
-        factor = gcd(self.numerator, self.denominator)
-        self.numerator = int(self.numerator / factor)
-        self.denominator = int(self.denominator / factor)
-        return self
-    
-    def __add__(self, other) -> "RationalNumber":
-        """加法"""
-        if isinstance(other, int):
-            numerator = self.numerator + self.denominator * other
-            r = RationalNumber(numerator, self.denominator)
-        
-        if isinstance(other, RationalNumber):
-            numerator1 = self.numerator * other.denominator
-            numerator2 = other.numerator * self.denominator
-            numerator = numerator1 + numerator2
-            denominator = self.denominator * other.denominator
-            r = RationalNumber(numerator, denominator)
-            r = r.reduce()
-        
-        return r
-    
-    def __radd__(self, other) -> "RationalNumber":
-        """右加法"""
-        return self.__add__(other)
-
-    def __sub__(self, other) -> "RationalNumber":
-        """减法"""
-        return self.__add__(-other)
-    
-    def __rsub__(self, other) -> "RationalNumber":
-        """右减法"""
-        return -self.__sub__(other)
-    
-    def __mul__(self, other) -> "RationalNumber":
-        """乘法"""
-        if isinstance(other, int):
-            numerator = self.numerator * other
-            r = RationalNumber(numerator, self.denominator)
-        
-        if isinstance(other, RationalNumber):
-            factor1 = gcd(self.denominator, other.numerator)
-            factor2 = gcd(self.numerator, other.denominator)
-            numerator = self.numerator * other.numerator / factor1 / factor2
-            denominator = self.denominator * other.denominator / factor1 / factor2
-            r = RationalNumber(int(numerator), int(denominator))
-        
-        return r
-
-    def __rmul__(self, other) -> "RationalNumber":
-        """右乘法"""
-        return self.__mul__(other)
-
-    def __truediv__(self, other) -> "RationalNumber":
-        """除法"""
-        if other == 0:
-            raise ZeroDivisionError("division by zero")
-        if isinstance(other, int):
-            return self.__mul__(RationalNumber(1, other))
-        if isinstance(other, RationalNumber):
-            return self.__mul__(RationalNumber(other.denominator, other.numerator))
-
-
-    def __rtruediv__(self, other) -> "RationalNumber":
-        """右除法"""
-        result =  self.__truediv__(other)
-        return RationalNumber(result.denominator, result.numerator)
-    
-    def __pow__(self, other) -> "RationalNumber|RealNumber":
-        """乘方"""
-        if isinstance(other, int):
-            if other == 0:
-                return 1
-            
-            if other > 0:
-                numerator = self.numerator ** other
-                denominator = self.denominator ** other
-
-            if other < 0:
-                numerator = self.denominator ** -other
-                denominator = self.numerator ** -other
-            
-            r = RationalNumber(numerator, denominator)
-            return r
-        
-        if isinstance(other, RationalNumber):
-            return RealNumber(self, other)
-    
-    def __repr__(self):
-        return self.__str__()
-
-
-class RealNumber:
-    """
-    实数
-    coefficient:系数
-    base:底数
-    exponential:次数
-    """
-
-    def __init__(self, coefficient, base, exponential):
-        """初始化属性coefficient,base和exponential"""
-        self.coefficient = coefficient
-        self.base = base
-        self.exponential = exponential
-    
-    def __eq__(self, other):
-        if isinstance(other, float):
-            raise ValueError("Unsopport dealing with floats")
-        r1 = self.reduce()
-        if isinstance(other, RealNumber):
-            r2 = self.reduce()
-            if self._is_similar(other):
-                if self.coefficient == other.coefficient:
-                    return True
-            return False
-        if isinstance(other, int|RationalNumber):
-            if r1.base == 1 or r1.exponential == 0:
-                if r1.coefficient == other:
-                    return True
-                else:
-                    return False
-
-    def _is_similar(self, other) -> bool:
-        """判断是否为同类项"""
-        r1 = self.reduce()
-        other = other.reduce()
-        if isinstance(r1, RationalNumber):
-            if isinstance(other, RationalNumber|int):
-                return True
-            else:
-                return False
-        if isinstance(r1, RealNumber):
-            if isinstance(other, RationalNumber|int):
-                return False
-            if isinstance(other, RealNumber):
-                if self.base == other.base and self.exponential == other.exponential:
-                    return True
-    
-    def reduce(self) -> 'RationalNumber|RealNumber':
-        """化简"""
-        if isinstance(self.base, int):
-            p_dict = prime_factorization(self.base)
-            d = self.exponential.denominator
-            for p, t in p_dict.items():
-                if t >= d:
-                    i = int((t / d))
-                    self.base /= p ** (d ** i)
-                    self.coefficient *= p ** i ** self.exponential.numerator
-        return self
-    
-    def __str__(self) -> str:
-        """字符串表示"""
-        return f"{self.coefficient}*{self.base}^{self.exponential}"
-
-    def __add__(self, other):
-        pass
-    
-    def __repr__(self):
-        return self.__str__()
-
-
-class ContinuedFraction:
-    """连分数"""
-
-class ImaginaryNumber:
-    """虚数"""
-
-    def __init__(self, ceoefficient):
-        """初始化属性ceoefficient"""
-        self.ceoefficient = ceoefficient
-
-class ComplexNumber:
-    """复数"""
-
-    def __init__(self, real, imaginary):
-        """初始化属性real和imaginary"""
-        self.real = real
-        self.imaginary = imaginary
\ No newline at end of file
+"""数"""
+
+
+from array import array
+from functools import lru_cache
+from itertools import repeat
+from math import gcd, hypot, isfinite, isqrt
+import operator
+import sys
+import weakref
+
+try:
+    import numpy as np
+except ImportError:  # 没有NumPy时使用纯Python实现
+    np = None
+
+from mathematics.number_theory import prime_factorization
+
+
+__all__ = ['RationalNumber', 'RationalArray', 'RealNumber', 'ContinuedFraction', 'best_rational', 'best_rationals',
+           'ImaginaryNumber', 'ComplexNumber', 'ComplexArray']
+
+
+_HASH_MODULUS = sys.hash_info.modulus
+_HASH_INF = sys.hash_info.inf
+
+
+def _rational(numerator, denominator) -> 'RationalNumber':
+    """直接用已经约分好的分子分母构造有理数, 不做检查"""
+    r = object.__new__(RationalNumber)
+    r._numerator = numerator
+    r._denominator = denominator
+    return r
+
+
+def _reduced(numerator, denominator) -> 'RationalNumber':
+    """约分后构造有理数, denominator必须为正"""
+    factor = gcd(numerator, denominator)
+    if factor != 1:
+        numerator //= factor
+        denominator //= factor
+    return _rational(numerator, denominator)
+
+
+class RationalNumber:
+    """
+    有理数
+    numerator:分子
+    denominator:分母
+    总是最简分数且分母为正, 创建后不可修改, 可以哈希
+    运算全部在整数上进行, 和int, float比较时结果精确
+    """
+
+    __slots__ = ('_numerator', '_denominator')
+
+    def __init__(self, numerator, denominator=1):
+        """初始化属性numerator和denominator"""
+        if isinstance(numerator, float) or isinstance(denominator, float):
+            raise ValueError("Unsupport dealing with floats")
+        if isinstance(numerator, RationalNumber):
+            n1, d1 = numerator._numerator, numerator._denominator
+        elif isinstance(numerator, int):
+            n1, d1 = numerator, 1
+        else:
+            raise TypeError("Numerator must be an integer or RationalNumber")
+        if isinstance(denominator, RationalNumber):
+            n2, d2 = denominator._numerator, denominator._denominator
+        elif isinstance(denominator, int):
+            n2, d2 = denominator, 1
+        else:
+            raise TypeError("Denominator must be an integer or RationalNumber")
+        numerator = n1 * d2
+        denominator = d1 * n2
+        if denominator == 0:
+            raise ValueError("Denominator cannot be zero")
+        if denominator < 0:
+            numerator = -numerator
+            denominator = -denominator
+        factor = gcd(numerator, denominator)
+        self._numerator = numerator // factor
+        self._denominator = denominator // factor
+
+    @property
+    def numerator(self) -> int:
+        """分子"""
+        return self._numerator
+
+    @property
+    def denominator(self) -> int:
+        """分母"""
+        return self._denominator
+
+    def _compare(self, other, op):
+        """和int, float, RationalNumber精确比较"""
+        if isinstance(other, int):
+            return op(self._numerator, other * self._denominator)
+        if isinstance(other, RationalNumber):
+            return op(self._numerator * other._denominator, other._numerator * self._denominator)
+        if isinstance(other, float):
+            if not isfinite(other):
+                return op(0.0, other)
+            numerator, denominator = other.as_integer_ratio()
+            return op(self._numerator * denominator, numerator * self._denominator)
+        return NotImplemented
+    
+    def __eq__(self, other) -> bool:
+        """判断相等"""
+        if isinstance(other, RationalNumber):
+            return self._numerator == other._numerator and self._denominator == other._denominator
+        return self._compare(other, operator.eq)
+    
+    def __lt__(self, other) -> bool:
+        """判断小于"""
+        return self._compare(other, operator.lt)
+    
+    def __le__(self, other) -> bool:
+        """判断小于等于"""
+        return self._compare(other, operator.le)
+    
+    def __gt__(self, other) -> bool:
+        """判断大于"""
+        return self._compare(other, operator.gt)
+    
+    def __ge__(self, other) -> bool:
+        """判断大于等于"""
+        return self._compare(other, operator.ge)
+
+    def __hash__(self) -> int:
+        """哈希值, 和值相等的int, float一致"""
+        try:
+            inverse = pow(self._denominator, -1, _HASH_MODULUS)
+        except ValueError:
+            result = _HASH_INF
+        else:
+            result = hash(hash(abs(self._numerator)) * inverse)
+        if self._numerator < 0:
+            result = -result
+        return -2 if result == -1 else result
+
+    def __bool__(self) -> bool:
+        """是否非零"""
+        return self._numerator != 0
+    
+    def __str__(self) -> str:
+        """字符串表示"""
+        return f"{self._numerator}/{self._denominator}"
+    
+    def __float__(self) -> float:
+        """浮点数表示"""
+        return self._numerator / self._denominator
+    
+    def __int__(self) -> int:
+        """整数表示, 向零取整"""
+        if self._numerator < 0:
+            return -(-self._numerator // self._denominator)
+        return self._numerator // self._denominator
+    
+    def __abs__(self) -> "RationalNumber":
+        """绝对值"""
+        return _rational(abs(self._numerator), self._denominator)
+    
+    def __pos__(self) -> "RationalNumber":
+        """取正"""
+        return self
+    
+    def __neg__(self) -> "RationalNumber":
+        """取负"""
+        return _rational(-self._numerator, self._denominator)
+    
+    def __round__(self, n=0) -> "RationalNumber":
+        """四舍五入到小数点后n位, 恰好一半时取偶数"""
+        scale = 10 ** abs(n)
+        value = self * scale if n >= 0 else self / scale
+        floor, remainder = divmod(value._numerator, value._denominator)
+        if 2 * remainder > value._denominator or (2 * remainder == value._denominator and floor % 2 == 1):
+            floor += 1
+        return RationalNumber(floor, scale) if n >= 0 else _rational(floor * scale, 1)
+    
+    def __floor__(self) -> "RationalNumber":
+        """向下取整"""
+        return _rational(self._numerator // self._denominator, 1)
+    
+    def __ceil__(self) -> "RationalNumber":
+        """向上取整"""
+        return _rational(-(-self._numerator // self._denominator), 1)
+    
+    def reduce(self) -> "RationalNumber":
+        """约分, 有理数总是最简分数, 直接返回自身"""
+        return self
+    
+    def __add__(self, other) -> "RationalNumber":
+        """加法"""
+        if isinstance(other, int):
+            return _rational(self._numerator + self._denominator * other, self._denominator)
+        
+        if isinstance(other, RationalNumber):
+            na, da = self._numerator, self._denominator
+            nb, db = other._numerator, other._denominator
+            factor = gcd(da, db)
+            if factor == 1:
+                return _rational(na * db + da * nb, da * db)
+            s = da // factor
+            t = na * (db // factor) + nb * s
+            factor2 = gcd(t, factor)
+            if factor2 == 1:
+                return _rational(t, s * db)
+            return _rational(t // factor2, s * (db // factor2))
+
+        if isinstance(other, float):
+            return float(self) + other
+        
+        return NotImplemented
+    
+    def __radd__(self, other) -> "RationalNumber":
+        """右加法"""
+        return self.__add__(other)
+
+    def __sub__(self, other) -> "RationalNumber":
+        """减法"""
+        if isinstance(other, (int, float, RationalNumber)):
+            return self.__add__(-other)
+        return NotImplemented
+    
+    def __rsub__(self, other) -> "RationalNumber":
+        """右减法"""
+        return (-self).__add__(other)
+    
+    def __mul__(self, other) -> "RationalNumber":
+        """乘法, 先交叉约分, 乘出来的就是最简分数"""
+        if isinstance(other, int):
+            factor = gcd(other, self._denominator)
+            return _rational(self._numerator * (other // factor), self._denominator // factor)
+        
+        if isinstance(other, RationalNumber):
+            na, da = self._numerator, self._denominator
+            nb, db = other._numerator, other._denominator
+            factor1 = gcd(na, db)
+            if factor1 > 1:
+                na //= factor1
+                db //= factor1
+            factor2 = gcd(nb, da)
+            if factor2 > 1:
+                nb //= factor2
+                da //= factor2
+            return _rational(na * nb, da * db)
+
+        if isinstance(other, float):
+            return float(self) * other
+        
+        return NotImplemented
+
+    def __rmul__(self, other) -> "RationalNumber":
+        """右乘法"""
+        return self.__mul__(other)
+
+    def _reciprocal(self) -> "RationalNumber":
+        """倒数"""
+        if self._numerator == 0:
+            raise ZeroDivisionError("division by zero")
+        if self._numerator < 0:
+            return _rational(-self._denominator, -self._numerator)
+        return _rational(self._denominator, self._numerator)
+
+    def __truediv__(self, other) -> "RationalNumber":
+        """除法"""
+        if isinstance(other, int):
+            if other == 0:
+                raise ZeroDivisionError("division by zero")
+            factor = gcd(self._numerator, other)
+            if other < 0:
+                factor = -factor
+            return _rational(self._numerator // factor, self._denominator * (other // factor))
+        if isinstance(other, RationalNumber):
+            return self.__mul__(other._reciprocal())
+        if isinstance(other, float):
+            return float(self) / other
+        return NotImplemented
+
+    def __rtruediv__(self, other) -> "RationalNumber":
+        """右除法"""
+        if isinstance(other, (int, float)):
+            return self._reciprocal().__mul__(other)
+        return NotImplemented
+    
+    def __pow__(self, other) -> "RationalNumber|RealNumber":
+        """乘方"""
+        if isinstance(other, int):
+            if other >= 0:
+                return _rational(self._numerator ** other, self._denominator ** other)
+            return self._reciprocal().__pow__(-other)
+        
+        if isinstance(other, RationalNumber):
+            return RealNumber(1, self, other)
+
+        return NotImplemented
+    
+    def __repr__(self):
+        return self.__str__()
+
+
+def _pack(values):
+    """尽量存成int64数组, 超出范围时退回到Python整数列表"""
+    values = list(values)
+    try:
+        return array('q', values)
+    except OverflowError:
+        return values
+
+
+def _normalize(numerators, denominators) -> tuple:
+    """批量约分并把分母的符号移到分子上, 返回(分子, 分母)"""
+    numerators = list(numerators)
+    denominators = list(denominators)
+    if 0 in denominators:
+        raise ZeroDivisionError("division by zero")
+    factors = [-factor if denominator < 0 else factor
+               for factor, denominator in zip(map(gcd, numerators, denominators), denominators)]
+    return (list(map(operator.floordiv, numerators, factors)),
+            list(map(operator.floordiv, denominators, factors)))
+
+
+def _add_terms(n1, d1, n2, d2) -> tuple:
+    """逐项相加, 未约分"""
+    numerators = map(operator.add, map(operator.mul, n1, d2), map(operator.mul, n2, d1))
+    return numerators, map(operator.mul, d1, d2)
+
+
+def _mul_terms(n1, d1, n2, d2) -> tuple:
+    """逐项相乘, 未约分"""
+    return map(operator.mul, n1, n2), map(operator.mul, d1, d2)
+
+
+def _tree_reduce(numerators, denominators, combine) -> "RationalNumber":
+    """两两配对逐层归约, 每层整体约分一次"""
+    if not numerators:
+        raise ValueError("Cannot reduce an empty RationalArray")
+    while len(numerators) > 1:
+        odd = len(numerators) % 2
+        n, d = combine(numerators[0::2], denominators[0::2], numerators[1::2], denominators[1::2])
+        n, d = _normalize(n, d)
+        if odd:
+            n.append(numerators[-1])
+            d.append(denominators[-1])
+        numerators, denominators = n, d
+    return _rational(numerators[0], denominators[0])
+
+
+class RationalArray:
+    """
+    有理数数组
+    分子和分母分别存放在两个int64数组中, 有元素超出int64范围时改用Python整数列表
+    所有元素总是最简分数且分母为正, 运算都是逐元素的, 可以和单个int或RationalNumber运算
+    """
+
+    __slots__ = ('_numerators', '_denominators')
+
+    def __init__(self, numerators, denominators=None):
+        """初始化属性numerators和denominators, denominators默认全为1"""
+        numerators = list(numerators)
+        if denominators is None:
+            denominators = [1] * len(numerators)
+        else:
+            denominators = list(denominators)
+        if len(numerators) != len(denominators):
+            raise ValueError("Numerators and denominators must have the same length")
+        if not all(isinstance(x, int) for x in numerators) or not all(isinstance(x, int) for x in denominators):
+            raise TypeError("Numerators and denominators must be integers")
+        if 0 in denominators:
+            raise ValueError("Denominator cannot be zero")
+        numerators, denominators = _normalize(numerators, denominators)
+        self._numerators = _pack(numerators)
+        self._denominators = _pack(denominators)
+
+    @classmethod
+    def _from_reduced(cls, numerators, denominators) -> 'RationalArray':
+        """直接用已经约分好的分子分母构造, 不做检查"""
+        result = object.__new__(cls)
+        result._numerators = _pack(numerators)
+        result._denominators = _pack(denominators)
+        return result
+
+    @classmethod
+    def from_rationals(cls, values) -> 'RationalArray':
+        """由RationalNumber或int组成的序列构造"""
+        values = [RationalNumber(value) if isinstance(value, int) else value for value in values]
+        if not all(isinstance(value, RationalNumber) for value in values):
+            raise TypeError("Values must be integers or RationalNumber")
+        return cls._from_reduced([value.numerator for value in values], [value.denominator for value in values])
+
+    def to_rationals(self) -> list:
+        """转换成RationalNumber的列表"""
+        return list(map(_rational, self._numerators, self._denominators))
+
+    def to_floats(self) -> array:
+        """转换成浮点数数组"""
+        return array('d', map(operator.truediv, self._numerators, self._denominators))
+
+    @property
+    def numerators(self):
+        """分子数组"""
+        return self._numerators
+
+    @property
+    def denominators(self):
+        """分母数组"""
+        return self._denominators
+
+    def __len__(self) -> int:
+        """元素个数"""
+        return len(self._numerators)
+
+    def __iter__(self):
+        """依次生成RationalNumber"""
+        return map(_rational, self._numerators, self._denominators)
+
+    def __getitem__(self, index):
+        """下标返回RationalNumber, 切片返回RationalArray"""
+        if isinstance(index, slice):
+            return RationalArray._from_reduced(self._numerators[index], self._denominators[index])
+        return _rational(self._numerators[index], self._denominators[index])
+
+    def __str__(self) -> str:
+        """字符串表示"""
+        return '[' + ', '.join(map(str, self)) + ']'
+
+    def __repr__(self) -> str:
+        return f"RationalArray({self})"
+
+    def _operands(self, other):
+        """取出另一个操作数的分子分母, 单个数广播到每个元素"""
+        if isinstance(other, RationalArray):
+            if len(other) != len(self):
+                raise ValueError("RationalArray operands must have the same length")
+            return other._numerators, other._denominators
+        if isinstance(other, int):
+            return repeat(other), repeat(1)
+        if isinstance(other, RationalNumber):
+            return repeat(other.numerator), repeat(other.denominator)
+        return None
+
+    def __neg__(self) -> 'RationalArray':
+        """取负"""
+        return RationalArray._from_reduced(map(operator.neg, self._numerators), self._denominators)
+
+    def __abs__(self) -> 'RationalArray':
+        """绝对值"""
+        return RationalArray._from_reduced(map(abs, self._numerators), self._denominators)
+
+    def __add__(self, other) -> 'RationalArray':
+        """逐元素加法"""
+        operands = self._operands(other)
+        if operands is None:
+            return NotImplemented
+        n, d = _add_terms(self._numerators, self._denominators, *operands)
+        return RationalArray._from_reduced(*_normalize(n, d))
+
+    def __radd__(self, other) -> 'RationalArray':
+        """右加法"""
+        return self.__add__(other)
+
+    def __sub__(self, other) -> 'RationalArray':
+        """逐元素减法"""
+        if isinstance(other, (int, RationalNumber, RationalArray)):
+            return self.__add__(-other)
+        return NotImplemented
+
+    def __rsub__(self, other) -> 'RationalArray':
+        """右减法"""
+        return (-self).__add__(other)
+
+    def __mul__(self, other) -> 'RationalArray':
+        """逐元素乘法"""
+        operands = self._operands(other)
+        if operands is None:
+            return NotImplemented
+        n, d = _mul_terms(self._numerators, self._denominators, *operands)
+        return RationalArray._from_reduced(*_normalize(n, d))
+
+    def __rmul__(self, other) -> 'RationalArray':
+        """右乘法"""
+        return self.__mul__(other)
+
+    def __truediv__(self, other) -> 'RationalArray':
+        """逐元素除法"""
+        operands = self._operands(other)
+        if operands is None:
+            return NotImplemented
+        n, d = _mul_terms(self._numerators, self._denominators, operands[1], operands[0])
+        return RationalArray._from_reduced(*_normalize(n, d))
+
+    def __rtruediv__(self, other) -> 'RationalArray':
+        """右除法"""
+        operands = self._operands(other)
+        if operands is None:
+            return NotImplemented
+        n, d = _mul_terms(operands[0], operands[1], self._denominators, self._numerators)
+        return RationalArray._from_reduced(*_normalize(n, d))
+
+    def _compare(self, other, op) -> list:
+        """逐元素比较, 分母都为正, 交叉相乘即可"""
+        operands = self._operands(other)
+        if operands is None:
+            return NotImplemented
+        n2, d2 = operands
+        return list(map(op, map(operator.mul, self._numerators, d2), map(operator.mul, n2, self._denominators)))
+
+    def __eq__(self, other) -> list:
+        """逐元素判断相等"""
+        return self._compare(other, operator.eq)
+
+    def __ne__(self, other) -> list:
+        """逐元素判断不等"""
+        return self._compare(other, operator.ne)
+
+    def __lt__(self, other) -> list:
+        """逐元素判断小于"""
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other) -> list:
+        """逐元素判断小于等于"""
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other) -> list:
+        """逐元素判断大于"""
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other) -> list:
+        """逐元素判断大于等于"""
+        return self._compare(other, operator.ge)
+
+    __hash__ = None
+
+    def sum(self) -> RationalNumber:
+        """所有元素之和"""
+        if len(self) == 0:
+            return _rational(0, 1)
+        return _tree_reduce(list(self._numerators), list(self._denominators), _add_terms)
+
+    def prod(self) -> RationalNumber:
+        """所有元素之积"""
+        if len(self) == 0:
+            return _rational(1, 1)
+        return _tree_reduce(list(self._numerators), list(self._denominators), _mul_terms)
+
+    def dot(self, other) -> RationalNumber:
+        """点积"""
+        if not isinstance(other, RationalArray):
+            raise TypeError("Operand must be a RationalArray")
+        return (self * other).sum()
+
+
+@lru_cache(maxsize=4096)
+def _cached_factorization(integer) -> tuple:
+    """带缓存的质因数分解, 返回((质数, 次数), ...)"""
+    if integer == 1:
+        return ()
+    return tuple(prime_factorization(integer).items())
+
+
+def _as_rational(value) -> RationalNumber:
+    """把int或RationalNumber转换成RationalNumber"""
+    if isinstance(value, RationalNumber):
+        return value
+    if isinstance(value, int):
+        return _rational(value, 1)
+    raise TypeError("Value must be an integer or RationalNumber")
+
+
+def _canonical_radical(coefficient, base, exponential) -> tuple:
+    """
+    把coefficient * base^exponential化成标准形式(系数, 底数, 根指数d)
+    标准形式为系数 * 底数^(1/d), 底数是正整数且不含任何d次方因子, 也不是更低次根式的d次方
+    值为有理数时底数为1, d为1
+    """
+    coefficient = _as_rational(coefficient)
+    base = _as_rational(base)
+    exponential = _as_rational(exponential)
+    m, d = exponential.numerator, exponential.denominator
+    if m < 0:
+        if base == 0:
+            raise ZeroDivisionError("zero to a negative power")
+        base = base ** -1
+        m = -m
+    if m == 0 or coefficient == 0:
+        return (coefficient if m == 0 else coefficient * 0), 1, 1
+    if base == 0:
+        return _rational(0, 1), 1, 1
+    if base < 0:
+        if d % 2 == 0:
+            raise ValueError("Even root of a negative number is not real")
+        base = -base
+        if m % 2:
+            coefficient = -coefficient
+
+    # (p/q)^(m/d) = (p^m * q^(m(d-1)))^(1/d) / q^m
+    p, q = base.numerator, base.denominator
+    coefficient = coefficient / q ** m
+    times = [(prime, m * time) for prime, time in _cached_factorization(p)]
+    times += [(prime, m * (d - 1) * time) for prime, time in _cached_factorization(q)]
+
+    outside = 1
+    remainders = []
+    for prime, time in times:
+        outside *= prime ** (time // d)
+        if time % d:
+            remainders.append((prime, time % d))
+    coefficient = coefficient * outside
+    if not remainders:
+        return coefficient, 1, 1
+
+    factor = d
+    for prime, time in remainders:
+        factor = gcd(factor, time)
+    base = 1
+    for prime, time in remainders:
+        base *= prime ** (time // factor)
+    return coefficient, base, d // factor
+
+
+class RealNumber:
+    """
+    实数
+    coefficient:系数
+    base:底数
+    exponential:次数
+    创建时就化成标准形式: 系数为有理数, 底数为不含d次方因子的正整数, 次数为1/d
+    创建后不可修改, 比较和哈希都是O(1): 比较标准形式, 哈希在创建时算好
+    相同的值一般共享同一个对象, 但这只是为了节省内存, 多线程下可能出现值相同的两个对象
+    """
+
+    __slots__ = ('_coefficient', '_base', '_root', '_hash', '__weakref__')
+
+    # 标准形式 -> 对象, 没有引用时自动删除
+    _interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, coefficient, base, exponential):
+        """化成标准形式, 已有相同的值时直接返回已有的对象"""
+        return cls._make(*_canonical_radical(coefficient, base, exponential))
+
+    @classmethod
+    def _make(cls, coefficient, base, root) -> 'RealNumber':
+        """由标准形式取得对象"""
+        key = (coefficient.numerator, coefficient.denominator, base, root)
+        self = cls._interned.get(key)
+        if self is None:
+            self = object.__new__(cls)
+            self._coefficient = coefficient
+            self._base = base
+            self._root = root
+            self._hash = hash(coefficient) if base == 1 else hash(key)
+            cls._interned[key] = self
+        return self
+
+    @property
+    def coefficient(self) -> RationalNumber:
+        """系数"""
+        return self._coefficient
+
+    @property
+    def base(self) -> int:
+        """底数"""
+        return self._base
+
+    @property
+    def exponential(self) -> RationalNumber:
+        """次数"""
+        return _rational(1, self._root)
+
+    def __reduce__(self):
+        return RealNumber, (self._coefficient, self._base, self.exponential)
+
+    def __eq__(self, other):
+        """判断相等"""
+        if isinstance(other, float):
+            raise ValueError("Unsopport dealing with floats")
+        if isinstance(other, RealNumber):
+            return self is other or (self._base == other._base and self._root == other._root
+                                     and self._coefficient == other._coefficient)
+        if isinstance(other, (int, RationalNumber)):
+            return self._base == 1 and self._coefficient == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """哈希值, 有理数的哈希值和对应的RationalNumber一致"""
+        return self._hash
+
+    def _is_similar(self, other) -> bool:
+        """判断是否为同类项"""
+        if isinstance(other, (int, RationalNumber)):
+            return self._base == 1
+        if isinstance(other, RealNumber):
+            return self._base == other._base and self._root == other._root
+        return False
+    
+    def reduce(self) -> 'RationalNumber|RealNumber':
+        """化简, 值为有理数时返回RationalNumber"""
+        if self._base == 1:
+            return self._coefficient
+        return self
+
+    def __float__(self) -> float:
+        """浮点数表示"""
+        return float(self._coefficient) * self._base ** (1 / self._root)
+
+    def __neg__(self) -> 'RealNumber':
+        """取负"""
+        return RealNumber._make(-self._coefficient, self._base, self._root)
+
+    def __add__(self, other) -> 'RealNumber':
+        """同类项相加"""
+        if isinstance(other, (int, RationalNumber)):
+            other = RealNumber._make(_as_rational(other), 1, 1)
+        if not isinstance(other, RealNumber):
+            return NotImplemented
+        if not self._is_similar(other):
+            raise ValueError("Only similar radicals can be added")
+        coefficient = self._coefficient + other._coefficient
+        if coefficient == 0:
+            return RealNumber._make(coefficient, 1, 1)
+        return RealNumber._make(coefficient, self._base, self._root)
+
+    def __radd__(self, other) -> 'RealNumber':
+        """右加法"""
+        return self.__add__(other)
+
+    def __sub__(self, other) -> 'RealNumber':
+        """减法"""
+        if isinstance(other, (int, RationalNumber, RealNumber)):
+            return self.__add__(-other)
+        return NotImplemented
+
+    def __rsub__(self, other) -> 'RealNumber':
+        """右减法"""
+        return (-self).__add__(other)
+
+    def __mul__(self, other) -> 'RealNumber':
+        """乘法, 和有理数相乘或者和根指数相同的根式相乘"""
+        if isinstance(other, (int, RationalNumber)):
+            coefficient = self._coefficient * other
+            if coefficient == 0:
+                return RealNumber._make(coefficient, 1, 1)
+            return RealNumber._make(coefficient, self._base, self._root)
+        if isinstance(other, RealNumber):
+            if other._base == 1:
+                return self.__mul__(other._coefficient)
+            if self._base == 1:
+                return other.__mul__(self._coefficient)
+            if self._root != other._root:
+                raise ValueError("Only radicals with the same index can be multiplied")
+            return RealNumber(self._coefficient * other._coefficient, self._base * other._base,
+                              _rational(1, self._root))
+        return NotImplemented
+
+    def __rmul__(self, other) -> 'RealNumber':
+        """右乘法"""
+        return self.__mul__(other)
+    
+    def __str__(self) -> str:
+        """字符串表示"""
+        return f"{self.coefficient}*{self.base}^{self.exponential}"
+    
+    def __repr__(self):
+        return self.__str__()
+
+
+def _rational_quotients(numerator, denominator):
+    """用辗转相除生成numerator/denominator的部分商"""
+    while denominator:
+        a, r = divmod(numerator, denominator)
+        yield a
+        numerator, denominator = denominator, r
+
+
+def _quadratic_quotients(p, d, q):
+    """
+    生成二次无理数(p + sqrt(d)) / q的部分商, d不是完全平方数
+    先调整到q整除d - p^2, 之后的每一步都保持这个性质
+    """
+    if (d - p * p) % q:
+        d *= q * q
+        p *= abs(q)
+        q *= abs(q)
+    s = isqrt(d)
+    while True:
+        if q > 0:
+            a = (p + s) // q
+        else:
+            a = -((p + s) // -q) - 1
+        yield a
+        p = a * q - p
+        q = (d - p * p) // q
+
+
+def _float_ratio(value) -> tuple:
+    """浮点数的精确分数表示"""
+    if not isfinite(value):
+        raise ValueError("Cannot convert infinity or NaN to a continued fraction")
+    return value.as_integer_ratio()
+
+
+class ContinuedFraction:
+    """
+    连分数
+    value可以是int, float(按其精确值展开), RationalNumber, 二次根式RealNumber或生成部分商的可迭代对象
+    部分商按需生成并缓存, 可以反复迭代
+    """
+
+    __slots__ = ('_terms', '_source')
+
+    def __init__(self, value):
+        """初始化部分商的来源"""
+        self._terms = []
+        if isinstance(value, int):
+            self._source = iter((value,))
+        elif isinstance(value, float):
+            self._source = _rational_quotients(*_float_ratio(value))
+        elif isinstance(value, RationalNumber):
+            self._source = _rational_quotients(value.numerator, value.denominator)
+        elif isinstance(value, RealNumber):
+            coefficient = value.coefficient
+            if value.base == 1:
+                self._source = _rational_quotients(coefficient.numerator, coefficient.denominator)
+            elif value.exponential == _rational(1, 2):
+                # (u/v)*sqrt(b) = sqrt(u^2*b)/v, u为负时把符号放到分母上
+                u, v = coefficient.numerator, coefficient.denominator
+                self._source = _quadratic_quotients(0, u * u * value.base, v if u > 0 else -v)
+            else:
+                raise ValueError("Only quadratic irrationals are supported")
+        else:
+            self._source = iter(value)
+
+    def __iter__(self):
+        """依次生成部分商"""
+        terms = self._terms
+        i = 0
+        while True:
+            if i == len(terms):
+                term = next(self._source, None)
+                if term is None:
+                    return
+                terms.append(term)
+            yield terms[i]
+            i += 1
+
+    def convergents(self):
+        """依次生成渐近分数"""
+        p0, q0, p1, q1 = 0, 1, 1, 0
+        for a in self:
+            p0, q0, p1, q1 = p1, q1, a * p1 + p0, a * q1 + q0
+            yield _rational(p1, q1)
+
+    def value(self) -> RationalNumber:
+        """有限连分数的值, 无限连分数不会返回"""
+        result = None
+        for result in self.convergents():
+            pass
+        return result
+
+    def best_rational(self, max_denominator) -> RationalNumber:
+        """分母不超过max_denominator的最佳有理逼近"""
+        return best_rational(self, max_denominator)
+
+    def __str__(self) -> str:
+        """字符串表示, 最多显示前10个部分商"""
+        terms = []
+        for term in self:
+            if len(terms) == 10:
+                terms.append('...')
+                break
+            terms.append(str(term))
+        if not terms:
+            return '[]'
+        return f"[{terms[0]}; {', '.join(terms[1:])}]" if len(terms) > 1 else f"[{terms[0]}]"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def _compare_continued_fractions(terms1, terms2) -> int:
+    """比较两个连分数的大小, 返回-1, 0或1, 先结束的一方相当于在该位置上是无穷大"""
+    terms1, terms2 = iter(terms1), iter(terms2)
+    sign = 1
+    while True:
+        a, b = next(terms1, None), next(terms2, None)
+        if a is None and b is None:
+            return 0
+        if a is None or b is None:
+            return sign if a is None else -sign
+        if a != b:
+            return sign if a > b else -sign
+        sign = -sign
+
+
+def best_rational(x, max_denominator) -> RationalNumber:
+    """
+    分母不超过max_denominator且最接近x的有理数, 距离相等时取分母较小的
+    沿着连分数求渐近分数, 到分母超出限制时在最后一个渐近分数和中间分数中选择, 共O(log max_denominator)步
+    """
+    if not isinstance(max_denominator, int) or max_denominator < 1:
+        raise ValueError("max_denominator must be a positive integer")
+
+    if isinstance(x, float):
+        terms = _rational_quotients(*_float_ratio(x))
+    else:
+        terms = iter(x if isinstance(x, ContinuedFraction) else ContinuedFraction(x))
+    history = []
+    p0, q0, p1, q1 = 0, 1, 1, 0
+    for a in terms:
+        q2 = a * q1 + q0
+        if q2 > max_denominator:
+            break
+        p0, q0, p1, q1 = p1, q1, a * p1 + p0, q2
+        history.append(a)
+    else:
+        return _rational(p1, q1)
+
+    # 中间分数(p0 + t*p1) / (q0 + t*q1)比渐近分数p1/q1更接近x的条件:
+    # 2t > a, 或者2t == a且剩下的连分数大于q1/q0 = [a_k; a_(k-1), ..., a_1]
+    t = (max_denominator - q0) // q1
+    if 2 * t == a and q0 > 0:
+        reverse = history[:0:-1]
+        if len(reverse) > 1 and reverse[-1] == 1:
+            reverse[-2] += 1
+            reverse.pop()
+        closer = _compare_continued_fractions(terms, reverse) > 0
+    else:
+        closer = 2 * t > a
+    if closer:
+        return _rational(p0 + t * p1, q0 + t * q1)
+    return _rational(p1, q1)
+
+
+def best_rationals(values, max_denominator) -> RationalArray:
+    """把一列数(通常是浮点数)逐个转换成最佳有理逼近"""
+    return RationalArray.from_rationals(best_rational(value, max_denominator) for value in values)
+
+
+_HASH_IMAG = sys.hash_info.imag
+_HASH_MASK = (1 << sys.hash_info.width) - 1
+
+
+def _divide(x, y):
+    """除法, 两个整数相除时结果保持精确"""
+    if isinstance(x, int) and isinstance(y, int):
+        if x % y == 0:
+            return x // y
+        return RationalNumber(x, y)
+    return x / y
+
+
+def _complex_parts(value):
+    """取出实部和虚部, 不支持的类型返回None"""
+    if isinstance(value, ComplexNumber):
+        return value._real, value._imaginary
+    if isinstance(value, (int, float, RationalNumber)):
+        return value, 0
+    if isinstance(value, complex):
+        return value.real, value.imag
+    return None
+
+
+def _complex(real, imaginary) -> 'ComplexNumber':
+    """直接构造复数, 不做检查"""
+    z = object.__new__(ComplexNumber)
+    z._real = real
+    z._imaginary = imaginary
+    return z
+
+
+class ComplexNumber:
+    """
+    复数
+    real:实部
+    imaginary:虚部
+    实部和虚部可以是int, RationalNumber或float, 都是精确值时运算结果也是精确的
+    """
+
+    __slots__ = ('_real', '_imaginary')
+
+    def __init__(self, real, imaginary=0):
+        """初始化属性real和imaginary"""
+        if not isinstance(real, (int, float, RationalNumber)) or not isinstance(imaginary, (int, float, RationalNumber)):
+            raise TypeError("Real and imaginary parts must be numbers")
+        self._real = real
+        self._imaginary = imaginary
+
+    @property
+    def real(self):
+        """实部"""
+        return self._real
+
+    @property
+    def imaginary(self):
+        """虚部"""
+        return self._imaginary
+
+    def __eq__(self, other) -> bool:
+        """判断相等"""
+        parts = _complex_parts(other)
+        if parts is None:
+            return NotImplemented
+        return self._real == parts[0] and self._imaginary == parts[1]
+
+    def __hash__(self) -> int:
+        """哈希值, 和值相等的complex, int, float, RationalNumber一致"""
+        result = (hash(self._real) + _HASH_IMAG * hash(self._imaginary)) & _HASH_MASK
+        if result >> (sys.hash_info.width - 1):
+            result -= _HASH_MASK + 1
+        return -2 if result == -1 else result
+
+    def __complex__(self) -> complex:
+        """转换成complex"""
+        return complex(float(self._real), float(self._imaginary))
+
+    def __bool__(self) -> bool:
+        """是否非零"""
+        return bool(self._real) or bool(self._imaginary)
+
+    def __str__(self) -> str:
+        """字符串表示"""
+        sign = '-' if self._imaginary < 0 else '+'
+        return f"{self._real}{sign}{abs(self._imaginary)}i"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def conjugate(self) -> 'ComplexNumber':
+        """共轭复数"""
+        return _complex(self._real, -self._imaginary)
+
+    def __abs__(self):
+        """模, 实部和虚部都精确时返回RationalNumber或RealNumber"""
+        if isinstance(self._real, float) or isinstance(self._imaginary, float):
+            return hypot(self._real, self._imaginary)
+        return RealNumber(1, self._real * self._real + self._imaginary * self._imaginary, _rational(1, 2)).reduce()
+
+    def __pos__(self) -> 'ComplexNumber':
+        """取正"""
+        return self
+
+    def __neg__(self) -> 'ComplexNumber':
+        """取负"""
+        return _complex(-self._real, -self._imaginary)
+
+    def __add__(self, other) -> 'ComplexNumber':
+        """加法"""
+        parts = _complex_parts(other)
+        if parts is None:
+            return NotImplemented
+        return _complex(self._real + parts[0], self._imaginary + parts[1])
+
+    def __radd__(self, other) -> 'ComplexNumber':
+        """右加法"""
+        return self.__add__(other)
+
+    def __sub__(self, other) -> 'ComplexNumber':
+        """减法"""
+        parts = _complex_parts(other)
+        if parts is None:
+            return NotImplemented
+        return _complex(self._real - parts[0], self._imaginary - parts[1])
+
+    def __rsub__(self, other) -> 'ComplexNumber':
+        """右减法"""
+        parts = _complex_parts(other)
+        if parts is None:
+            return NotImplemented
+        return _complex(parts[0] - self._real, parts[1] - self._imaginary)
+
+    def __mul__(self, other) -> 'ComplexNumber':
+        """乘法"""
+        parts = _complex_parts(other)
+        if parts is None:
+            return NotImplemented
+        a, b = self._real, self._imaginary
+        c, d = parts
+        return _complex(a * c - b * d, a * d + b * c)
+
+    def __rmul__(self, other) -> 'ComplexNumber':
+        """右乘法"""
+        return self.__mul__(other)
+
+    def _reciprocal(self) -> 'ComplexNumber':
+        """倒数"""
+        norm = self._real * self._real + self._imaginary * self._imaginary
+        if norm == 0:
+            raise ZeroDivisionError("division by zero")
+        return _complex(_divide(self._real, norm), _divide(-self._imaginary, norm))
+
+    def __truediv__(self, other) -> 'ComplexNumber':
+        """除法"""
+        parts = _complex_parts(other)
+        if parts is None:
+            return NotImplemented
+        return self.__mul__(_complex(*parts)._reciprocal())
+
+    def __rtruediv__(self, other) -> 'ComplexNumber':
+        """右除法"""
+        parts = _complex_parts(other)
+        if parts is None:
+            return NotImplemented
+        return self._reciprocal().__mul__(_complex(*parts))
+
+    def __pow__(self, other) -> 'ComplexNumber':
+        """整数次幂"""
+        if not isinstance(other, int):
+            return NotImplemented
+        base = self if other >= 0 else self._reciprocal()
+        other = abs(other)
+        result = _complex(1, 0)
+        while other:
+            if other & 1:
+                result = result * base
+            other >>= 1
+            if other:
+                base = base * base
+        return result
+
+
+class ImaginaryNumber(ComplexNumber):
+    """
+    虚数
+    ceoefficient:虚部系数
+    实部为0的复数, 运算结果是ComplexNumber
+    """
+
+    __slots__ = ()
+
+    def __init__(self, ceoefficient):
+        """初始化属性ceoefficient"""
+        super().__init__(0, ceoefficient)
+
+    @property
+    def ceoefficient(self):
+        """虚部系数"""
+        return self._imaginary
+
+    coefficient = ceoefficient
+
+
+def _interleave(real, imaginary) -> array:
+    """把实部和虚部数组交错存放到一个数组里"""
+    data = array('d', bytes(16 * len(real)))
+    data[0::2] = real
+    data[1::2] = imaginary
+    return data
+
+
+class ComplexArray:
+    """
+    复数数组
+    按实部, 虚部, 实部, 虚部...的顺序交错存放在一个双精度数组中, 和NumPy的complex128内存布局相同
+    有NumPy时乘法和求模直接在这块内存上向量化计算
+    """
+
+    __slots__ = ('_data',)
+
+    def __init__(self, values=()):
+        """由complex, ComplexNumber或实数组成的序列构造"""
+        data = array('d')
+        for value in values:
+            parts = _complex_parts(value)
+            if parts is None:
+                raise TypeError("Values must be numbers")
+            data.append(float(parts[0]))
+            data.append(float(parts[1]))
+        self._data = data
+
+    @classmethod
+    def _from_data(cls, data) -> 'ComplexArray':
+        """直接用交错存放的数组构造"""
+        result = object.__new__(cls)
+        result._data = data
+        return result
+
+    @classmethod
+    def from_parts(cls, real, imaginary) -> 'ComplexArray':
+        """由实部序列和虚部序列构造"""
+        real = array('d', real)
+        imaginary = array('d', imaginary)
+        if len(real) != len(imaginary):
+            raise ValueError("Real and imaginary parts must have the same length")
+        return cls._from_data(_interleave(real, imaginary))
+
+    @property
+    def real(self) -> array:
+        """实部数组"""
+        return self._data[0::2]
+
+    @property
+    def imaginary(self) -> array:
+        """虚部数组"""
+        return self._data[1::2]
+
+    def _as_numpy(self):
+        """不复制地把数据看成NumPy的complex128数组"""
+        return np.frombuffer(self._data, dtype=np.complex128)
+
+    def __len__(self) -> int:
+        """元素个数"""
+        return len(self._data) // 2
+
+    def __getitem__(self, index) -> complex:
+        """第index个元素"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ComplexArray index out of range")
+        return complex(self._data[2 * index], self._data[2 * index + 1])
+
+    def __iter__(self):
+        """依次生成complex"""
+        return map(complex, self._data[0::2], self._data[1::2])
+
+    def to_list(self) -> list:
+        """转换成complex的列表"""
+        return list(self)
+
+    def __str__(self) -> str:
+        """字符串表示"""
+        return str(self.to_list())
+
+    def __repr__(self) -> str:
+        return f"ComplexArray({self})"
+
+    def _operand(self, other):
+        """
+        取出另一个操作数
+        返回('array', 交错数组)或('scalar', (实部, 虚部)), 不支持时返回None
+        """
+        if isinstance(other, ComplexArray):
+            if len(other) != len(self):
+                raise ValueError("ComplexArray operands must have the same length")
+            return 'array', other._data
+        parts = _complex_parts(other)
+        if parts is None:
+            return None
+        return 'scalar', (float(parts[0]), float(parts[1]))
+
+    def __add__(self, other) -> 'ComplexArray':
+        """逐元素加法"""
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        kind, value = operand
+        if kind == 'array':
+            return ComplexArray._from_data(array('d', map(operator.add, self._data, value)))
+        real = array('d', [value[0]]) * len(self)
+        imaginary = array('d', [value[1]]) * len(self)
+        return ComplexArray._from_data(array('d', map(operator.add, self._data, _interleave(real, imaginary))))
+
+    def __radd__(self, other) -> 'ComplexArray':
+        """右加法"""
+        return self.__add__(other)
+
+    def __neg__(self) -> 'ComplexArray':
+        """取负"""
+        return ComplexArray._from_data(array('d', map(operator.neg, self._data)))
+
+    def __sub__(self, other) -> 'ComplexArray':
+        """逐元素减法"""
+        if isinstance(other, ComplexArray):
+            return self.__add__(-other)
+        parts = _complex_parts(other)
+        if parts is None:
+            return NotImplemented
+        return self.__add__(_complex(-parts[0], -parts[1]))
+
+    def __rsub__(self, other) -> 'ComplexArray':
+        """右减法"""
+        return (-self).__add__(other)
+
+    def __mul__(self, other) -> 'ComplexArray':
+        """逐元素乘法"""
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        kind, value = operand
+        if np is not None:
+            b = np.frombuffer(value, dtype=np.complex128) if kind == 'array' else complex(*value)
+            result = array('d')
+            result.frombytes((self._as_numpy() * b).tobytes())
+            return ComplexArray._from_data(result)
+
+        ar, ai = self._data[0::2], self._data[1::2]
+        if kind == 'array':
+            br, bi = value[0::2], value[1::2]
+        else:
+            br, bi = repeat(value[0]), repeat(value[1])
+        real = array('d', map(operator.sub, map(operator.mul, ar, br), map(operator.mul, ai, bi)))
+        imaginary = array('d', map(operator.add, map(operator.mul, ar, bi), map(operator.mul, ai, br)))
+        return ComplexArray._from_data(_interleave(real, imaginary))
+
+    def __rmul__(self, other) -> 'ComplexArray':
+        """右乘法"""
+        return self.__mul__(other)
+
+    def __abs__(self) -> array:
+        """逐元素求模"""
+        if np is not None:
+            return array('d', np.abs(self._as_numpy()).tobytes())
+        return array('d', map(hypot, self._data[0::2], self._data[1::2]))
+
+    def conjugate(self) -> 'ComplexArray':
+        """逐元素求共轭"""
+        data = array('d', self._data)
+        data[1::2] = array('d', map(operator.neg, data[1::2]))
+        return ComplexArray._from_data(data)
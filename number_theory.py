@@ -1,158 +1,1459 @@
-"""数论"""
-
-
-from pathlib import Path
-import json
-
-
-# this list only includes prime numbers that are below 100
-p_numbers = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97]
-
-
-def gcd(integer1, integer2) -> int:
-    """两个整数的最大公因数"""
-    if not isinstance(integer1, int) or not isinstance(integer2, int):
-        raise ValueError("Input numbers must be integers")
-    
-    if integer1 < 0:
-        integer1 *= -1
-    
-    if integer2 < 0:
-        integer2 *= -1
-    
-    if integer1 == 0 or integer2 == 0:
-        raise ValueError("gcd is not defined for 0")
-    
-    while integer2 != 0:
-        integer1, integer2 = integer2 , integer1 % integer2
-    
-    return integer1
-
-
-def lcm(integer1, integer2) -> int:
-    """两个整数的最小公倍数"""
-    if not isinstance(integer1, int) or not isinstance(integer2, int):
-        raise ValueError("Input numbers must be integers")
-    
-    if integer1 < 0:
-        integer1 *= -1
-    
-    if integer2 < 0:
-        integer2 *= -1
-    
-    if integer1 == 0 or integer2 == 0:
-        raise ValueError("lcm is not defined for 0")
-    
-    return integer1 * integer2 // gcd(integer1, integer2)
-
-
-def gcf(*integers) -> int:
-    """一组整数的最大公因数"""
-
-    if len(integers) < 2:
-        raise ValueError("At least two integer is required")
-
-    result = integers[0]
-    for integer in integers[1:]:
-        result = gcd(result, integer)
-
-    return result
-
-
-def lcf(*integers) -> int:
-    """一组整数的最小公倍数"""
-
-    if len(integers) == 0:
-        raise ValueError("At least one integer is required")
-
-    if len(integers) == 1:
-        return integers[0]
-
-    result = integers[0]
-    for integer in integers[1:]:
-        result = lcm(result, integer)
-
-    return result
-
-
-def find_prime_number():
-    """寻找质数"""
-
-    path1 = Path('prime_numbers.json')
-    contents1 = path1.read_text()
-    prime_numbers = json.loads(contents1)
-
-    path2 = Path('last_number.json')
-    contents2 = path2.read_text()
-    last_number = json.loads(contents2)
-
-    for i in range(100):
-        a = 0
-        while True:
-            if mt.gcd(last_number, prime_numbers[a]) == 1:
-                a += 1
-                if a == len(prime_numbers):
-                    prime_numbers.append(last_number)
-                    last_number += 1
-                    break
-            else:
-                last_number += 1
-                break
-
-    contents3 = json.dumps(prime_numbers)
-    path1.write_text(contents3)
-
-    contents4 = json.dumps(last_number)
-    path2.write_text(contents4)
-
-
-def prime_factorization(integer) -> dict:
-    """质因数分解"""
-
-    if not isinstance(integer, int):
-        raise ValueError("Input number must be integer")
-    if integer <= 1:
-        raise ValueError("Input number must be greater than 1")
-    
-    facted_p_numbers = {}
-
-    for i in range(24):
-        p = p_numbers[i]
-        if p > integer:
-            break
-        while True:
-            if integer % p == 0:
-                if p in facted_p_numbers:
-                    facted_p_numbers[p] += 1
-                else:
-                    facted_p_numbers[p] = 1
-                integer /= p
-            else:
-                break
-    
-    return facted_p_numbers
-
-
-def divisors(integer) -> list:
-    """所有因子"""
-
-    if not isinstance(integer, int):
-        raise ValueError("Input number must be integer")
-    if integer <= 0:
-        raise ValueError("Input number must be greater than 0")
-    
-    divs = []
-    for i in range(1, integer + 1):
-        if integer % i == 0:
-            divs.append(i)
-    
-    return divs
-
-
-def iteration(start, function, time):
-    """迭代"""
-    list = [start]
-    for i in range(time):
-        start = function(start)
-        list.append(start)
-    return list
+"""数论"""
+
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from itertools import compress, islice
+from math import gcd as _gcd, isqrt, lcm as _lcm, log
+from multiprocessing import shared_memory
+from random import randrange
+import mmap
+import os
+import struct
+import sys
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+try:
+    import numpy as np
+except ImportError:  # 没有NumPy时使用纯Python实现
+    np = None
+
+
+# this list only includes prime numbers that are below 100
+p_numbers = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97]
+
+
+def gcd(integer1, integer2) -> int:
+    """两个整数的最大公因数"""
+    if not isinstance(integer1, int) or not isinstance(integer2, int):
+        raise ValueError("Input numbers must be integers")
+    
+    if integer1 < 0:
+        integer1 *= -1
+    
+    if integer2 < 0:
+        integer2 *= -1
+    
+    if integer1 == 0 or integer2 == 0:
+        raise ValueError("gcd is not defined for 0")
+    
+    while integer2 != 0:
+        integer1, integer2 = integer2 , integer1 % integer2
+    
+    return integer1
+
+
+def lcm(integer1, integer2) -> int:
+    """两个整数的最小公倍数"""
+    if not isinstance(integer1, int) or not isinstance(integer2, int):
+        raise ValueError("Input numbers must be integers")
+    
+    if integer1 < 0:
+        integer1 *= -1
+    
+    if integer2 < 0:
+        integer2 *= -1
+    
+    if integer1 == 0 or integer2 == 0:
+        raise ValueError("lcm is not defined for 0")
+    
+    return integer1 * integer2 // gcd(integer1, integer2)
+
+
+def _check_nonzero_integers(integers, name) -> None:
+    """检查integers都是非零整数"""
+    if not all(isinstance(integer, int) for integer in integers):
+        raise ValueError("Input numbers must be integers")
+    if 0 in integers:
+        raise ValueError(f"{name} is not defined for 0")
+
+
+def gcf(*integers) -> int:
+    """一组整数的最大公因数"""
+
+    if len(integers) < 2:
+        raise ValueError("At least two integer is required")
+    _check_nonzero_integers(integers, 'gcd')
+
+    return gcd_reduce(integers)
+
+
+def lcf(*integers) -> int:
+    """一组整数的最小公倍数"""
+
+    if len(integers) == 0:
+        raise ValueError("At least one integer is required")
+
+    if len(integers) == 1:
+        return integers[0]
+    _check_nonzero_integers(integers, 'lcm')
+
+    return lcm_reduce(integers)
+
+
+# 归约时每块的长度, 每处理完一块检查一次结果是否已经是1
+_REDUCE_CHUNK = 1 << 12
+
+
+def gcd_array(array1, array2):
+    """
+    逐元素求最大公因数
+    两个都是NumPy数组时返回NumPy数组, 否则返回列表, gcd(0, 0) = 0
+    """
+    if np is not None and isinstance(array1, np.ndarray) and isinstance(array2, np.ndarray):
+        return np.gcd(array1, array2)
+    return list(map(_gcd, array1, array2))
+
+
+def lcm_array(array1, array2):
+    """
+    逐元素求最小公倍数
+    两个都是NumPy数组时返回NumPy数组(注意int64溢出), 否则返回列表, lcm(0, n) = 0
+    """
+    if np is not None and isinstance(array1, np.ndarray) and isinstance(array2, np.ndarray):
+        return np.lcm(array1, array2)
+    return list(map(_lcm, array1, array2))
+
+
+def gcd_reduce(integers) -> int:
+    """
+    一列整数的最大公因数
+    分块求gcd, 结果变成1时立即返回, 空序列的结果为0
+    """
+    result = 0
+    if np is not None and isinstance(integers, np.ndarray):
+        for start in range(0, len(integers), _REDUCE_CHUNK):
+            result = _gcd(result, int(np.gcd.reduce(integers[start:start + _REDUCE_CHUNK])))
+            if result == 1:
+                break
+        return result
+
+    iterator = iter(integers)
+    while True:
+        chunk = tuple(islice(iterator, _REDUCE_CHUNK))
+        if not chunk:
+            return result
+        result = _gcd(result, *chunk)
+        if result == 1:
+            return result
+
+
+def lcm_reduce(integers) -> int:
+    """
+    一列整数的最小公倍数
+    两两配对逐层归约, 让参与运算的数大小相近, 空序列的结果为1
+    """
+    if np is not None and isinstance(integers, np.ndarray):
+        integers = integers.tolist()
+
+    level = list(map(abs, integers))
+    if not level:
+        return 1
+    while len(level) > 1:
+        paired = list(map(_lcm, level[0::2], level[1::2]))
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+
+def extended_gcd(integer1, integer2) -> tuple:
+    """扩展欧几里得算法, 返回(g, x, y)使得integer1*x + integer2*y = g = gcd(integer1, integer2)"""
+    if not isinstance(integer1, int) or not isinstance(integer2, int):
+        raise ValueError("Input numbers must be integers")
+
+    old_r, r = integer1, integer2
+    old_x, x = 1, 0
+    old_y, y = 0, 1
+    while r != 0:
+        q = old_r // r
+        old_r, r = r, old_r - q * r
+        old_x, x = x, old_x - q * x
+        old_y, y = y, old_y - q * y
+    if old_r < 0:
+        old_r, old_x, old_y = -old_r, -old_x, -old_y
+    return old_r, old_x, old_y
+
+
+def _check_modulus(modulus) -> None:
+    """检查模数是正整数"""
+    if not isinstance(modulus, int):
+        raise ValueError("Modulus must be integer")
+    if modulus <= 0:
+        raise ValueError("Modulus must be positive")
+
+
+def mod_inverse(integer, modulus) -> int:
+    """integer模modulus的逆元"""
+    _check_modulus(modulus)
+    g, x, y = extended_gcd(integer % modulus, modulus)
+    if g != 1:
+        raise ValueError(f"{integer} is not invertible modulo {modulus}")
+    return x % modulus
+
+
+def mod_inverse_many(integers, modulus) -> list:
+    """
+    批量求逆元
+    Montgomery技巧: 先求前缀积, 只做一次求逆, 再倒推出每个数的逆元
+    """
+    _check_modulus(modulus)
+    if np is not None and isinstance(integers, np.ndarray):
+        integers = integers.tolist()
+    integers = [integer % modulus for integer in integers]
+    prefix = [1] * (len(integers) + 1)
+    for i, integer in enumerate(integers):
+        prefix[i + 1] = prefix[i] * integer % modulus
+
+    inverse = mod_inverse(prefix[-1], modulus) if integers else 1
+    inverses = [0] * len(integers)
+    for i in range(len(integers) - 1, -1, -1):
+        inverses[i] = inverse * prefix[i] % modulus
+        inverse = inverse * integers[i] % modulus
+    return inverses
+
+
+def crt(remainders, moduli) -> tuple:
+    """
+    中国剩余定理
+    解同余方程组x = remainders[i] (mod moduli[i]), 模数不必两两互素
+    返回(x, m), 解为所有模m余x的整数, 方程组无解时抛出ValueError
+    """
+    remainders = list(remainders)
+    moduli = list(moduli)
+    if len(remainders) != len(moduli):
+        raise ValueError("The number of remainders and moduli must be equal")
+    for modulus in moduli:
+        _check_modulus(modulus)
+
+    x, m = 0, 1
+    for remainder, modulus in zip(remainders, moduli):
+        g, p, q = extended_gcd(m, modulus)
+        if (remainder - x) % g != 0:
+            raise ValueError("The congruences have no common solution")
+        lcm_m = m // g * modulus
+        x = (x + (remainder - x) // g * p % (modulus // g) * m) % lcm_m
+        m = lcm_m
+    return x, m
+
+
+def modpow_many(bases, exponent, modulus):
+    """
+    批量求bases中每个数的exponent次幂模modulus
+    bases是NumPy数组且modulus < 2^32时用向量化的平方乘算法, 中间结果不会超过uint64
+    其他情况逐个调用pow
+    """
+    _check_modulus(modulus)
+    if not isinstance(exponent, int):
+        raise ValueError("Exponent must be integer")
+    vectorized = np is not None and isinstance(bases, np.ndarray) and modulus < 1 << 32
+    if exponent < 0:
+        inverses = mod_inverse_many(bases, modulus)
+        if vectorized:
+            inverses = np.array(inverses, dtype=np.uint64)
+        return modpow_many(inverses, -exponent, modulus)
+
+    if vectorized:
+        if bases.dtype.kind == 'i':
+            # 有符号整数先在有符号运算中取模, 否则负数转换成uint64时会回绕
+            base = np.mod(bases, modulus).astype(np.uint64)
+        else:
+            base = bases.astype(np.uint64) % np.uint64(modulus)
+        result = np.full(base.shape, 1 % modulus, dtype=np.uint64)
+        while exponent:
+            if exponent & 1:
+                result = result * base % np.uint64(modulus)
+            exponent >>= 1
+            if exponent:
+                base = base * base % np.uint64(modulus)
+        return result
+    if np is not None and isinstance(bases, np.ndarray):
+        bases = bases.tolist()
+    return [pow(base, exponent, modulus) for base in bases]
+
+
+class ModInt:
+    """
+    模整数, 不可变
+    value:代表元(0到modulus-1)
+    modulus:模数
+    """
+
+    __slots__ = ('_value', '_modulus')
+
+    def __init__(self, value, modulus):
+        """初始化属性value和modulus"""
+        _check_modulus(modulus)
+        if not isinstance(value, int):
+            raise ValueError("Value must be integer")
+        self._value = value % modulus
+        self._modulus = modulus
+
+    def _make(self, value) -> 'ModInt':
+        """以相同的模数构造, 跳过检查"""
+        result = ModInt.__new__(ModInt)
+        result._value = value % self._modulus
+        result._modulus = self._modulus
+        return result
+
+    @property
+    def value(self) -> int:
+        """代表元"""
+        return self._value
+
+    @property
+    def modulus(self) -> int:
+        """模数"""
+        return self._modulus
+
+    def _coerce(self, other):
+        """取出另一个操作数的值, 模数不同时抛出ValueError"""
+        if isinstance(other, ModInt):
+            if other.modulus != self.modulus:
+                raise ValueError("Moduli of ModInt operands must be equal")
+            return other.value
+        if isinstance(other, int):
+            return other
+        return None
+
+    def __eq__(self, other) -> bool:
+        """判断相等, 只与模数相同的ModInt相等, 与__hash__保持一致"""
+        if isinstance(other, ModInt):
+            return self.modulus == other.modulus and self.value == other.value
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """哈希值"""
+        return hash((self.value, self.modulus))
+
+    def __int__(self) -> int:
+        """整数表示"""
+        return self.value
+
+    def __str__(self) -> str:
+        """字符串表示"""
+        return f"{self.value} (mod {self.modulus})"
+
+    def __repr__(self) -> str:
+        return f"ModInt({self.value}, {self.modulus})"
+
+    def __neg__(self) -> 'ModInt':
+        """取负"""
+        return self._make(-self.value)
+
+    def __add__(self, other) -> 'ModInt':
+        """加法"""
+        value = self._coerce(other)
+        if value is None:
+            return NotImplemented
+        return self._make(self.value + value)
+
+    def __radd__(self, other) -> 'ModInt':
+        """右加法"""
+        return self.__add__(other)
+
+    def __sub__(self, other) -> 'ModInt':
+        """减法"""
+        value = self._coerce(other)
+        if value is None:
+            return NotImplemented
+        return self._make(self.value - value)
+
+    def __rsub__(self, other) -> 'ModInt':
+        """右减法"""
+        value = self._coerce(other)
+        if value is None:
+            return NotImplemented
+        return self._make(value - self.value)
+
+    def __mul__(self, other) -> 'ModInt':
+        """乘法"""
+        value = self._coerce(other)
+        if value is None:
+            return NotImplemented
+        return self._make(self.value * value)
+
+    def __rmul__(self, other) -> 'ModInt':
+        """右乘法"""
+        return self.__mul__(other)
+
+    def __truediv__(self, other) -> 'ModInt':
+        """除法, 乘以逆元"""
+        value = self._coerce(other)
+        if value is None:
+            return NotImplemented
+        return self._make(self.value * mod_inverse(value, self.modulus))
+
+    def __rtruediv__(self, other) -> 'ModInt':
+        """右除法"""
+        value = self._coerce(other)
+        if value is None:
+            return NotImplemented
+        return self._make(value * mod_inverse(self.value, self.modulus))
+
+    def __pow__(self, other) -> 'ModInt':
+        """乘方, 负指数表示逆元的乘方"""
+        if not isinstance(other, int):
+            return NotImplemented
+        if other < 0:
+            return self._make(pow(mod_inverse(self.value, self.modulus), -other, self.modulus))
+        return self._make(pow(self.value, other, self.modulus))
+
+    def inverse(self) -> 'ModInt':
+        """逆元"""
+        return self._make(mod_inverse(self.value, self.modulus))
+
+
+# 分段筛每段包含的奇数个数, 每段占用的内存就是这么多字节
+SEGMENT_SIZE = 1 << 20
+
+
+def _small_primes(limit) -> list:
+    """用埃氏筛求不超过limit的所有质数"""
+    if limit < 2:
+        return []
+
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[0] = sieve[1] = 0
+    for i in range(2, isqrt(limit) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes((limit - i * i) // i + 1)
+
+    return list(compress(range(limit + 1), sieve))
+
+
+def _sieve_segment(low, high, base_primes) -> list:
+    """
+    筛出区间[low, high)内的质数
+    base_primes必须包含所有不超过sqrt(high)的质数
+    只筛奇数, 第i个字节对应low + 2i
+    """
+    primes = []
+    if low <= 2 < high:
+        primes.append(2)
+    if low % 2 == 0:
+        low += 1
+    if low >= high:
+        return primes
+
+    size = (high - low + 1) // 2
+    segment = bytearray([1]) * size
+    for p in base_primes:
+        if p == 2:
+            continue
+        if p * p >= high:
+            break
+        start = max(p * p, (low + p - 1) // p * p)
+        if start % 2 == 0:
+            start += p
+        index = (start - low) // 2
+        if index < size:
+            segment[index::p] = bytes((size - 1 - index) // p + 1)
+    if low == 1:
+        segment[0] = 0
+
+    primes.extend(compress(range(low, high, 2), segment))
+    return primes
+
+
+def _iter_segments(low, high=None, segment_size=SEGMENT_SIZE):
+    """
+    逐段筛出区间[low, high)内的质数, 每次生成一段的质数列表
+    high为None时无限生成下去
+    """
+    low = max(low, 2)
+    span = 2 * segment_size
+    base_limit = 0
+    base_primes = []
+    while high is None or low < high:
+        segment_high = low + span if high is None else min(low + span, high)
+        needed = isqrt(segment_high - 1)
+        if needed > base_limit:
+            base_limit = needed if high is not None else max(needed, 2 * base_limit)
+            base_primes = _small_primes(base_limit)
+        yield _sieve_segment(low, segment_high, base_primes)
+        low = segment_high
+
+
+def primes_up_to(n) -> list:
+    """不超过n的所有质数"""
+    if not isinstance(n, int):
+        raise ValueError("Input number must be integer")
+
+    return primes_between(2, n)
+
+
+def primes_between(a, b) -> list:
+    """闭区间[a, b]内的所有质数"""
+    if not isinstance(a, int) or not isinstance(b, int):
+        raise ValueError("Input numbers must be integers")
+
+    primes = []
+    for segment in _iter_segments(a, b + 1):
+        primes.extend(segment)
+    return primes
+
+
+def iter_primes(start=2):
+    """从start开始依次生成质数, 内存占用只和分段大小有关"""
+    if not isinstance(start, int):
+        raise ValueError("Input number must be integer")
+
+    for segment in _iter_segments(start):
+        yield from segment
+
+
+def prime_pi(x) -> int:
+    """
+    质数计数函数, 不超过x的质数个数
+    Lucy_Hedgehog算法: 只维护S(v)(v取x // i的所有值), 时间O(x^(3/4)), 内存O(sqrt(x))
+    small[i] = S(i), large[i] = S(x // i), 每个质数p把S(v)减去S(v // p) - S(p - 1)
+    """
+    if not isinstance(x, int):
+        raise ValueError("Input number must be integer")
+    if x < 2:
+        return 0
+
+    r = isqrt(x)
+    if np is not None:
+        small = np.arange(-1, r, dtype=np.int64)
+        small[0] = 0
+        large = np.zeros(r + 1, dtype=np.int64)
+        large[1:] = x // np.arange(1, r + 1, dtype=np.int64) - 1
+    else:
+        small = list(range(-1, r))
+        small[0] = 0
+        large = [0] + [x // i - 1 for i in range(1, r + 1)]
+
+    for sp, p in enumerate(primes_up_to(r)):
+        p2 = p * p
+        lim = min(r, x // p2)
+        border = min(lim, r // p)
+        if np is not None:
+            large[1:border + 1] -= large[p:border * p + 1:p] - sp
+            if lim > border:
+                i = np.arange(border + 1, lim + 1, dtype=np.int64)
+                large[border + 1:lim + 1] -= small[x // (i * p)] - sp
+            if p2 <= r:
+                small[p2:] -= small[np.arange(p2, r + 1) // p] - sp
+        else:
+            large[1:border + 1] = [a - b + sp for a, b in zip(large[1:border + 1], large[p:border * p + 1:p])]
+            large[border + 1:lim + 1] = [a - small[x // (i * p)] + sp
+                                         for i, a in zip(range(border + 1, lim + 1), large[border + 1:lim + 1])]
+            if p2 <= r:
+                small[p2:] = [v - small[i // p] + sp for i, v in zip(range(p2, r + 1), small[p2:])]
+
+    return int(large[1])
+
+
+def nth_prime(k) -> int:
+    """
+    第k个质数(从1开始)
+    先用渐近公式估计位置, 用prime_pi数出估计值之前的质数个数, 再用分段筛补上差的部分
+    """
+    if not isinstance(k, int):
+        raise ValueError("Input number must be integer")
+    if k < 1:
+        raise ValueError("Input number must be greater than 0")
+    if k <= len(p_numbers):
+        return p_numbers[k - 1]
+
+    log_k = log(k)
+    log_log_k = log(log_k)
+    x = int(k * (log_k + log_log_k - 1 + (log_log_k - 2) / log_k))
+    count = prime_pi(x)
+    if count < k:
+        return next(islice(iter_primes(x + 1), k - count - 1, None))
+
+    # 估计值偏大, 从x往回数出多出来的count - k个质数
+    excess = count - k
+    high = x
+    while True:
+        low = max(2, high - 2 * SEGMENT_SIZE)
+        primes = primes_between(low, high)
+        if len(primes) > excess:
+            return primes[len(primes) - 1 - excess]
+        excess -= len(primes)
+        high = low - 1
+
+
+# 并行筛时子进程中共享的基础质数
+_worker_shm = None
+_worker_base_primes = None
+
+
+def _init_sieve_worker(name, count) -> None:
+    """子进程初始化: 连接到存放基础质数的共享内存"""
+    global _worker_shm, _worker_base_primes
+    _worker_shm = shared_memory.SharedMemory(name=name)
+    _worker_base_primes = _worker_shm.buf.cast('Q')[:count]
+
+
+def _sieve_task(low, high) -> array:
+    """子进程中筛出[low, high)内的质数"""
+    return array('Q', _sieve_segment(low, high, _worker_base_primes))
+
+
+def parallel_prime_segments(a, b, workers=None, segment_size=SEGMENT_SIZE):
+    """
+    用多个进程并行筛出闭区间[a, b]内的质数, 按顺序逐段生成uint64数组
+    基础质数只筛一次, 放在共享内存里给所有子进程使用
+    同时在筛的段数不超过进程数的两倍, 结果不会在内存里堆积
+    """
+    if not isinstance(a, int) or not isinstance(b, int):
+        raise ValueError("Input numbers must be integers")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif not isinstance(workers, int) or workers < 1:
+        raise ValueError("Number of workers must be a positive integer")
+    low = max(a, 2)
+    if low > b:
+        return
+
+    base_primes = array('Q', primes_up_to(isqrt(b)))
+    shm = shared_memory.SharedMemory(create=True, size=max(8, 8 * len(base_primes)))
+    executor = None
+    try:
+        shm.buf[:8 * len(base_primes)] = base_primes.tobytes()
+        executor = ProcessPoolExecutor(workers, initializer=_init_sieve_worker,
+                                       initargs=(shm.name, len(base_primes)))
+        span = 2 * segment_size
+        pending = deque()
+        for start in range(low, b + 1, span):
+            pending.append(executor.submit(_sieve_task, start, min(start + span, b + 1)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        shm.close()
+        shm.unlink()
+
+
+def parallel_primes_between(a, b, workers=None, segment_size=SEGMENT_SIZE):
+    """用多个进程并行筛出闭区间[a, b]内的质数, 按从小到大的顺序逐个生成"""
+    for segment in parallel_prime_segments(a, b, workers, segment_size):
+        yield from segment
+
+
+# 质数表文件头: 魔数, 质数个数, 上界(所有小于上界的质数都在表中)
+_TABLE_HEADER = struct.Struct('<8sQQ')
+_TABLE_MAGIC = b'MTPRIME1'
+# 新建质数表时预先筛好的范围
+_TABLE_INITIAL_LIMIT = 1 << 16
+
+
+@contextmanager
+def _file_lock(path, shared=False):
+    """对path对应的锁文件加锁, 用于多进程之间互斥"""
+    with open(path, 'a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _pack_primes(primes) -> bytes:
+    """把质数打包成小端uint64"""
+    data = array('Q', primes)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _cache_directory() -> Path:
+    """用户缓存目录: $XDG_CACHE_HOME, Windows上是%LOCALAPPDATA%, 否则是~/.cache"""
+    directory = os.environ.get('XDG_CACHE_HOME')
+    if not directory and os.name == 'nt':
+        directory = os.environ.get('LOCALAPPDATA')
+    return Path(directory) if directory else Path.home() / '.cache'
+
+
+class PrimeTable:
+    """
+    二进制质数表
+    文件头之后是升序排列的小端uint64质数, 以只读方式内存映射, 打开时不需要解析
+    追加质数时持有文件锁, 先写数据再更新文件头, 多个进程可以共享同一个表
+    """
+
+    def __init__(self, path=None):
+        """
+        初始化属性path, 文件不存在时新建
+        path为None时使用环境变量MATHEMATICS_PRIME_TABLE, 没有设置时放在用户缓存目录下的mathematics/primes.bin
+        """
+        if path is None:
+            path = os.environ.get('MATHEMATICS_PRIME_TABLE')
+            if path is None:
+                path = _cache_directory() / 'mathematics' / 'primes.bin'
+                path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = Path(path).resolve()
+        self._lock_path = self.path.with_name(self.path.name + '.lock')
+        self._mmap = None
+        self._view = None
+        self._count = 0
+        self._limit = 0
+        if not self.path.exists():
+            self._create()
+        self.refresh()
+
+    def _create(self) -> None:
+        """原子地新建质数表"""
+        with _file_lock(self._lock_path):
+            if self.path.exists():
+                return
+            temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            primes = primes_up_to(_TABLE_INITIAL_LIMIT - 1)
+            with open(temp_path, 'wb') as f:
+                f.write(_TABLE_HEADER.pack(_TABLE_MAGIC, len(primes), _TABLE_INITIAL_LIMIT))
+                f.write(_pack_primes(primes))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+
+    def refresh(self) -> None:
+        """重新映射文件, 读到其他进程追加的质数"""
+        with _file_lock(self._lock_path, shared=True):
+            with open(self.path, 'rb') as f:
+                magic, count, limit = _TABLE_HEADER.unpack(f.read(_TABLE_HEADER.size))
+                if magic != _TABLE_MAGIC:
+                    raise ValueError(f"{self.path} is not a prime table")
+                if count == self._count and self._mmap is not None:
+                    self._limit = limit
+                    return
+                self.close()
+                self._mmap = mmap.mmap(f.fileno(), _TABLE_HEADER.size + 8 * count, access=mmap.ACCESS_READ)
+        data = memoryview(self._mmap)[_TABLE_HEADER.size:]
+        if sys.byteorder == 'little':
+            self._view = data.cast('Q')
+        else:
+            self._view = array('Q', data)
+            self._view.byteswap()
+            data.release()
+        self._count = count
+        self._limit = limit
+
+    def close(self) -> None:
+        """释放内存映射"""
+        if isinstance(self._view, memoryview):
+            self._view.release()
+        self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> 'PrimeTable':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def limit(self) -> int:
+        """所有小于limit的质数都在表中"""
+        return self._limit
+
+    def __len__(self) -> int:
+        """表中质数的个数"""
+        return self._count
+
+    def __getitem__(self, index):
+        """第index个质数(从0开始), 切片返回列表"""
+        if isinstance(index, slice):
+            return self._view[index].tolist()
+        return self._view[index]
+
+    def __iter__(self):
+        """依次生成表中的质数"""
+        return iter(self._view)
+
+    def __contains__(self, integer) -> bool:
+        """判断integer是否为质数, integer必须小于limit"""
+        if integer >= self._limit:
+            raise ValueError("Input number is beyond the limit of the prime table")
+        index = bisect_left(self._view, integer)
+        return index < self._count and self._view[index] == integer
+
+    def index(self, prime) -> int:
+        """质数prime在表中的下标"""
+        index = bisect_left(self._view, prime)
+        if index == self._count or self._view[index] != prime:
+            raise ValueError(f"{prime} is not in the prime table")
+        return index
+
+    def primes_up_to(self, n) -> list:
+        """不超过n的所有质数, 必要时先扩充质数表"""
+        self.extend(n + 1)
+        return self[:bisect_right(self._view, n)]
+
+    def _append(self, segments) -> None:
+        """
+        在锁内追加质数, segments接收当前的上界, 生成(质数列表, 新上界)
+        中途失败时文件头不变, 多写的数据会在下次追加时被截掉
+        """
+        with _file_lock(self._lock_path):
+            with open(self.path, 'r+b') as f:
+                magic, count, limit = _TABLE_HEADER.unpack(f.read(_TABLE_HEADER.size))
+                f.seek(_TABLE_HEADER.size + 8 * count)
+                f.truncate()
+                for primes, new_limit in segments(limit):
+                    f.write(_pack_primes(primes))
+                    count += len(primes)
+                    limit = new_limit
+                f.flush()
+                os.fsync(f.fileno())
+                f.seek(0)
+                f.write(_TABLE_HEADER.pack(magic, count, limit))
+                f.flush()
+                os.fsync(f.fileno())
+        self.refresh()
+
+    def extend(self, limit) -> None:
+        """把质数表扩充到包含所有小于limit的质数"""
+        if limit <= self._limit:
+            return
+
+        def segments(old_limit):
+            for primes in _iter_segments(old_limit, limit):
+                yield primes, limit
+
+        self._append(segments)
+
+    def grow(self, count) -> list:
+        """在表的末尾追加count个新质数, 返回新追加的质数"""
+        new_primes = []
+
+        def segments(old_limit):
+            new_primes.extend(islice(iter_primes(old_limit), count))
+            if new_primes:
+                yield new_primes, new_primes[-1] + 1
+
+        self._append(segments)
+        return new_primes
+
+
+_default_prime_table = None
+
+
+def default_prime_table() -> PrimeTable:
+    """当前进程共享的默认质数表"""
+    global _default_prime_table
+    if _default_prime_table is None:
+        _default_prime_table = PrimeTable()
+    return _default_prime_table
+
+
+def find_prime_number(count=100) -> list:
+    """寻找质数, 在默认质数表后追加count个质数"""
+    return default_prime_table().grow(count)
+
+
+# 试除法用到的质数上界, 更大的因子交给Pollard rho
+_TRIAL_LIMIT = 1 << 12
+_TRIAL_PRIMES = primes_up_to(_TRIAL_LIMIT)
+# 以前13个质数为底的Miller-Rabin检验对小于3.3*10^24的数是确定性的
+_MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_MILLER_RABIN_LIMIT = 3317044064679887385961981
+# 超过上面的范围时额外检验的随机底数个数
+_MILLER_RABIN_ROUNDS = 16
+
+
+def _miller_rabin(integer, bases) -> bool:
+    """以bases为底做Miller-Rabin检验, integer为大于bases的奇数"""
+    d = integer - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for a in bases:
+        x = pow(a, d, integer)
+        if x == 1 or x == integer - 1:
+            continue
+        for i in range(s - 1):
+            x = x * x % integer
+            if x == integer - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime(integer) -> bool:
+    """
+    判断质数
+    小于3.3*10^24(包括所有64位整数)时结果是确定的, 更大的数再加随机底数检验
+    """
+    if not isinstance(integer, int):
+        raise ValueError("Input number must be integer")
+    if integer < 2:
+        return False
+
+    for p in p_numbers:
+        if integer % p == 0:
+            return integer == p
+    if integer < 101 * 101:
+        return True
+
+    if not _miller_rabin(integer, _MILLER_RABIN_BASES):
+        return False
+    if integer < _MILLER_RABIN_LIMIT:
+        return True
+    return _miller_rabin(integer, [randrange(2, integer - 1) for i in range(_MILLER_RABIN_ROUNDS)])
+
+
+def _pollard_brent(integer) -> int:
+    """Brent改进的Pollard rho算法, 返回奇合数integer的一个非平凡因子"""
+    while True:
+        y = randrange(1, integer)
+        c = randrange(1, integer)
+        m = 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for i in range(r):
+                y = (y * y + c) % integer
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for i in range(min(m, r - k)):
+                    y = (y * y + c) % integer
+                    q = q * abs(x - y) % integer
+                g = _gcd(q, integer)
+                k += m
+            r *= 2
+
+        if g == integer:
+            # 一批里乘进了所有因子, 回退到上一批逐步求gcd
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % integer
+                g = _gcd(abs(x - ys), integer)
+        if g != integer:
+            return g
+
+
+def _integer_root(integer, k) -> int:
+    """integer的k次方根向下取整, 牛顿迭代"""
+    x = 1 << -(-integer.bit_length() // k)
+    while True:
+        y = ((k - 1) * x + integer // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+
+def _perfect_power(integer) -> tuple:
+    """
+    integer是完全幂r^k(k > 1)时返回(r, k), 否则返回(integer, 1)
+    Pollard rho找出p^k的因子p需要约sqrt(p)步, 先开方可以避免在大质数的幂上耗时
+    """
+    for k in primes_up_to(integer.bit_length()):
+        root = _integer_root(integer, k)
+        if root ** k == integer:
+            r, j = _perfect_power(root)
+            return r, j * k
+    return integer, 1
+
+
+def prime_factorization(integer) -> dict:
+    """
+    质因数分解
+    先用小质数试除, 剩下的部分用Miller-Rabin判断质数, 用Pollard rho分解合数
+    返回按质数从小到大排列的字典{质数: 次数}
+    """
+
+    if not isinstance(integer, int):
+        raise ValueError("Input number must be integer")
+    if integer <= 1:
+        raise ValueError("Input number must be greater than 1")
+    
+    facted_p_numbers = {}
+
+    for p in _TRIAL_PRIMES:
+        if p * p > integer:
+            break
+        if integer % p == 0:
+            time = 0
+            while integer % p == 0:
+                integer //= p
+                time += 1
+            facted_p_numbers[p] = time
+    else:
+        factors = []
+        stack = [integer] if integer > 1 else []
+        while stack:
+            n = stack.pop()
+            if is_prime(n):
+                factors.append(n)
+                continue
+            root, k = _perfect_power(n)
+            if k > 1:
+                stack.extend([root] * k)
+            else:
+                d = _pollard_brent(n)
+                stack.append(d)
+                stack.append(n // d)
+        for p in sorted(factors):
+            facted_p_numbers[p] = facted_p_numbers.get(p, 0) + 1
+        return facted_p_numbers
+
+    if integer > 1:
+        facted_p_numbers[integer] = facted_p_numbers.get(integer, 0) + 1
+    
+    return facted_p_numbers
+
+
+def _divisors_from_factorization(factorization) -> list:
+    """由质因数分解{质数: 次数}得到所有因子(未排序)"""
+    divs = [1]
+    for p, time in factorization.items():
+        divs = [d * power for d in divs for power in _powers(p, time)]
+    return divs
+
+
+def _powers(p, time) -> list:
+    """p的0到time次幂"""
+    powers = [1]
+    for i in range(time):
+        powers.append(powers[-1] * p)
+    return powers
+
+
+# 建最小质因数表时每次处理的块大小
+_SPF_CHUNK = 1 << 20
+
+
+class SPFTable:
+    """
+    最小质因数表
+    spf[n]是n的最小质因数, 分解n只需要O(log n)次查表
+    表存放在uint32数组中, shared为True时放在共享内存里, 其他进程可以用attach直接使用
+    """
+
+    def __init__(self, limit, shared=False):
+        """建立不超过limit的最小质因数表"""
+        if not isinstance(limit, int):
+            raise ValueError("Input number must be integer")
+        if not 1 <= limit < 1 << 32:
+            raise ValueError("Limit must be between 1 and 2**32 - 1")
+
+        self.limit = limit
+        self._shm = None
+        self._totients = self._mobius = None
+        if shared:
+            self._shm = shared_memory.SharedMemory(create=True, size=4 * (limit + 1))
+            self._spf = self._shm.buf.cast('I')
+        else:
+            self._spf = array('I', [0]) * (limit + 1)
+        self._build()
+
+    def _build(self) -> None:
+        """
+        分块筛出最小质因数
+        每块先填入n本身, 再按从大到小的顺序用质数p标记p*p之后的倍数, 最后留下的就是最小质因数
+        """
+        spf = self._spf
+        base_primes = primes_up_to(isqrt(self.limit))[::-1]
+        for low in range(0, self.limit + 1, _SPF_CHUNK):
+            high = min(low + _SPF_CHUNK, self.limit + 1)
+            spf[low:high] = array('I', range(low, high))
+            for p in base_primes:
+                start = max(p * p, (low + p - 1) // p * p)
+                if start < high:
+                    spf[start:high:p] = array('I', [p]) * ((high - 1 - start) // p + 1)
+
+    @classmethod
+    def attach(cls, name, limit) -> 'SPFTable':
+        """连接到其他进程建立在共享内存name中的表"""
+        table = cls.__new__(cls)
+        table.limit = limit
+        table._totients = table._mobius = None
+        table._shm = shared_memory.SharedMemory(name=name)
+        table._spf = table._shm.buf.cast('I')[:limit + 1]
+        return table
+
+    @classmethod
+    def _from_array(cls, limit, spf) -> 'SPFTable':
+        """由已有的数组恢复表, 用于pickle"""
+        table = cls.__new__(cls)
+        table.limit = limit
+        table._totients = table._mobius = None
+        table._shm = None
+        table._spf = spf
+        return table
+
+    def __reduce__(self):
+        """共享内存中的表在pickle时只传递名字"""
+        if self._shm is not None:
+            return SPFTable.attach, (self._shm.name, self.limit)
+        return SPFTable._from_array, (self.limit, self._spf)
+
+    @property
+    def name(self):
+        """共享内存的名字, 不在共享内存中时为None"""
+        return None if self._shm is None else self._shm.name
+
+    @property
+    def buffer(self) -> memoryview:
+        """表的只读缓冲区, 可以不经复制地交给NumPy等使用"""
+        return memoryview(self._spf).toreadonly()
+
+    def close(self) -> None:
+        """断开与共享内存的连接"""
+        if self._shm is not None:
+            self._spf.release()
+            self._spf = None
+            self._shm.close()
+
+    def unlink(self) -> None:
+        """释放共享内存, 只应由建表的进程调用一次"""
+        if self._shm is not None:
+            self._shm.unlink()
+
+    def __enter__(self) -> 'SPFTable':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __getitem__(self, integer) -> int:
+        """integer的最小质因数"""
+        return self._spf[integer]
+
+    def _check(self, integer) -> None:
+        """检查integer在表的范围内"""
+        if not isinstance(integer, int):
+            raise ValueError("Input number must be integer")
+        if not 1 <= integer <= self.limit:
+            raise ValueError("Input number must be between 1 and the limit of the table")
+
+    def factorize(self, integer) -> dict:
+        """质因数分解, 返回{质数: 次数}, 1的分解为空字典"""
+        self._check(integer)
+        spf = self._spf
+        facted_p_numbers = {}
+        while integer > 1:
+            p = spf[integer]
+            integer //= p
+            time = 1
+            while spf[integer] == p:
+                integer //= p
+                time += 1
+            facted_p_numbers[p] = time
+        return facted_p_numbers
+
+    def factorize_many(self, integers):
+        """依次分解integers中的每个数"""
+        factorize = self.factorize
+        for integer in integers:
+            yield factorize(integer)
+
+    def factorize_range(self, start, stop):
+        """依次分解range(start, stop)中的每个数"""
+        return self.factorize_many(range(start, stop))
+
+    def divisors(self, integer) -> list:
+        """所有因子(从小到大)"""
+        return sorted(_divisors_from_factorization(self.factorize(integer)))
+
+    def totient(self, integer) -> int:
+        """欧拉函数"""
+        self._check(integer)
+        spf = self._spf
+        result = integer
+        while integer > 1:
+            p = spf[integer]
+            result -= result // p
+            while integer % p == 0:
+                integer //= p
+        return result
+
+    def mobius(self, integer) -> int:
+        """莫比乌斯函数"""
+        self._check(integer)
+        spf = self._spf
+        result = 1
+        while integer > 1:
+            p = spf[integer]
+            integer //= p
+            if spf[integer] == p:
+                return 0
+            result = -result
+        return result
+
+    def divisors_many(self, integers):
+        """依次求integers中每个数的所有因子"""
+        for integer in integers:
+            yield self.divisors(integer)
+
+    def _build_multiplicative(self) -> None:
+        """
+        由最小质因数表一次算出1到limit的欧拉函数表和莫比乌斯函数表
+        n = p * m (p = spf[n]): p整除m时phi(n) = phi(m) * p, mu(n) = 0, 否则phi(n) = phi(m) * (p - 1), mu(n) = -mu(m)
+        有NumPy时按[low, 2 * low)分块向量化, 块内用到的m都小于low, 已经算好
+        """
+        limit = self.limit
+        if np is not None:
+            spf = np.frombuffer(self._spf, dtype=np.uint32, count=limit + 1)
+            totients = np.zeros(limit + 1, dtype=np.uint32)
+            mobius = np.zeros(limit + 1, dtype=np.int8)
+            totients[1] = mobius[1] = 1
+            low = 2
+            while low <= limit:
+                high = min(2 * low, limit + 1)
+                p = spf[low:high]
+                m = np.arange(low, high, dtype=np.uint32) // p
+                divisible = spf[m] == p
+                totients[low:high] = totients[m] * np.where(divisible, p, p - 1)
+                mobius[low:high] = np.where(divisible, 0, -mobius[m])
+                low = high
+            self._totients = array('I', totients.tobytes())
+            self._mobius = array('b', mobius.tobytes())
+            return
+        spf = self._spf
+        totients = array('I', [0]) * (limit + 1)
+        mobius = array('b', [0]) * (limit + 1)
+        totients[1] = mobius[1] = 1
+        for n in range(2, limit + 1):
+            p = spf[n]
+            m = n // p
+            if spf[m] == p:
+                totients[n] = totients[m] * p
+            else:
+                totients[n] = totients[m] * (p - 1)
+                mobius[n] = -mobius[m]
+        self._totients, self._mobius = totients, mobius
+
+    def _lookup_many(self, integers, table, function, typecode) -> array:
+        """表范围内的数直接查表, 范围外的用function逐个计算"""
+        if np is not None and isinstance(integers, np.ndarray):
+            if integers.size and integers.dtype.kind in 'iu' and integers.min() >= 1 and integers.max() <= self.limit:
+                values = np.frombuffer(table, dtype=np.uint32 if typecode == 'Q' else np.int8)[integers]
+                return array(typecode, values.astype(np.uint64 if typecode == 'Q' else np.int8).tobytes())
+            integers = integers.tolist()
+        limit = self.limit
+        return array(typecode, [table[n] if isinstance(n, int) and 1 <= n <= limit else function(n) for n in integers])
+
+    def totient_many(self, integers) -> array:
+        """integers中每个数的欧拉函数, 第一次调用时建出整张欧拉函数表, 超出范围的数单独分解"""
+        if self._totients is None:
+            self._build_multiplicative()
+        return self._lookup_many(integers, self._totients, _totient, 'Q')
+
+    def mobius_many(self, integers) -> array:
+        """integers中每个数的莫比乌斯函数, 第一次调用时建出整张莫比乌斯函数表, 超出范围的数单独分解"""
+        if self._mobius is None:
+            self._build_multiplicative()
+        return self._lookup_many(integers, self._mobius, _mobius, 'b')
+
+
+def _factorization(integer) -> dict:
+    """检查输入并做质因数分解, 1的分解为空字典"""
+    if not isinstance(integer, int):
+        raise ValueError("Input number must be integer")
+    if integer <= 0:
+        raise ValueError("Input number must be greater than 0")
+
+    if integer == 1:
+        return {}
+    return prime_factorization(integer)
+
+
+def _totient(integer) -> int:
+    """由质因数分解求欧拉函数"""
+    result = integer
+    for p in _factorization(integer):
+        result -= result // p
+    return result
+
+
+def _mobius(integer) -> int:
+    """由质因数分解求莫比乌斯函数"""
+    factorization = _factorization(integer)
+    if any(time > 1 for time in factorization.values()):
+        return 0
+    return -1 if len(factorization) % 2 else 1
+
+
+def divisors(integer, sort=True) -> list:
+    """所有因子, 由质因数分解直接组合出来, sort为False时不排序"""
+    divs = _divisors_from_factorization(_factorization(integer))
+    if sort:
+        divs.sort()
+    return divs
+
+
+def iter_divisors(integer):
+    """
+    逐个生成所有因子(不排序)
+    按各质数的次数像里程表一样进位, 只保存当前的次数, 不会把所有因子放进列表
+    """
+    factors = list(_factorization(integer).items())
+    times = [0] * len(factors)
+    divisor = 1
+    yield divisor
+    while True:
+        for i, (p, time) in enumerate(factors):
+            if times[i] < time:
+                times[i] += 1
+                divisor *= p
+                break
+            divisor //= p ** time
+            times[i] = 0
+        else:
+            return
+        yield divisor
+
+
+def divisor_count(integer) -> int:
+    """因子个数"""
+    count = 1
+    for time in _factorization(integer).values():
+        count *= time + 1
+    return count
+
+
+def divisor_sum(integer, k=1) -> int:
+    """因子的k次幂之和sigma_k"""
+    if not isinstance(k, int) or k < 0:
+        raise ValueError("k must be a non-negative integer")
+
+    if k == 0:
+        return divisor_count(integer)
+
+    total = 1
+    for p, time in _factorization(integer).items():
+        q = p ** k
+        total *= (q ** (time + 1) - 1) // (q - 1)
+    return total
+
+
+def _iterate(start, function, time):
+    """依次生成start, function(start), ..., 共time + 1个值"""
+    yield start
+    for i in range(time):
+        start = function(start)
+        yield start
+
+
+def _iterate_last(start, function, time, memo):
+    """
+    只返回第time次迭代的结果
+    memo为正整数时记住最近memo个状态及其步数, 再次遇到时说明进入了周期, 直接跳过整圈
+    """
+    if not memo:
+        for i in range(time):
+            start = function(start)
+        return start
+
+    seen = OrderedDict()
+    for i in range(time):
+        if start in seen:
+            period = i - seen[start]
+            for j in range((time - i) % period):
+                start = function(start)
+            return start
+        seen[start] = i
+        if len(seen) > memo:
+            seen.popitem(last=False)
+        start = function(start)
+    return start
+
+
+def iteration(start, function, time, mode='list', memo=None):
+    """
+    迭代
+    mode为'list'时返回[start, function(start), ..., 第time次迭代的值]
+    mode为'iter'时返回生成器, 为'last'时只返回最后一个值, 内存占用都是O(1)
+    memo只用于'last', 记住最近memo个状态(状态必须可哈希), 发现周期后提前结束
+    """
+    if not isinstance(time, int) or time < 0:
+        raise ValueError("Time must be a non-negative integer")
+    if memo is not None and mode != 'last':
+        raise ValueError("memo is only supported in 'last' mode")
+
+    if mode == 'list':
+        return list(_iterate(start, function, time))
+    if mode == 'iter':
+        return _iterate(start, function, time)
+    if mode == 'last':
+        return _iterate_last(start, function, time, memo)
+    raise ValueError("mode must be 'list', 'iter' or 'last'")
+
+
+def find_cycle(start, function, method='brent', max_steps=None) -> tuple:
+    """
+    用Brent或Floyd算法找出迭代序列的周期, 内存占用O(1)
+    返回(mu, lam): 第mu次迭代第一次进入周期, 周期长度为lam
+    max_steps不为None时, 超过这么多次迭代还没找到周期就抛出ValueError
+    """
+    steps = 0
+
+    def step(x):
+        nonlocal steps
+        steps += 1
+        if max_steps is not None and steps > max_steps:
+            raise ValueError("No cycle found within max_steps")
+        return function(x)
+
+    if method == 'brent':
+        power = lam = 1
+        tortoise = start
+        hare = step(start)
+        while tortoise != hare:
+            if power == lam:
+                tortoise = hare
+                power *= 2
+                lam = 0
+            hare = step(hare)
+            lam += 1
+
+        tortoise = hare = start
+        for i in range(lam):
+            hare = step(hare)
+        mu = 0
+        while tortoise != hare:
+            tortoise = step(tortoise)
+            hare = step(hare)
+            mu += 1
+        return mu, lam
+
+    if method == 'floyd':
+        tortoise = step(start)
+        hare = step(step(start))
+        while tortoise != hare:
+            tortoise = step(tortoise)
+            hare = step(step(hare))
+
+        mu = 0
+        tortoise = start
+        while tortoise != hare:
+            tortoise = step(tortoise)
+            hare = step(hare)
+            mu += 1
+
+        lam = 1
+        hare = step(tortoise)
+        while tortoise != hare:
+            hare = step(hare)
+            lam += 1
+        return mu, lam
+
+    raise ValueError("method must be 'brent' or 'floyd'")
@@ -0,0 +1,80 @@
+"""linear_algebra测试的公共部分: 朴素参考实现, 以及在NumPy后端, 纯Python后端和没有NumPy时分别运行的基类"""
+
+
+import random
+import unittest
+
+from mathematics import linear_algebra
+from mathematics.linear_algebra import CSRMatrix, Matrix
+
+
+def random_rows(rows, columns, seed, low=-1.0, high=1.0):
+    rng = random.Random(seed)
+    return [[rng.uniform(low, high) for j in range(columns)] for i in range(rows)]
+
+
+def matmul(a, b):
+    return [[sum(a[i][k] * b[k][j] for k in range(len(b))) for j in range(len(b[0]))] for i in range(len(a))]
+
+
+def transpose(a):
+    return [list(column) for column in zip(*a)]
+
+
+def identity(n):
+    return [[float(i == j) for j in range(n)] for i in range(n)]
+
+
+def determinant(a):
+    """按第一行展开"""
+    if len(a) == 1:
+        return a[0][0]
+    return sum((-1) ** j * a[0][j] * determinant([row[:j] + row[j + 1:] for row in a[1:]]) for j in range(len(a)))
+
+
+def symmetric(n, seed):
+    a = random_rows(n, n, seed)
+    return [[a[i][j] + a[j][i] for j in range(n)] for i in range(n)]
+
+
+def poisson(side):
+    """二维Poisson方程的五点差分矩阵, 对称正定"""
+    triplets = []
+    for i in range(side):
+        for j in range(side):
+            k = i * side + j
+            triplets.append((k, k, 4.0))
+            for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                if 0 <= i + di < side and 0 <= j + dj < side:
+                    triplets.append((k, (i + di) * side + j + dj, -1.0))
+    return CSRMatrix.from_triplets(triplets, (side * side, side * side))
+
+
+class BackendTestCase(unittest.TestCase):
+    """在指定的后端下运行, 'pure'表示模拟没有安装NumPy"""
+
+    backend = 'numpy'
+
+    def setUp(self):
+        self._np = linear_algebra.np
+        if self.backend == 'numpy' and self._np is None:
+            self.skipTest('NumPy is not installed')
+        linear_algebra.set_backend('numpy' if self.backend == 'numpy' else 'python')
+        if self.backend == 'pure':
+            linear_algebra.np = None
+
+    def tearDown(self):
+        linear_algebra.np = self._np
+        linear_algebra.set_backend('numpy' if self._np is not None else 'python')
+
+    def assertRowsAlmostEqual(self, actual, expected, tol=1e-8):
+        actual = actual.matrix if isinstance(actual, Matrix) else actual
+        expected = expected.matrix if isinstance(expected, Matrix) else expected
+        self.assertEqual(len(actual), len(expected))
+        for row, expected_row in zip(actual, expected):
+            self.assertEqual(len(row), len(expected_row))
+            for x, y in zip(row, expected_row):
+                self.assertLessEqual(abs(x - y), tol * max(1.0, abs(y)))
+
+    def assertVectorAlmostEqual(self, actual, expected, tol=1e-8):
+        self.assertRowsAlmostEqual([list(actual)], [list(expected)], tol)
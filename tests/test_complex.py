@@ -0,0 +1,52 @@
+"""复数和复数数组的正确性测试, 与内置complex对比"""
+
+
+import random
+import unittest
+
+from mathematics.number import ComplexArray, ComplexNumber, ImaginaryNumber, RationalNumber
+
+
+class ComplexNumberTest(unittest.TestCase):
+
+    def test_exact(self):
+        z, w = ComplexNumber(RationalNumber(1, 2), 3), ComplexNumber(2, -1)
+        self.assertEqual(z * w, ComplexNumber(4, RationalNumber(11, 2)))
+        self.assertEqual(z / w, ComplexNumber(RationalNumber(-2, 5), RationalNumber(13, 10)))
+        self.assertEqual(abs(ComplexNumber(3, 4)), 5)
+        self.assertEqual(ImaginaryNumber(2) ** 2, -4)
+        self.assertEqual(z.conjugate(), ComplexNumber(RationalNumber(1, 2), -3))
+
+    def test_matches_complex(self):
+        rng = random.Random(0)
+        for _ in range(100):
+            a, b = complex(rng.uniform(-9, 9), rng.uniform(-9, 9)), complex(rng.uniform(-9, 9), rng.uniform(-9, 9))
+            x, y = ComplexNumber(a.real, a.imag), ComplexNumber(b.real, b.imag)
+            for actual, expected in ((x + y, a + b), (x - y, a - b), (x * y, a * b), (x / y, a / b)):
+                self.assertAlmostEqual(complex(actual), expected)
+
+    def test_hash(self):
+        self.assertEqual(ComplexNumber(RationalNumber(1, 2), 3), complex(0.5, 3))
+        self.assertEqual(hash(ComplexNumber(2, 0)), hash(2))
+        self.assertEqual(hash(ComplexNumber(RationalNumber(1, 2), 3)), hash(complex(0.5, 3)))
+
+
+class ComplexArrayTest(unittest.TestCase):
+
+    def test_elementwise(self):
+        rng = random.Random(1)
+        a = [complex(rng.uniform(-9, 9), rng.uniform(-9, 9)) for _ in range(100)]
+        b = [complex(rng.uniform(-9, 9), rng.uniform(-9, 9)) for _ in range(100)]
+        x, y = ComplexArray(a), ComplexArray(b)
+        self.assertEqual(x.to_list(), a)
+        self.assertEqual(x[3], a[3])
+        for actual, expected in ((x + y, [p + q for p, q in zip(a, b)]), (x - y, [p - q for p, q in zip(a, b)]),
+                                 (x * y, [p * q for p, q in zip(a, b)]), (x.conjugate(), [p.conjugate() for p in a])):
+            for p, q in zip(actual, expected):
+                self.assertAlmostEqual(p, q)
+        for p, q in zip(abs(x), a):
+            self.assertAlmostEqual(p, abs(q))
+
+
+if __name__ == '__main__':
+    unittest.main()
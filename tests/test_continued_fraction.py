@@ -0,0 +1,39 @@
+"""连分数和最佳有理逼近的正确性测试, 与Fraction.limit_denominator对比"""
+
+
+from fractions import Fraction
+import itertools
+import random
+import unittest
+
+from mathematics.number import ContinuedFraction, RationalNumber, RealNumber, best_rational, best_rationals
+
+
+def _fraction(value):
+    return Fraction(value.numerator, value.denominator)
+
+
+class ContinuedFractionTest(unittest.TestCase):
+
+    def test_terms(self):
+        value = ContinuedFraction(RationalNumber(415, 93))
+        self.assertEqual(list(value), [4, 2, 6, 7])
+        self.assertEqual(list(value), [4, 2, 6, 7])
+        self.assertEqual(value.value(), RationalNumber(415, 93))
+        sqrt2 = ContinuedFraction(RealNumber(1, 2, RationalNumber(1, 2)))
+        self.assertEqual(list(itertools.islice(sqrt2, 6)), [1, 2, 2, 2, 2, 2])
+        self.assertEqual(sqrt2.best_rational(1000), RationalNumber(1393, 985))
+
+    def test_best_rational(self):
+        rng = random.Random(1)
+        values = [rng.uniform(-100, 100) for _ in range(200)] + [3.14159265358979, 0.0, 1e-9]
+        for value in values:
+            for max_denominator in (1, 7, 1000, 10 ** 6):
+                expected = Fraction(value).limit_denominator(max_denominator)
+                self.assertEqual(_fraction(best_rational(value, max_denominator)), expected)
+        expected = [Fraction(value).limit_denominator(1000) for value in values]
+        self.assertEqual([_fraction(x) for x in best_rationals(values, 1000).to_rationals()], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
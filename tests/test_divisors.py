@@ -0,0 +1,32 @@
+"""约数和约数函数的正确性测试, 与试除法对比"""
+
+
+import math
+import unittest
+
+from mathematics.number_theory import divisor_count, divisor_sum, divisors
+
+
+def _divisors(n):
+    small = [d for d in range(1, math.isqrt(n) + 1) if n % d == 0]
+    return sorted(set(small + [n // d for d in small]))
+
+
+class DivisorTest(unittest.TestCase):
+
+    def test_divisors(self):
+        for n in list(range(1, 500)) + [720720, 9699690]:
+            expected = _divisors(n)
+            self.assertEqual(divisors(n), expected)
+            self.assertEqual(divisor_count(n), len(expected))
+            self.assertEqual(divisor_sum(n), sum(expected))
+            self.assertEqual(divisor_sum(n, 2), sum(d * d for d in expected))
+
+    def test_large_prime_factor(self):
+        n = 2 ** 3 * ((1 << 61) - 1)
+        self.assertEqual(divisors(n), sorted(d * p for d in (1, 2, 4, 8) for p in (1, (1 << 61) - 1)))
+        self.assertEqual(divisor_count(n), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
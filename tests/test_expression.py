@@ -0,0 +1,72 @@
+"""expression的正确性测试, 代入数值与逐项计算对比"""
+
+
+import random
+import unittest
+
+from mathematics.expression import Expression, Monomial, Polynomial, Var
+
+
+class ExpressionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.x, self.y, self.z = Var('x'), Var('y'), Var('z')
+
+    def _random_monomials(self, rng, count):
+        variables = [self.x, self.y, self.z]
+        return [Monomial(rng.randint(-3, 3) or 1, {v: rng.randint(0, 3) for v in rng.sample(variables, rng.randint(0, 3))})
+                for i in range(count)]
+
+    @staticmethod
+    def _evaluate(monomials, point):
+        return sum(m.value(point) if m.unknowns else m.coefficient for m in monomials)
+
+    def test_matches_evaluation(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            first, second = self._random_monomials(rng, 6), self._random_monomials(rng, 6)
+            p, q = Expression(first), Expression(second)
+            point = {v: rng.randint(-3, 3) for v in (self.x, self.y, self.z)}
+            a, b = self._evaluate(first, point), self._evaluate(second, point)
+            self.assertEqual((p + q).value(point), a + b)
+            self.assertEqual((p - q).value(point), a - b)
+            self.assertEqual((p * q).value(point), a * b)
+            self.assertEqual(p * q, q * p)
+
+    def test_like_terms(self):
+        x, y = self.x, self.y
+        a, b = Monomial(2, {x: 1, y: 2}), Monomial(3, {y: 2, x: 1})
+        self.assertTrue(a.is_similar(b))
+        self.assertEqual(hash(a), hash(Monomial(2, {y: 2, x: 1, self.z: 0})))
+        self.assertEqual(Expression([a, b], 1), Expression([Monomial(5, {x: 1, y: 2})], 1))
+        self.assertEqual(Expression([a]) - a, 0)
+
+    def test_in_place(self):
+        x = self.x
+        total = Expression([])
+        for k in range(100):
+            total += Monomial(1, {x: k % 10})
+        self.assertEqual(total, Expression([Monomial(10, {x: k}) for k in range(10)]))
+        # 运算结果不和操作数共享存储, 原地修改结果不影响操作数
+        a = Expression([Monomial(1, {x: 1})])
+        b = a + Monomial(0, {})
+        b += Monomial(2, {x: 1})
+        self.assertEqual(a, Expression([Monomial(1, {x: 1})]))
+        self.assertEqual(b, Expression([Monomial(3, {x: 1})]))
+
+    def test_monomial_is_immutable(self):
+        m = Monomial(2, {self.x: 1})
+        with self.assertRaises(AttributeError):
+            m.coefficient = 3
+        self.assertEqual(m * 3, Monomial(6, {self.x: 1}))
+        self.assertEqual(m.coefficient, 2)
+
+    def test_polynomial_alignment(self):
+        p = Polynomial([self.y, self.x], {(1, 2): 3})
+        q = Polynomial([self.x], {(2,): 1})
+        self.assertEqual(p * q, Polynomial([self.x, self.y], {(4, 1): 3}))
+        self.assertEqual(p - p, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Miller-Rabin和Pollard rho的正确性测试, 与试除法对比"""
+
+
+import math
+import random
+import unittest
+
+from mathematics.number_theory import is_prime, prime_factorization
+
+
+def _is_prime(n):
+    return n >= 2 and all(n % d for d in range(2, math.isqrt(n) + 1))
+
+
+def _factorize(n):
+    factors, d = {}, 2
+    while d * d <= n:
+        while n % d == 0:
+            factors[d] = factors.get(d, 0) + 1
+            n //= d
+        d += 1
+    if n > 1:
+        factors[n] = factors.get(n, 0) + 1
+    return factors
+
+
+class IsPrimeTest(unittest.TestCase):
+
+    def test_small(self):
+        for n in range(-5, 5000):
+            self.assertEqual(is_prime(n), _is_prime(n))
+
+    def test_large(self):
+        self.assertTrue(is_prime((1 << 61) - 1))
+        self.assertTrue(is_prime((1 << 127) - 1))
+        self.assertFalse(is_prime(561 * 1105))
+        # 对前几个底都是强伪素数的合数
+        self.assertFalse(is_prime(3215031751))
+        self.assertFalse(is_prime(3825123056546413051))
+
+
+class FactorizationTest(unittest.TestCase):
+
+    def test_matches_trial_division(self):
+        rng = random.Random(3)
+        for n in list(range(2, 2000)) + [rng.randrange(2, 10 ** 10) for _ in range(50)]:
+            self.assertEqual(prime_factorization(n), _factorize(n))
+
+    def test_large_factors(self):
+        self.assertEqual(prime_factorization(1000000007 * 998244353), {998244353: 1, 1000000007: 1})
+        self.assertEqual(prime_factorization(2 ** 10 * ((1 << 61) - 1) ** 2), {2: 10, (1 << 61) - 1: 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+"""gcd和lcm的正确性测试, 与math模块对比"""
+
+
+import math
+import random
+import unittest
+
+from mathematics.number_theory import extended_gcd, gcd, gcd_array, gcd_reduce, lcm, lcm_reduce
+
+
+class GcdTest(unittest.TestCase):
+
+    def test_matches_math(self):
+        rng = random.Random(0)
+        for _ in range(500):
+            a, b = rng.randrange(-10 ** 12, 10 ** 12), rng.randrange(1, 10 ** 12)
+            self.assertEqual(gcd(a, b), math.gcd(a, b))
+            self.assertEqual(lcm(a, b), abs(a * b) // math.gcd(a, b))
+            g, x, y = extended_gcd(a, b)
+            self.assertEqual((g, a * x + b * y), (math.gcd(a, b), g))
+
+    def test_reduce(self):
+        rng = random.Random(1)
+        integers = [rng.randrange(1, 10 ** 6) * 6 for _ in range(100)]
+        self.assertEqual(gcd_reduce(integers), math.gcd(*integers))
+        self.assertEqual(lcm_reduce(integers[:10]), math.lcm(*integers[:10]))
+
+    def test_array(self):
+        a, b = [0, 12, -18, 7], [0, 8, 24, 5]
+        self.assertEqual(list(gcd_array(a, b)), [math.gcd(x, y) for x, y in zip(a, b)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""迭代和找周期的正确性测试, 与记录所有状态的朴素做法对比"""
+
+
+import unittest
+
+from mathematics.number_theory import find_cycle, iteration
+
+
+def _function(x):
+    return (x * x + 1) % 255
+
+
+class CycleTest(unittest.TestCase):
+
+    def test_find_cycle(self):
+        seen, x = {}, 0
+        while x not in seen:
+            seen[x] = len(seen)
+            x = _function(x)
+        expected = (seen[x], len(seen) - seen[x])
+        self.assertEqual(find_cycle(0, _function), expected)
+        self.assertEqual(find_cycle(0, _function, method='floyd'), expected)
+        with self.assertRaises(ValueError):
+            find_cycle(0, lambda x: x + 1, max_steps=1000)
+
+
+class IterationTest(unittest.TestCase):
+
+    def test_modes(self):
+        expected = [0]
+        for _ in range(50):
+            expected.append(_function(expected[-1]))
+        self.assertEqual(iteration(0, _function, 50), expected)
+        self.assertEqual(list(iteration(0, _function, 50, mode='iter')), expected)
+        self.assertEqual(iteration(0, _function, 50, mode='last'), expected[-1])
+
+    def test_memo(self):
+        # 周期很短, 有memo时10^12次迭代也能立刻算完
+        mu, lam = find_cycle(0, _function)
+        time = 10 ** 12
+        self.assertEqual(iteration(0, _function, time, mode='last', memo=64),
+                         iteration(0, _function, mu + (time - mu) % lam, mode='last'))
+        with self.assertRaises(ValueError):
+            iteration(0, _function, 10, mode='list', memo=8)
+        with self.assertRaises(ValueError):
+            iteration(0, _function, -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
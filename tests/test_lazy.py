@@ -0,0 +1,31 @@
+"""惰性矩阵表达式的正确性测试, 与直接计算对比"""
+
+
+import unittest
+
+from mathematics.linear_algebra import Matrix, Vector
+
+from .backends import BackendTestCase, random_rows
+
+
+class LazyTest(BackendTestCase):
+
+    def test_lazy(self):
+        a, b, c = Matrix(random_rows(6, 2, 5)), Matrix(random_rows(2, 9, 6)), Matrix(random_rows(9, 6, 7))
+        v, w = Vector([1.0] * 6), Vector([float(i) for i in range(6)])
+        self.assertVectorAlmostEqual((a.lazy() * b * c * v + w).evaluate(), a * b * c * v + w)
+        expression = 2 * (a * b).lazy() - a.lazy() * b * 0.5
+        self.assertRowsAlmostEqual(expression.evaluate(), (a * b) * 1.5)
+        self.assertEqual((a.lazy() * b * c * v).cost(), 9 * 6 + 2 * 9 + 6 * 2)
+
+
+class PythonLazyTest(LazyTest):
+    backend = 'python'
+
+
+class PureLazyTest(LazyTest):
+    backend = 'pure'
+
+
+if __name__ == '__main__':
+    unittest.main()
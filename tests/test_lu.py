@@ -0,0 +1,64 @@
+"""LU分解的正确性测试: 行列式与按行展开对比, 逆矩阵和解方程与定义对比"""
+
+
+import random
+import unittest
+
+from mathematics.linear_algebra import Matrix, Vector
+from mathematics.number import RationalNumber
+
+from .backends import BackendTestCase, determinant, identity, matmul, random_rows
+
+
+class LUTest(BackendTestCase):
+
+    def test_lu_float(self):
+        for n in (1, 2, 5, 8):
+            a = random_rows(n, n, n)
+            m = Matrix(a)
+            self.assertAlmostEqual(m.determinant(), determinant(a))
+            self.assertRowsAlmostEqual(m * m.inverse(), identity(n), 1e-9)
+            b = Vector([float(i + 1) for i in range(n)])
+            self.assertVectorAlmostEqual(m * m.solve(b), b)
+
+    def test_lu_exact(self):
+        rng = random.Random(4)
+        a = [[rng.randrange(-9, 10) for j in range(5)] for i in range(5)]
+        m = Matrix(a)
+        self.assertEqual(m.determinant(), determinant(a))
+        if m.determinant():
+            product = matmul(a, m.inverse().matrix)
+            self.assertEqual(product, [[int(i == j) for j in range(5)] for i in range(5)])
+        r = Matrix([[RationalNumber(1, i + j + 1) for j in range(4)] for i in range(4)])
+        self.assertEqual(r.determinant(), RationalNumber(1, 6048000))
+        self.assertEqual(matmul(r.matrix, r.inverse().matrix), [[int(i == j) for j in range(4)] for i in range(4)])
+
+    def test_rank(self):
+        self.assertEqual(Matrix([[1, 2, 3], [2, 4, 6], [1, 0, 1]]).rank(), 2)
+        self.assertEqual(Matrix([[1.0, 2.0], [2.0, 4.0]]).rank(), 1)
+        with self.assertRaises(ValueError):
+            Matrix([[1, 2], [2, 4]]).inverse()
+
+    def test_mutation_refreshes_lu(self):
+        m = Matrix([[1.0, 2.0], [3.0, 4.0]])
+        self.assertAlmostEqual(m.determinant(), -2.0)
+        m.matrix = [[2.0, 0.0], [0.0, 5.0]]
+        self.assertAlmostEqual(m.determinant(), 10.0)
+        m.matrix[0][0] = 4.0
+        self.assertAlmostEqual(m.determinant(), 20.0)
+        e = Matrix([[2, 1], [1, 1]])
+        self.assertEqual(e.determinant(), 1)
+        e.matrix[1][1] = 3
+        self.assertEqual(e.determinant(), 5)
+
+
+class PythonLUTest(LUTest):
+    backend = 'python'
+
+
+class PureLUTest(LUTest):
+    backend = 'pure'
+
+
+if __name__ == '__main__':
+    unittest.main()
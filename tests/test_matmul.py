@@ -0,0 +1,38 @@
+"""分块矩阵乘法的正确性测试, 与朴素三重循环对比"""
+
+
+import random
+import unittest
+from unittest import mock
+
+from mathematics import linear_algebra
+from mathematics.linear_algebra import Matrix
+
+from .backends import BackendTestCase, matmul, random_rows
+
+
+class MatmulTest(BackendTestCase):
+
+    def test_blocked_matmul(self):
+        a, b = random_rows(70, 130, 2), random_rows(130, 65, 3)
+        self.assertRowsAlmostEqual(Matrix(a).matmul(Matrix(b), workers=1), matmul(a, b))
+
+    def test_parallel_exact(self):
+        rng = random.Random(4)
+        a = [[rng.randrange(-10 ** 20, 10 ** 20) for j in range(9)] for i in range(13)]
+        b = [[rng.randrange(-10 ** 20, 10 ** 20) for j in range(7)] for i in range(9)]
+        with mock.patch.object(linear_algebra, 'PARALLEL_MATMUL_THRESHOLD', 0):
+            self.assertEqual(Matrix(a).matmul(Matrix(b), workers=2).matrix, matmul(a, b))
+        self.assertEqual(Matrix(a).matmul(Matrix(b), workers=1).matrix, matmul(a, b))
+
+
+class PythonMatmulTest(MatmulTest):
+    backend = 'python'
+
+
+class PureMatmulTest(MatmulTest):
+    backend = 'pure'
+
+
+if __name__ == '__main__':
+    unittest.main()
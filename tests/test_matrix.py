@@ -0,0 +1,76 @@
+"""Matrix存储和基本运算的测试: 整数矩阵保持精确, matrix在两种后端下都可以原地修改"""
+
+
+import unittest
+
+from mathematics import linear_algebra
+from mathematics.linear_algebra import Matrix, Vector
+
+from .backends import BackendTestCase, matmul, random_rows, transpose
+
+
+class MatrixTest(BackendTestCase):
+
+    def test_arithmetic(self):
+        a, b = random_rows(5, 7, 0), random_rows(7, 3, 1)
+        v = Vector([float(i) for i in range(7)])
+        self.assertRowsAlmostEqual(Matrix(a) * Matrix(b), matmul(a, b))
+        self.assertRowsAlmostEqual(Matrix(a) + Matrix(a), [[2 * x for x in row] for row in a])
+        self.assertRowsAlmostEqual(Matrix(a) - Matrix(a), [[0.0] * 7 for row in a])
+        self.assertRowsAlmostEqual(Matrix(a) * 3.0, [[3 * x for x in row] for row in a])
+        self.assertRowsAlmostEqual(Matrix(a).transpose(), transpose(a))
+        self.assertVectorAlmostEqual(Matrix(a) * v, [row[0] for row in matmul(a, [[x] for x in v])])
+
+    def test_integers_do_not_overflow(self):
+        big = 2 ** 62
+        m = Matrix([[2 ** 40, 1], [0, 1]])
+        self.assertEqual((m * m).matrix, [[2 ** 80, 2 ** 40 + 1], [0, 1]])
+        self.assertEqual(m.matmul(m).matrix, [[2 ** 80, 2 ** 40 + 1], [0, 1]])
+        self.assertEqual((Matrix([[big]]) + Matrix([[big]])).matrix, [[2 ** 63]])
+        self.assertEqual((Matrix([[-big]]) - Matrix([[big]])).matrix, [[-2 ** 63]])
+        self.assertEqual((Matrix([[big]]) * 4).matrix, [[2 ** 64]])
+        self.assertEqual(list(Matrix([[big, 1]]) * Vector([4, 1])), [2 ** 64 + 1])
+        self.assertEqual(Matrix([[big, 0], [0, big]]).determinant(), 2 ** 124)
+        self.assertEqual(Matrix([[True, False], [False, True]]).matrix, [[True, False], [False, True]])
+
+    def test_numpy_integer_input(self):
+        if linear_algebra.np is None:
+            self.skipTest('NumPy is not installed')
+        np = linear_algebra.np
+        m = Matrix(np.array([[2 ** 62, 1], [1, 1]], dtype=np.int64))
+        self.assertEqual(m.backend, 'python')
+        self.assertEqual((m + m).matrix, [[2 ** 63, 2], [2, 2]])
+        self.assertEqual(type(m.matrix[0][0]), int)
+
+    def test_rows_are_writable(self):
+        m = Matrix([[1.0, 2.0], [3.0, 4.0]])
+        m.matrix[0][1] = 5.0
+        self.assertEqual(m.matrix[0][1], 5.0)
+        self.assertEqual(m.matrix, [[1.0, 5.0], [3.0, 4.0]])
+        m.matrix[1] = [6.0, 7.0]
+        self.assertEqual(m, Matrix([[1.0, 5.0], [6.0, 7.0]]))
+        self.assertEqual([list(row) for row in m.matrix], [[1.0, 5.0], [6.0, 7.0]])
+        self.assertEqual(len(m.matrix), 2)
+        self.assertEqual(len(m.matrix[0]), 2)
+        self.assertEqual(m.matrix[1][:], [6.0, 7.0])
+
+    def test_setter(self):
+        m = Matrix([[1.0, 2.0], [3.0, 4.0]])
+        m.matrix = [[2, 0], [0, 2 ** 62]]
+        self.assertEqual(m.backend, 'python')
+        self.assertEqual((m + m).matrix, [[4, 0], [0, 2 ** 63]])
+        m.matrix = [[0.5, 0.0], [0.0, 0.25]]
+        self.assertEqual(m.backend, 'numpy' if self.backend == 'numpy' else 'python')
+        self.assertEqual(m.matrix, [[0.5, 0.0], [0.0, 0.25]])
+
+
+class PythonMatrixTest(MatrixTest):
+    backend = 'python'
+
+
+class PureMatrixTest(MatrixTest):
+    backend = 'pure'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""模运算的正确性测试, 与内置pow和定义对比"""
+
+
+import math
+import random
+import unittest
+
+from mathematics.number_theory import ModInt, crt, mod_inverse, mod_inverse_many, modpow_many, np
+
+
+class ModularTest(unittest.TestCase):
+
+    def test_inverse(self):
+        modulus = 10 ** 9 + 7
+        integers = list(range(1, 200)) + [modulus - 1, 123456789]
+        self.assertEqual(mod_inverse_many(integers, modulus), [pow(x, -1, modulus) for x in integers])
+        self.assertEqual(mod_inverse(3, 7), 5)
+        with self.assertRaises(ValueError):
+            mod_inverse(6, 9)
+
+    def test_crt(self):
+        self.assertEqual(crt([2, 3, 2], [3, 5, 7]), (23, 105))
+        rng = random.Random(2)
+        for _ in range(100):
+            x = rng.randrange(10 ** 9)
+            moduli = [4, 9, 25, 49]
+            self.assertEqual(crt([x % m for m in moduli], moduli), (x % math.prod(moduli), math.prod(moduli)))
+
+
+class ModpowManyTest(unittest.TestCase):
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_negative_bases(self):
+        bases = np.array([-1, -2, -3, -10 ** 12, 5, 0], dtype=np.int64)
+        for exponent in (0, 1, 3, 10):
+            self.assertEqual(modpow_many(bases, exponent, 7).tolist(), [pow(int(b), exponent, 7) for b in bases])
+        units = bases[bases % 7 != 0]
+        self.assertEqual(modpow_many(units, -1, 7).tolist(), [pow(int(b), -1, 7) for b in units])
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_array_matches_pow(self):
+        rng = random.Random(3)
+        modulus = (1 << 32) - 5
+        bases = [rng.randrange(modulus) for _ in range(1000)]
+        exponent = rng.randrange(1 << 60, 1 << 61)
+        result = modpow_many(np.array(bases, dtype=np.uint64), exponent, modulus)
+        self.assertEqual(result.tolist(), [pow(b, exponent, modulus) for b in bases])
+
+    def test_list_matches_pow(self):
+        bases = list(range(-20, 20))
+        self.assertEqual(modpow_many(bases, 5, 13), [pow(b, 5, 13) for b in bases])
+
+
+class ModIntTest(unittest.TestCase):
+
+    def test_equality_matches_hash(self):
+        a = ModInt(3, 7)
+        self.assertEqual(a, ModInt(10, 7))
+        self.assertEqual(hash(a), hash(ModInt(10, 7)))
+        self.assertNotEqual(a, 10)
+        self.assertNotEqual(a, ModInt(3, 11))
+        self.assertIsNone({10: 'x'}.get(a))
+
+    def test_read_only(self):
+        a = ModInt(3, 7)
+        with self.assertRaises(AttributeError):
+            a.value = 5
+        with self.assertRaises(AttributeError):
+            a.modulus = 11
+
+
+if __name__ == '__main__':
+    unittest.main()
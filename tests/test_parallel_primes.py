@@ -0,0 +1,27 @@
+"""并行分段筛的正确性测试, 与单进程的分段筛对比"""
+
+
+import unittest
+
+from mathematics.number_theory import parallel_prime_segments, parallel_primes_between, primes_between
+
+
+class ParallelPrimesTest(unittest.TestCase):
+
+    def test_matches_serial(self):
+        a, b = 10 ** 9, 10 ** 9 + 10 ** 5
+        expected = list(primes_between(a, b))
+        self.assertEqual(list(parallel_primes_between(a, b, workers=2, segment_size=1 << 14)), expected)
+        segments = parallel_prime_segments(a, b, workers=2, segment_size=1 << 14)
+        self.assertEqual([p for segment in segments for p in segment], expected)
+
+    def test_workers(self):
+        for workers in (0, -1, 1.5):
+            with self.assertRaises(ValueError):
+                list(parallel_prime_segments(2, 100, workers=workers))
+            with self.assertRaises(ValueError):
+                list(parallel_primes_between(2, 100, workers=workers))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+"""质数计数和第k个质数的正确性测试, 与筛法和已知值对比"""
+
+
+import unittest
+
+from mathematics.number_theory import nth_prime, prime_pi, primes_up_to
+
+
+class PrimeCountingTest(unittest.TestCase):
+
+    def test_prime_pi(self):
+        primes = primes_up_to(10 ** 6)
+        for x in (0, 1, 2, 10, 100, 9973, 65536, 10 ** 6):
+            self.assertEqual(prime_pi(x), sum(1 for p in primes if p <= x))
+        self.assertEqual(prime_pi(10 ** 9), 50847534)
+
+    def test_nth_prime(self):
+        self.assertEqual([nth_prime(k) for k in (1, 2, 100, 10 ** 4)], [2, 3, 541, 104729])
+        primes = primes_up_to(10 ** 6)
+        for k in (1000, 50000, len(primes)):
+            self.assertEqual(nth_prime(k), primes[k - 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""二进制质数表的正确性测试"""
+
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from mathematics import number_theory
+from mathematics.number_theory import PrimeTable, find_prime_number, primes_up_to
+
+
+class PrimeTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = Path(self._directory.name)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_extend_and_grow(self):
+        table = PrimeTable(self.directory / 'primes.bin')
+        table.extend(10 ** 5)
+        self.assertEqual(list(table.primes_up_to(10 ** 5)), list(primes_up_to(10 ** 5)))
+        self.assertEqual(table.index(7), 3)
+        count = len(table)
+        grown = table.grow(3)
+        self.assertEqual(len(grown), 3)
+        self.assertEqual(len(table), count + 3)
+        table.close()
+
+    def test_reopen(self):
+        path = self.directory / 'primes.bin'
+        table = PrimeTable(path)
+        table.extend(10 ** 5)
+        table.close()
+        reopened = PrimeTable(path)
+        self.assertGreaterEqual(reopened.limit, 10 ** 5)
+        self.assertEqual(list(reopened.primes_up_to(1000)), list(primes_up_to(1000)))
+        reopened.close()
+
+    def test_default_path_is_user_cache(self):
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': str(self.directory)}):
+            os.environ.pop('MATHEMATICS_PRIME_TABLE', None)
+            table = PrimeTable()
+        self.assertEqual(table.path, (self.directory / 'mathematics' / 'primes.bin').resolve())
+        self.assertNotEqual(table.path.parent, Path(number_theory.__file__).resolve().parent)
+        table.close()
+
+    def test_environment_override(self):
+        path = self.directory / 'custom.bin'
+        with mock.patch.dict(os.environ, {'MATHEMATICS_PRIME_TABLE': str(path)}), \
+                mock.patch.object(number_theory, '_default_prime_table', None):
+            primes = find_prime_number(10)
+            self.assertEqual(number_theory.default_prime_table().path, path.resolve())
+            number_theory.default_prime_table().close()
+        self.assertTrue(path.exists())
+        self.assertEqual(len(primes), 10)
+        self.assertTrue(all(number_theory.is_prime(p) for p in primes))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+"""分段筛的正确性测试, 与试除法对比"""
+
+
+import math
+import unittest
+
+from mathematics.number_theory import iter_primes, primes_between, primes_up_to
+
+
+def _is_prime(n):
+    return n >= 2 and all(n % d for d in range(2, math.isqrt(n) + 1))
+
+
+class SieveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.expected = [n for n in range(10 ** 4) if _is_prime(n)]
+
+    def test_primes_up_to(self):
+        self.assertEqual(list(primes_up_to(10 ** 4 - 1)), self.expected)
+        self.assertEqual(list(primes_up_to(1)), [])
+        self.assertEqual(list(primes_up_to(2)), [2])
+
+    def test_primes_between(self):
+        self.assertEqual(list(primes_between(1000, 2000)), [p for p in self.expected if 1000 <= p <= 2000])
+        self.assertEqual(list(primes_between(20, 10)), [])
+        a, b = 10 ** 9, 10 ** 9 + 1000
+        self.assertEqual(list(primes_between(a, b)), [n for n in range(a, b + 1) if _is_prime(n)])
+
+    def test_iter_primes(self):
+        self.assertEqual([p for p, _ in zip(iter_primes(), range(len(self.expected)))], self.expected)
+        self.assertEqual([p for p, _ in zip(iter_primes(100), range(3))], [101, 103, 107])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""RationalNumber的正确性测试, 与fractions.Fraction对比"""
+
+
+from fractions import Fraction
+import random
+import unittest
+
+from mathematics.number import RationalNumber
+
+
+def _fraction(value):
+    return Fraction(value.numerator, value.denominator)
+
+
+class RationalNumberTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.pairs = [(rng.randrange(-10 ** 6, 10 ** 6), rng.randrange(1, 10 ** 6)) for _ in range(200)]
+
+    def test_reduced(self):
+        for p, q in self.pairs:
+            value = RationalNumber(p, -q)
+            expected = Fraction(p, -q)
+            self.assertEqual((value.numerator, value.denominator), (expected.numerator, expected.denominator))
+
+    def test_arithmetic(self):
+        for (p1, q1), (p2, q2) in zip(self.pairs, reversed(self.pairs)):
+            a, b = RationalNumber(p1, q1), RationalNumber(p2, q2)
+            fa, fb = Fraction(p1, q1), Fraction(p2, q2)
+            self.assertEqual(_fraction(a + b), fa + fb)
+            self.assertEqual(_fraction(a - b), fa - fb)
+            self.assertEqual(_fraction(a * b), fa * fb)
+            if p2:
+                self.assertEqual(_fraction(a / b), fa / fb)
+            self.assertEqual(_fraction(a + 3), fa + 3)
+            self.assertEqual(_fraction(3 - a), 3 - fa)
+            self.assertEqual(_fraction(a ** 3), fa ** 3)
+            self.assertEqual(a < b, fa < fb)
+            self.assertEqual(a == b, fa == fb)
+
+    def test_hash(self):
+        for p, q in self.pairs:
+            self.assertEqual(hash(RationalNumber(p, q)), hash(Fraction(p, q)))
+        self.assertEqual(hash(RationalNumber(4, 2)), hash(2))
+        self.assertEqual(RationalNumber(4, 2), 2)
+        self.assertEqual(len({RationalNumber(1, 2), RationalNumber(2, 4), RationalNumber(-3, -6)}), 1)
+
+    def test_read_only(self):
+        value = RationalNumber(1, 2)
+        with self.assertRaises(AttributeError):
+            value.numerator = 3
+        with self.assertRaises(AttributeError):
+            value.extra = 3
+
+
+if __name__ == '__main__':
+    unittest.main()
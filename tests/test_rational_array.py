@@ -0,0 +1,39 @@
+"""RationalArray的正确性测试, 与逐个RationalNumber运算对比"""
+
+
+from fractions import Fraction
+import random
+import unittest
+
+from mathematics.number import RationalArray, RationalNumber
+
+
+def _fraction(value):
+    return Fraction(value.numerator, value.denominator)
+
+
+class RationalArrayTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(2)
+        self.a = [RationalNumber(rng.randrange(-100, 100), rng.randrange(1, 100)) for _ in range(100)]
+        self.b = [RationalNumber(rng.randrange(1, 100), rng.randrange(1, 100)) for _ in range(100)]
+
+    def test_elementwise(self):
+        a, b = self.a, self.b
+        x, y = RationalArray.from_rationals(a), RationalArray.from_rationals(b)
+        self.assertEqual(list(x + y), [p + q for p, q in zip(a, b)])
+        self.assertEqual(list(x - y), [p - q for p, q in zip(a, b)])
+        self.assertEqual(list(x * y), [p * q for p, q in zip(a, b)])
+        self.assertEqual(list(x / y), [p / q for p, q in zip(a, b)])
+        self.assertEqual(x.to_rationals(), a)
+
+    def test_reductions(self):
+        a, b = self.a, self.b
+        x, y = RationalArray.from_rationals(a), RationalArray.from_rationals(b)
+        self.assertEqual(_fraction(x.sum()), sum(map(_fraction, a)))
+        self.assertEqual(_fraction(x.dot(y)), sum(_fraction(p) * _fraction(q) for p, q in zip(a, b)))
+
+
+if __name__ == '__main__':
+    unittest.main()
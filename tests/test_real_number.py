@@ -0,0 +1,48 @@
+"""RealNumber标准形式和相等判断的测试, 相等不依赖对象是否被共享"""
+
+
+import pickle
+import unittest
+from unittest import mock
+
+from mathematics.number import RationalNumber, RealNumber
+
+
+class RealNumberTest(unittest.TestCase):
+
+    def test_canonical(self):
+        a = RealNumber(2, 8, RationalNumber(1, 2))
+        self.assertEqual((a.coefficient, a.base, a.exponential), (4, 2, RationalNumber(1, 2)))
+        self.assertEqual(a, RealNumber(4, 2, RationalNumber(1, 2)))
+        self.assertEqual(RealNumber(1, 12, RationalNumber(1, 2)).base, 3)
+        self.assertNotEqual(a, RealNumber(4, 2, RationalNumber(1, 3)))
+        self.assertNotEqual(a, RealNumber(4, 3, RationalNumber(1, 2)))
+        self.assertNotEqual(a, RealNumber(-4, 2, RationalNumber(1, 2)))
+
+    def test_rational_values(self):
+        c = RealNumber(RationalNumber(1, 3), 27, RationalNumber(1, 3))
+        self.assertEqual(c, 1)
+        self.assertEqual(hash(c), hash(1))
+        self.assertEqual(c.reduce(), RationalNumber(1, 1))
+        with self.assertRaises(ValueError):
+            c == 1.0
+
+    def test_equal_without_interning(self):
+        # 模拟并发时没有共享对象的情况: 每次都创建新对象
+        with mock.patch.object(RealNumber, '_interned', {}) as interned:
+            a = RealNumber(2, 8, RationalNumber(1, 2))
+            interned.clear()
+            b = RealNumber(4, 2, RationalNumber(1, 2))
+        self.assertIsNot(a, b)
+        self.assertEqual(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertEqual(len({a, b}), 1)
+        self.assertEqual(a + b, RealNumber(8, 2, RationalNumber(1, 2)))
+
+    def test_pickle(self):
+        a = RealNumber(3, 5, RationalNumber(1, 2))
+        self.assertEqual(pickle.loads(pickle.dumps(a)), a)
+
+
+if __name__ == '__main__':
+    unittest.main()
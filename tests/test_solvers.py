@@ -0,0 +1,53 @@
+"""线性方程组求解器的正确性测试, 检查残差和正交性"""
+
+
+import unittest
+
+from mathematics.linear_algebra import (Matrix, Vector, conjugate_gradient, gmres, jacobi_preconditioner, lstsq, qr,
+                                        solve)
+
+from .backends import BackendTestCase, identity, poisson, random_rows
+
+
+class SolverTest(BackendTestCase):
+
+    def test_direct(self):
+        a = random_rows(6, 6, 10)
+        b = Vector([1.0, -2.0, 3.0, 0.5, 0.0, 1.0])
+        self.assertVectorAlmostEqual(Matrix(a) * solve(Matrix(a), b), b)
+        tall = random_rows(9, 4, 11)
+        q, r = qr(Matrix(tall))
+        self.assertRowsAlmostEqual(q * r, tall)
+        self.assertRowsAlmostEqual(q.transpose() * q, identity(4))
+        rhs = Vector([float(i) for i in range(9)])
+        x = lstsq(Matrix(tall), rhs)
+        residual = Vector([p - q for p, q in zip(rhs, Matrix(tall) * x)])
+        # 最小二乘解的残差与A的列空间正交
+        self.assertVectorAlmostEqual(Matrix(tall).transpose() * residual, [0.0] * 4)
+
+    def test_iterative(self):
+        a = poisson(8)
+        b = Vector([1.0] * 64)
+        for result in (conjugate_gradient(a, b, tol=1e-12),
+                       conjugate_gradient(a, b, tol=1e-12, preconditioner=jacobi_preconditioner(a)),
+                       gmres(a, b, tol=1e-12, restart=20)):
+            self.assertTrue(result.converged)
+            self.assertVectorAlmostEqual(a.matvec(result.x), b, 1e-9)
+        rows = random_rows(20, 20, 12)
+        for i in range(20):
+            rows[i][i] += 15.0
+        result = gmres(Matrix(rows), Vector([1.0] * 20), tol=1e-12, restart=5)
+        self.assertTrue(result.converged)
+        self.assertVectorAlmostEqual(Matrix(rows) * result.x, [1.0] * 20, 1e-9)
+
+
+class PythonSolverTest(SolverTest):
+    backend = 'python'
+
+
+class PureSolverTest(SolverTest):
+    backend = 'pure'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+"""稀疏矩阵的正确性测试, 与稠密矩阵对比"""
+
+
+import random
+import unittest
+
+from mathematics.linear_algebra import COOMatrix, CSRMatrix, Vector
+
+from .backends import BackendTestCase, matmul, transpose
+
+
+class SparseTest(BackendTestCase):
+
+    def test_csr_matches_dense(self):
+        rng = random.Random(9)
+        triplets = [(rng.randrange(30), rng.randrange(20), rng.uniform(-1, 1)) for _ in range(150)]
+        dense = [[0.0] * 20 for i in range(30)]
+        for i, j, value in triplets:
+            dense[i][j] += value
+        a = CSRMatrix.from_triplets(triplets, (30, 20))
+        self.assertRowsAlmostEqual(a.to_dense(), dense)
+        self.assertRowsAlmostEqual(COOMatrix.from_triplets(triplets, (30, 20)).to_csr().to_dense(), dense)
+        self.assertRowsAlmostEqual(a.transpose().to_dense(), transpose(dense))
+        x = Vector([float(j) for j in range(20)])
+        self.assertVectorAlmostEqual(a.matvec(x), [sum(p * q for p, q in zip(row, x)) for row in dense])
+        self.assertRowsAlmostEqual((a * a.transpose()).to_dense(), matmul(dense, transpose(dense)))
+        self.assertEqual(CSRMatrix.from_dense(dense), a.transpose().transpose())
+
+
+class PythonSparseTest(SparseTest):
+    backend = 'python'
+
+
+class PureSparseTest(SparseTest):
+    backend = 'pure'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""特征值和奇异值分解的正确性测试, 与定义和已知特征值对比"""
+
+
+import math
+import unittest
+
+from mathematics.linear_algebra import Matrix, eigh, eigvals, lanczos, power_iteration, svd
+
+from .backends import BackendTestCase, identity, matmul, poisson, random_rows, symmetric, transpose
+
+
+class SpectralTest(BackendTestCase):
+
+    def test_eigh(self):
+        a = symmetric(7, 13)
+        values, vectors = eigh(Matrix(a))
+        self.assertEqual(values, sorted(values))
+        self.assertRowsAlmostEqual(Matrix(a) * vectors, matmul(vectors.matrix, [[values[i] * (i == j)
+                                                                                   for j in range(7)] for i in range(7)]))
+        self.assertRowsAlmostEqual(vectors.transpose() * vectors, identity(7))
+        self.assertAlmostEqual(sum(values), sum(a[i][i] for i in range(7)))
+
+    def test_eigvals(self):
+        # 伴随矩阵的特征值是多项式的根: (x-1)(x-2)(x+3)(x^2+1)
+        coefficients = [1, 0, -6, 6, -7, 6]
+        n = len(coefficients) - 1
+        companion = [[0.0] * n for i in range(n)]
+        for i in range(1, n):
+            companion[i][i - 1] = 1.0
+        for i in range(n):
+            companion[i][n - 1] = -float(coefficients[n - i])
+        values = eigvals(Matrix(companion))
+        expected = [-3, -1j, 1j, 1, 2]
+        for value in expected:
+            self.assertLess(min(abs(complex(v) - value) for v in values), 1e-8)
+        self.assertEqual(len(values), n)
+
+    def test_svd(self):
+        for rows, columns in ((6, 4), (4, 6)):
+            a = random_rows(rows, columns, rows * columns)
+            u, s, v = svd(Matrix(a))
+            self.assertEqual(s, sorted(s, reverse=True))
+            r = min(rows, columns)
+            diagonal = [[s[i] * (i == j) for j in range(r)] for i in range(r)]
+            self.assertRowsAlmostEqual(matmul(matmul(u.matrix, diagonal), transpose(v.matrix)), a)
+            self.assertRowsAlmostEqual(u.transpose() * u, identity(r))
+            self.assertRowsAlmostEqual(v.transpose() * v, identity(r))
+
+    def test_iterative_eigenvalues(self):
+        a = poisson(6)
+        exact = sorted(4 - 2 * math.cos(math.pi * i / 7) - 2 * math.cos(math.pi * j / 7)
+                       for i in range(1, 7) for j in range(1, 7))
+        value, vector = power_iteration(a, max_iterations=10000, tol=1e-6)
+        self.assertAlmostEqual(value, exact[-1], 5)
+        # 单个初始向量的Krylov子空间里重特征值只出现一次, 因此与去重后的特征值比较
+        distinct = sorted(set(round(value, 10) for value in exact))
+        values, vectors = lanczos(a, k=3, which='smallest')
+        for value, expected in zip(sorted(values), distinct[:3]):
+            self.assertAlmostEqual(value, expected, 8)
+        for value, vector in zip(values, vectors):
+            self.assertVectorAlmostEqual(a.matvec(vector), vector * value, 1e-6)
+
+
+class PythonSpectralTest(SpectralTest):
+    backend = 'python'
+
+
+class PureSpectralTest(SpectralTest):
+    backend = 'pure'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""最小质因数表的正确性测试, 与试除法和定义对比"""
+
+
+import math
+import unittest
+
+from mathematics import number_theory
+from mathematics.number_theory import SPFTable
+
+
+def _factorize(n):
+    factors, d = {}, 2
+    while d * d <= n:
+        while n % d == 0:
+            factors[d] = factors.get(d, 0) + 1
+            n //= d
+        d += 1
+    if n > 1:
+        factors[n] = factors.get(n, 0) + 1
+    return factors
+
+
+def _totient(n):
+    return sum(1 for k in range(1, n + 1) if math.gcd(k, n) == 1)
+
+
+def _mobius(n):
+    factors = _factorize(n)
+    return 0 if any(e > 1 for e in factors.values()) else (-1) ** len(factors)
+
+
+class SPFTableTest(unittest.TestCase):
+
+    def test_factorize(self):
+        table = SPFTable(3000)
+        self.assertEqual(table.factorize(1), {})
+        for n in range(2, 3001):
+            self.assertEqual(table.factorize(n), _factorize(n))
+        self.assertEqual(list(table.factorize_range(1, 4)), [{}, {2: 1}, {3: 1}])
+        with self.assertRaises(ValueError):
+            table.factorize(3001)
+
+    def test_multiplicative_functions(self):
+        table = SPFTable(500)
+        for n in range(1, 501):
+            self.assertEqual(table.totient(n), _totient(n))
+            self.assertEqual(table.mobius(n), _mobius(n))
+            self.assertEqual(table.divisors(n), [d for d in range(1, n + 1) if n % d == 0])
+
+    def test_bulk_tables(self):
+        table = SPFTable(500)
+        numbers = list(range(1, 501)) + [503, 1000, 1024, 30030]
+        self.assertEqual(list(table.totient_many(numbers)), [_totient(n) for n in numbers])
+        self.assertEqual(list(table.mobius_many(numbers)), [_mobius(n) for n in numbers])
+        with self.assertRaises(ValueError):
+            table.totient_many([0])
+
+    @unittest.skipIf(number_theory.np is None, 'NumPy is not installed')
+    def test_bulk_tables_numpy_input(self):
+        table = SPFTable(500)
+        numbers = number_theory.np.arange(1, 501)
+        self.assertEqual(list(table.totient_many(numbers)), [_totient(n) for n in range(1, 501)])
+        self.assertEqual(list(table.mobius_many(numbers)), [_mobius(n) for n in range(1, 501)])
+
+    def test_bulk_tables_without_numpy(self):
+        np, number_theory.np = number_theory.np, None
+        try:
+            table = SPFTable(500)
+            self.assertEqual(list(table.totient_many(range(1, 501))), [_totient(n) for n in range(1, 501)])
+            self.assertEqual(list(table.mobius_many(range(1, 501))), [_mobius(n) for n in range(1, 501)])
+        finally:
+            number_theory.np = np
+
+    def test_shared(self):
+        table = SPFTable(1000, shared=True)
+        try:
+            attached = SPFTable.attach(table.name, table.limit)
+            self.assertEqual(attached.factorize(840), {2: 3, 3: 1, 5: 1, 7: 1})
+            self.assertEqual(list(attached.totient_many([1, 2, 999])), [1, 1, 648])
+            attached.close()
+        finally:
+            table.close()
+            table.unlink()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+"""Vector的正确性测试, 与逐元素的列表运算对比"""
+
+
+import math
+import unittest
+
+from mathematics.linear_algebra import Vector
+from mathematics.number import RationalNumber
+
+from .backends import BackendTestCase
+
+
+class VectorTest(BackendTestCase):
+
+    def test_operations(self):
+        for n in (3, 100):
+            x, y = [float(i) for i in range(n)], [float(n - i) for i in range(n)]
+            u, v = Vector(x), Vector(y)
+            self.assertVectorAlmostEqual(u + v, [p + q for p, q in zip(x, y)])
+            self.assertVectorAlmostEqual(u - v, [p - q for p, q in zip(x, y)])
+            self.assertVectorAlmostEqual(u * 2, [2 * p for p in x])
+            self.assertAlmostEqual(u.dot(v), sum(p * q for p, q in zip(x, y)))
+            self.assertAlmostEqual(v.norm(), math.sqrt(sum(q * q for q in y)))
+            u.axpy(3, v)
+            self.assertVectorAlmostEqual(u, [p + 3 * q for p, q in zip(x, y)])
+        self.assertEqual(list(Vector([1, 0, 0]).cross(Vector([0, 1, 0]))), [0, 0, 1])
+        self.assertEqual(list(Vector([RationalNumber(1, 2), 1]) * 2), [1, 2])
+
+
+class PythonVectorTest(VectorTest):
+    backend = 'python'
+
+
+class PureVectorTest(VectorTest):
+    backend = 'pure'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+"""VectorBatch的正确性测试, 与逐个向量计算和暴力最近邻对比"""
+
+
+import math
+import random
+import unittest
+
+from mathematics.linear_algebra import VectorBatch
+
+from .backends import BackendTestCase
+
+
+class VectorBatchTest(BackendTestCase):
+
+    def test_batch(self):
+        rng = random.Random(8)
+        points = [[rng.random() for j in range(3)] for i in range(200)]
+        queries = [[rng.random() for j in range(3)] for i in range(20)]
+        batch = VectorBatch(points)
+        self.assertVectorAlmostEqual(batch.norm(), [math.hypot(*p) for p in points])
+        self.assertVectorAlmostEqual(batch.dot(batch), [sum(x * x for x in p) for p in points])
+        indices, distances = batch.knn(VectorBatch(queries), 4)
+        for query, found, found_distances in zip(queries, indices, distances):
+            expected = sorted(range(len(points)), key=lambda i: math.dist(points[i], query))[:4]
+            self.assertEqual(list(found), expected)
+            self.assertVectorAlmostEqual(found_distances, [math.dist(points[i], query) for i in expected])
+
+
+class PythonVectorBatchTest(VectorBatchTest):
+    backend = 'python'
+
+
+class PureVectorBatchTest(VectorBatchTest):
+    backend = 'pure'
+
+
+if __name__ == '__main__':
+    unittest.main()